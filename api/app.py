@@ -27,7 +27,9 @@ threading.Thread(target=run_dotnet, daemon=True).start()
 threading.Thread(target=open_browser, daemon=True).start()
  
 # 5. FastAPI Uygulamanı Başlat (Senin mevcut kodun aynen aşağıya gelsin!)
-from fastapi import FastAPI, HTTPException
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Response
 from pydantic import BaseModel
 import sys
 from pathlib import Path
@@ -35,33 +37,85 @@ from pathlib import Path
 import time
  
 # PATH ayarı
+sys.path.append(str(Path(__file__).parent.parent))
 sys.path.append(str(Path(__file__).parent.parent / "src" / "nlp"))
 sys.path.append(str(Path(__file__).parent.parent / "src" / "query_builder"))
  
-from nlp_processor import NLPProcessor
-from sql_generator import SQLGenerator
+from src.nlp.startup_timer import timed_startup, get_startup_report, print_startup_report
  
-app = FastAPI(
-    title="Turkish NLP-SQL API",
-    description="Doğal dil → SQL için REST API",
-    version="1.0.0"
-)
+with timed_startup("imports"):
+    from nlp_processor import NLPProcessor
+    from sql_generator import SQLGenerator
+    from request_batcher import RequestBatcher
+    from warmup import ModelWarmup
+    from config.model_config import API_MAX_BATCH_SIZE, API_MAX_WAIT_MS, WARMUP_ENABLED, WARMUP_BATCH_SIZES
+    from src.cache.backends import create_cache_backend
  
 class QueryRequest(BaseModel):
     text: str
  
-nlp_processor = NLPProcessor()
-sql_generator = SQLGenerator()
+# Analiz ve SQL sonuçları aynı cache'i paylaşır (mmap/sqlite ile tüm worker'lar arasında)
+with timed_startup("result_cache"):
+    result_cache = create_cache_backend()
+with timed_startup("nlp_processor"):
+    nlp_processor = NLPProcessor(result_cache=result_cache)
+with timed_startup("sql_generator"):
+    sql_generator = SQLGenerator(result_cache=result_cache)
+print_startup_report()
+ 
+def analyze_and_generate(texts):
+    """
+    Bir grup sorguyu tek seferde işler: NER tek bir batch forward pass ile
+    çalışır, ardından her analiz için SQL üretilir. Batcher'ın tek worker
+    thread'inde çalıştığı için model ve istatistikler eşzamanlı kullanılmaz.
+    """
+    nlp_results = nlp_processor.analyze_batch(texts)#intent ve entity çıkarımı
+    return [(nlp_result, sql_generator.generate_sql(nlp_result)) for nlp_result in nlp_results]#sql üretimi
+ 
+# Aynı anda gelen istekleri birkaç milisaniye içinde toplayıp tek batch'te çalıştırır
+request_batcher = RequestBatcher(
+    analyze_and_generate,
+    max_batch_size=API_MAX_BATCH_SIZE,
+    max_wait_ms=API_MAX_WAIT_MS
+)
+ 
+# Temsili sorgular modeli ısıtır; /ready ancak ısınma bitince sağlıklı döner
+model_warmup = ModelWarmup(nlp_processor, sql_generator, batch_sizes=WARMUP_BATCH_SIZES)
+ 
+async def run_warmup():
+    # Batch worker thread'inde çalışır, canlı isteklerle aynı anda modele dokunmaz
+    with timed_startup("warmup"):
+        await request_batcher.run_in_worker(model_warmup.run)
+    print_startup_report()
+ 
+@asynccontextmanager
+async def lifespan(app):
+    await request_batcher.start()
+    if WARMUP_ENABLED:
+        app.state.warmup_task = asyncio.create_task(run_warmup())
+    else:
+        model_warmup.skip()
+    yield
+    await request_batcher.stop()
+ 
+app = FastAPI(
+    title="Turkish NLP-SQL API",
+    description="Doğal dil → SQL için REST API",
+    version="1.0.0",
+    lifespan=lifespan
+)
  
 @app.post("/generate-sql")
-def generate_sql(req: QueryRequest):
+async def generate_sql(req: QueryRequest):
     """
     Türkçe doğal dil sorgusunu SQL'e çevirir.
     """
+    if not req.text or not req.text.strip():
+        raise HTTPException(status_code=400, detail="Sorgu metni boş olamaz")
+
     try:
         start_time = time.time()
-        nlp_result = nlp_processor.analyze(req.text)#intent ve entity çıkarımı
-        sql_result = sql_generator.generate_sql(nlp_result)#sql üretimi
+        nlp_result, sql_result = await request_batcher.submit(req.text)
         elapsed = round(time.time() - start_time, 3)
  
         if sql_result.get("success"):
@@ -83,6 +137,33 @@ def generate_sql(req: QueryRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Sunucu hatası: {str(e)}")
  
+@app.get("/ready")
+def ready(response: Response):
+    """Load balancer readiness: 503 until the model is loaded and warmed up."""
+    is_ready = (
+        model_warmup.is_ready()
+        and request_batcher.is_running()
+        and nlp_processor.entity_extractor.is_ready()
+    )
+    if not is_ready:
+        response.status_code = 503
+    return {"ready": is_ready, "warmup": model_warmup.get_status()}
+ 
+@app.get("/batching-stats")
+def batching_stats():
+    """Micro-batching istatistiklerini döner."""
+    return request_batcher.get_statistics()
+ 
+@app.get("/cache-stats")
+def cache_stats():
+    """Sonuç cache'inin (bu worker için) istatistiklerini döner."""
+    return result_cache.get_statistics() if result_cache is not None else {"backend": "none"}
+ 
+@app.get("/startup-report")
+def startup_report():
+    """Bileşen bazında açılış sürelerini döner."""
+    return get_startup_report()
+ 
 @app.get("/")
 def root():
     return {"message": "Turkish NLP-SQL API aktif! POST /generate-sql ile kullan."}
@@ -90,6 +171,11 @@ def root():
 # (En altta FastAPI sunucusunu başlat)
 if __name__ == "__main__":
     import uvicorn
+    from src.nlp.thread_topology import get_thread_topology
+    workers = get_thread_topology()["workers"]
+    if workers > 1:
+        # Bu script tek process çalıştırır; her worker NLPSQL_WORKERS ile thread sayısını böler
+        print(f"💡 Önerilen: NLPSQL_WORKERS={workers} uvicorn api.app:app --workers {workers}")
     uvicorn.run(app, host="127.0.0.1", port=8000)
  
  
\ No newline at end of file
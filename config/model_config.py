@@ -11,10 +11,119 @@ MODELS_DIR = PROJECT_ROOT / "models"
 BERTURK_LOCAL_PATH = MODELS_DIR / "turkish-bert"
 CACHE_DIR = MODELS_DIR / "cache"
 
+# Strict offline mode: models are only resolved from local directories/caches
+OFFLINE_MODE = os.getenv("NLPSQL_OFFLINE", "0") == "1"
+# Hugging Face cache directory; unset keeps HF's own default (HF_HOME or
+# ~/.cache/huggingface) so existing downloads are reused
+HF_HOME_OVERRIDE = os.getenv("NLPSQL_HF_HOME")
+
+
+def configure_hf_environment():
+    """
+    Apply the Hugging Face cache location and offline mode
+    Runs on import: these variables are read when transformers is imported
+
+    HF_HOME is only changed when asked for: NLPSQL_HF_HOME, or offline mode
+    with models already downloaded into CACHE_DIR. An HF_HOME set by the
+    user always wins.
+    """
+    hf_home = HF_HOME_OVERRIDE
+    if not hf_home and OFFLINE_MODE and (CACHE_DIR / "hub").is_dir():
+        hf_home = str(CACHE_DIR)
+    if hf_home:
+        os.environ.setdefault("HF_HOME", hf_home)
+    if OFFLINE_MODE:
+        os.environ["HF_HUB_OFFLINE"] = "1"
+        os.environ["TRANSFORMERS_OFFLINE"] = "1"
+
+
+configure_hf_environment()
+
 
 # Model identifiers
 BERTURK_MODEL_NAME = "dbmdz/bert-base-turkish-cased"
 
+# NER inference backend: "torch" (PyTorch) or "onnx" (onnxruntime, CPU)
+NER_BACKEND = os.getenv("NLPSQL_NER_BACKEND", "torch")
+# Serve the int8 dynamically quantized NER model (torch backend, CPU)
+NER_QUANTIZED = os.getenv("NLPSQL_NER_QUANTIZED", "0") == "1"
+# Serve a TorchScript-traced NER model (torch backend, CPU). The traced artifact is
+# saved next to the weights so later processes load it instead of tracing again;
+# eager mode is used whenever tracing, loading or the output check fails
+NER_COMPILED = os.getenv("NLPSQL_NER_COMPILED", "0") == "1"
+
+# Tokenization: batches are padded to their longest item, rounded up to a multiple
+# of PAD_TO_MULTIPLE_OF (a few reusable shapes), never beyond MAX_SEQUENCE_LENGTH
+MAX_SEQUENCE_LENGTH = 512
+PAD_TO_MULTIPLE_OF = int(os.getenv("NLPSQL_PAD_MULTIPLE", "8"))
+# Longer NER inputs run as overlapping windows (stride = shared tokens) in one batch
+NER_SLIDING_WINDOW = os.getenv("NLPSQL_SLIDING_WINDOW", "1") == "1"
+NER_WINDOW_STRIDE = int(os.getenv("NLPSQL_WINDOW_STRIDE", "128"))
+
+# API micro-batching (requests arriving within the wait window share one forward pass)
+API_MAX_BATCH_SIZE = int(os.getenv("NLPSQL_MAX_BATCH_SIZE", "16"))
+API_MAX_WAIT_MS = float(os.getenv("NLPSQL_MAX_WAIT_MS", "5"))
+
+# CPU thread topology: torch intra-op threads per worker and the number of API
+# workers on this machine; 0 = auto (tuned file from scripts/tune_thread_topology.py
+# if present, otherwise one worker using every available core)
+TORCH_NUM_THREADS = int(os.getenv("NLPSQL_TORCH_THREADS", "0"))
+TORCH_INTEROP_THREADS = int(os.getenv("NLPSQL_TORCH_INTEROP_THREADS", "1"))
+API_WORKERS = int(os.getenv("NLPSQL_WORKERS", "0"))
+THREAD_TOPOLOGY_PATH = CACHE_DIR / "thread_topology.json"
+
+# Warmup at API startup: representative queries at these batch sizes run through
+# the full pipeline before /ready reports healthy (0 disables warmup)
+WARMUP_ENABLED = os.getenv("NLPSQL_WARMUP", "1") == "1"
+WARMUP_BATCH_SIZES = [int(size) for size in os.getenv("NLPSQL_WARMUP_BATCH_SIZES", "1,4,16").split(",") if size.strip()]
+
+# Serve BERTurkWrapper embeddings from the fine-tuned NER encoder (one model copy,
+# one forward pass); recent [CLS] vectors from NER predictions are memoized
+SHARE_NER_ENCODER = os.getenv("NLPSQL_SHARE_ENCODER", "1") == "1"
+EMBEDDING_MEMO_SIZE = int(os.getenv("NLPSQL_EMBEDDING_MEMO_SIZE", "256"))
+# Tokenizer outputs (ids + offsets) of recent NER inputs, keyed by exact text (0 disables)
+TOKENIZATION_CACHE_SIZE = int(os.getenv("NLPSQL_TOKENIZATION_CACHE_SIZE", "1024"))
+
+# Gazetteer fast path: queries whose words are all vocabulary matches/fillers
+# (coverage >= GAZETTEER_MIN_COVERAGE) with a table and an intent skip the NER model
+GAZETTEER_ENABLED = os.getenv("NLPSQL_GAZETTEER", "1") == "1"
+GAZETTEER_MIN_COVERAGE = float(os.getenv("NLPSQL_GAZETTEER_MIN_COVERAGE", "1.0"))
+
+# Model cascade: a small student NER model (trained with
+# `python ner_trainer.py --student`) answers first; queries whose span confidences
+# fall below the threshold, or that would not be SQL-ready, escalate to the full model
+CASCADE_ENABLED = os.getenv("NLPSQL_CASCADE", "1") == "1"
+CASCADE_CONFIDENCE_THRESHOLD = float(os.getenv("NLPSQL_CASCADE_THRESHOLD", "0.9"))
+STUDENT_MODEL_DIR = MODELS_DIR / "ner_student"
+STUDENT_MODEL_CONFIG = {"num_hidden_layers": 4}
+# Distilled student: fewer layers and a smaller hidden size, trained against
+# cached logits of the full model (`python ner_trainer.py --distill`)
+DISTILL_STUDENT_CONFIG = {
+    "num_hidden_layers": 4,
+    "hidden_size": 384,
+    "num_attention_heads": 6,
+    "intermediate_size": 1536
+}
+
+# Exact-text LRU cache for entity extraction results (0 disables)
+EXTRACTION_CACHE_SIZE = int(os.getenv("NLPSQL_EXTRACTION_CACHE_SIZE", "1024"))
+
+# Result cache for analyses and generated SQL: "none", "memory", "mmap" (shared by
+# workers on one host) or "sqlite" (persistent); TTL in seconds, 0 = no expiry
+RESULT_CACHE_BACKEND = os.getenv("NLPSQL_RESULT_CACHE", "memory")
+RESULT_CACHE_TTL = int(os.getenv("NLPSQL_RESULT_CACHE_TTL", "3600"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("NLPSQL_RESULT_CACHE_MAX_ENTRIES", "4096"))
+RESULT_CACHE_PATH = os.getenv("NLPSQL_RESULT_CACHE_PATH")  # defaults to models/cache/result_cache.*
+
+# Compiled SQL templates keyed by query shape (intent, tables, time period,
+# aggregation modifier, filter columns); literals are bound per request (0 disables)
+SQL_PLAN_CACHE_SIZE = int(os.getenv("NLPSQL_SQL_PLAN_CACHE_SIZE", "512"))
+# Placeholder style of SQLGenerator.generate_parameterized_sql: "dollar" ($1) or "format" (%s)
+SQL_PARAMSTYLE = os.getenv("NLPSQL_SQL_PARAMSTYLE", "dollar")
+# Multi-table joins: exact minimum join tree up to this many tables besides the
+# main one, shortest-path heuristic above it
+JOIN_PLANNER_EXACT_LIMIT = int(os.getenv("NLPSQL_JOIN_PLANNER_EXACT_LIMIT", "6"))
+
 
 # Environment setup
 def setup_model_environment():
@@ -35,6 +144,13 @@ def setup_model_environment():
     }
 
 
+def resolve_model_source(model_name):
+    """Local copy of a hub model if one exists, else the hub identifier"""
+    if model_name == BERTURK_MODEL_NAME and (BERTURK_LOCAL_PATH / "config.json").exists():
+        return str(BERTURK_LOCAL_PATH)
+    return model_name
+
+
 def get_hf_token():
     """Get HF token from environment or file"""
     # Try environment first
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Compiled NER Benchmark Script - Eager vs TorchScript latency per batch size
+"""
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add project root and ner_model directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "src" / "nlp" / "ner_model"))
+
+from config.model_config import MODELS_DIR
+from turkish_ner import TurkishNER, COMPILED_MODEL_FILENAME, COMPILED_BENCHMARK_FILENAME
+
+
+BENCHMARK_TEXTS = [
+    "Bu ayın müşteri sayısı",
+    "Geçen yıl sipariş toplamı",
+    "Son 30 gün ürün listesi",
+    "2022 3. çeyrek çalışan maaşları",
+    "Geçen ay İstanbul'daki müşterilerin verdiği siparişlerin ortalama tutarı",
+    "Kategorilere göre en çok satılan ürünler"
+]
+BATCH_SIZES = (1, 8, 32)
+
+
+def load_ner(model_dir, compiled):
+    """Load the torch NER model in eager or compiled mode on CPU"""
+    ner = TurkishNER(backend="torch", quantized=False, compiled=compiled)
+    ner.device = "cpu"
+    if not ner.load_model(model_dir):
+        return None
+    if compiled and ner.compiled_model is None:
+        print("⚠️ Compiled model fell back to eager mode")
+    return ner
+
+
+def measure_latency(ner, batch_size, runs=20, warmup_runs=3):
+    """Median and p95 latency (ms) of one predict_batch call of batch_size texts"""
+    # Warmup runs also let the TorchScript profiling executor specialize
+    batches = [
+        [BENCHMARK_TEXTS[(run * batch_size + i) % len(BENCHMARK_TEXTS)] for i in range(batch_size)]
+        for run in range(warmup_runs + runs)
+    ]
+    # The tokenization cache would hide tokenizer cost differently per run
+    session = ner.get_inference_session()
+
+    latencies = []
+    for run, texts in enumerate(batches):
+        session.token_cache.clear()
+        start_time = time.perf_counter()
+        ner.predict_batch(texts, batch_size=batch_size)
+        if run >= warmup_runs:
+            latencies.append((time.perf_counter() - start_time) * 1000)
+
+    return {
+        "median_ms": round(float(np.median(latencies)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+        "per_text_ms": round(float(np.median(latencies)) / batch_size, 3)
+    }
+
+
+def build_report(model_dir, eager_ner, compiled_ner, batch_sizes=BATCH_SIZES, runs=20):
+    """Eager vs compiled latency for every batch size"""
+    report = {
+        "model_dir": str(model_dir),
+        "compiled_artifact": str(Path(model_dir) / COMPILED_MODEL_FILENAME),
+        "compiled_active": compiled_ner.compiled_model is not None,
+        "batch_sizes": {}
+    }
+
+    for batch_size in batch_sizes:
+        eager = measure_latency(eager_ner, batch_size, runs=runs)
+        compiled = measure_latency(compiled_ner, batch_size, runs=runs)
+        report["batch_sizes"][str(batch_size)] = {
+            "eager": eager,
+            "compiled": compiled,
+            "speedup": round(eager["median_ms"] / max(compiled["median_ms"], 1e-9), 2)
+        }
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare eager and TorchScript NER inference latency")
+    parser.add_argument("--model_dir", default=str(MODELS_DIR / "ner_model" / "best_model"))
+    parser.add_argument("--batch_sizes", default=",".join(str(size) for size in BATCH_SIZES))
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    print("🚀 Compiled NER Benchmark")
+    print("=" * 40)
+
+    eager_ner = load_ner(args.model_dir, compiled=False)
+    compiled_ner = load_ner(args.model_dir, compiled=True)
+    if eager_ner is None or compiled_ner is None:
+        print("❌ Model could not be loaded!")
+        sys.exit(1)
+
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",") if size.strip()]
+    report = build_report(args.model_dir, eager_ner, compiled_ner, batch_sizes, args.runs)
+
+    report_path = Path(args.model_dir) / COMPILED_BENCHMARK_FILENAME
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n📊 Compiled Benchmark (compiled active: {report['compiled_active']}):")
+    for batch_size, result in report["batch_sizes"].items():
+        print(f"   Batch {batch_size:>3}: {result['eager']['median_ms']} ms → "
+              f"{result['compiled']['median_ms']} ms (x{result['speedup']})")
+    print(f"💾 Report saved to: {report_path}")
+
+    print("=" * 40)
+    print("Done!")
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Join Planning Benchmark Script - Recursive DFS versus the precomputed
+all-pairs shortest join-path index of RelationMapper on a synthetic schema,
+and pairwise join paths versus the Steiner-tree JoinPlanner for multi-table
+queries
+"""
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.query_builder.relation_mapper import RelationMapper
+from src.query_builder.join_planner import JoinPlanner
+
+
+def synthetic_relations(num_tables, extra_edges_per_table=1, seed=42):
+    """
+    A connected FK graph: every table references one earlier table (a random
+    tree) plus a few extra references, like a hub-and-spoke ERP schema
+    """
+    rng = random.Random(seed)
+    relations = {}
+    for index in range(1, num_tables):
+        parent = rng.randrange(index)
+        relations[(f"table_{index}", f"table_{parent}_id")] = (f"table_{parent}", "id")
+        for extra in range(extra_edges_per_table):
+            target = rng.randrange(num_tables)
+            if target != index:
+                relations[(f"table_{index}", f"ref{extra}_table_{target}_id")] = (f"table_{target}", "id")
+    return relations
+
+
+def legacy_find_join_path(relations, start_table, end_table, visited=None):
+    """The former RelationMapper.find_join_path: first path found by recursive DFS"""
+    if visited is None:
+        visited = set()
+    visited.add(start_table)
+
+    for (src_table, src_col), (tgt_table, tgt_col) in relations.items():
+        if src_table == start_table and tgt_table == end_table:
+            return [(src_table, src_col, tgt_table, tgt_col)]
+        if src_table == start_table and tgt_table not in visited:
+            path = legacy_find_join_path(relations, tgt_table, end_table, visited)
+            if path:
+                return [(src_table, src_col, tgt_table, tgt_col)] + path
+        if tgt_table == start_table and src_table == end_table:
+            return [(tgt_table, tgt_col, src_table, src_col)]
+        if tgt_table == start_table and src_table not in visited:
+            path = legacy_find_join_path(relations, src_table, end_table, visited)
+            if path:
+                return [(tgt_table, tgt_col, src_table, src_col)] + path
+    return None
+
+
+def build_report(num_tables, num_queries=500, seed=42):
+    """Construction cost, per-lookup latency and join counts for both planners"""
+    relations = synthetic_relations(num_tables, seed=seed)
+    rng = random.Random(seed + 1)
+    tables = [f"table_{index}" for index in range(num_tables)]
+    pairs = [tuple(rng.sample(tables, 2)) for _ in range(num_queries)]
+
+    # The recursion depth of the DFS grows with the schema
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * num_tables))
+    start_time = time.perf_counter()
+    legacy_paths = [legacy_find_join_path(relations, start, end) for start, end in pairs]
+    legacy_ms = (time.perf_counter() - start_time) * 1000
+
+    start_time = time.perf_counter()
+    mapper = RelationMapper(relations)
+    build_ms = (time.perf_counter() - start_time) * 1000
+
+    start_time = time.perf_counter()
+    indexed_paths = [mapper.get_join_paths(start, end) for start, end in pairs]
+    indexed_ms = (time.perf_counter() - start_time) * 1000
+
+    legacy_joins = sum(len(path) for path in legacy_paths if path)
+    indexed_joins = sum(len(path) for path in indexed_paths if path)
+
+    return {
+        "tables": num_tables,
+        "relations": len(relations),
+        "queries": num_queries,
+        "legacy_dfs": {
+            "total_ms": round(legacy_ms, 3),
+            "per_query_us": round(legacy_ms * 1000 / num_queries, 3),
+            "total_joins": legacy_joins
+        },
+        "all_pairs_index": {
+            "build_ms": round(build_ms, 3),
+            "total_ms": round(indexed_ms, 3),
+            "per_query_us": round(indexed_ms * 1000 / num_queries, 3),
+            "total_joins": indexed_joins
+        },
+        "joins_saved": legacy_joins - indexed_joins,
+        "lookup_speedup": round(legacy_ms / max(indexed_ms, 1e-9), 1)
+    }
+
+
+def pairwise_join_count(mapper, main_table, tables):
+    """Former SQLGenerator planning: one shortest path per table, identical edges deduplicated"""
+    used_joins = set()
+    for table in tables:
+        used_joins.update(mapper.get_join_paths(main_table, table))
+    return len(used_joins)
+
+
+def build_tree_report(num_tables, tables_per_query, num_queries=200, seed=42):
+    """Join counts and planning time of pairwise paths vs the Steiner-tree planner"""
+    mapper = RelationMapper(synthetic_relations(num_tables, seed=seed))
+    planner = JoinPlanner(mapper)
+    rng = random.Random(seed + 2)
+    tables = [f"table_{index}" for index in range(num_tables)]
+    queries = [rng.sample(tables, tables_per_query) for _ in range(num_queries)]
+
+    pairwise_joins = sum(pairwise_join_count(mapper, query[0], query[1:]) for query in queries)
+
+    start_time = time.perf_counter()
+    tree_joins = sum(len(planner.plan(query[0], query[1:])) for query in queries)
+    plan_ms = (time.perf_counter() - start_time) * 1000
+
+    return {
+        "tables": num_tables,
+        "tables_per_query": tables_per_query,
+        "solver": "exact" if tables_per_query - 1 <= planner.exact_limit else "approximate",
+        "pairwise_joins": pairwise_joins,
+        "steiner_joins": tree_joins,
+        "joins_saved_pct": round((pairwise_joins - tree_joins) / max(pairwise_joins, 1) * 100, 1),
+        "plan_ms_per_query": round(plan_ms / num_queries, 3)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark join-path planning on synthetic schemas")
+    parser.add_argument("--tables", default="50,200,500", help="Comma separated schema sizes")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--tables-per-query", default="3,5,8", help="Comma separated multi-table query sizes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Optional JSON report path")
+    args = parser.parse_args()
+
+    print("🚀 Join Planning Benchmark")
+    print("=" * 40)
+
+    reports = []
+    for num_tables in [int(size) for size in args.tables.split(",") if size.strip()]:
+        report = build_report(num_tables, args.queries, args.seed)
+        reports.append(report)
+        print(f"\n📊 {report['tables']} tables / {report['relations']} relations:")
+        print(f"   DFS: {report['legacy_dfs']['per_query_us']} µs/query, {report['legacy_dfs']['total_joins']} joins")
+        print(f"   Index: build {report['all_pairs_index']['build_ms']} ms, "
+              f"{report['all_pairs_index']['per_query_us']} µs/query, {report['all_pairs_index']['total_joins']} joins")
+        print(f"   Lookup speedup: x{report['lookup_speedup']}, joins saved: {report['joins_saved']}")
+
+    tree_reports = []
+    for num_tables in [int(size) for size in args.tables.split(",") if size.strip()]:
+        for tables_per_query in [int(size) for size in args.tables_per_query.split(",") if size.strip()]:
+            report = build_tree_report(num_tables, tables_per_query, min(args.queries, 200), args.seed)
+            tree_reports.append(report)
+            print(f"\n🌳 {report['tables']} tables, {report['tables_per_query']} per query ({report['solver']}):")
+            print(f"   Pairwise: {report['pairwise_joins']} joins, Steiner: {report['steiner_joins']} joins "
+                  f"(-{report['joins_saved_pct']}%), {report['plan_ms_per_query']} ms/plan")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"join_paths": reports, "join_trees": tree_reports}, f, indent=2)
+        print(f"💾 Report saved to: {args.output}")
+
+    print("=" * 40)
+    print("Done!")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Padding Benchmark Script - Tokens and encoder FLOPs for fixed max_length=512
+padding versus per-batch dynamic padding with length buckets
+"""
+import sys
+import json
+import pickle
+import random
+import argparse
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.model_config import MODELS_DIR, MAX_SEQUENCE_LENGTH, PAD_TO_MULTIPLE_OF
+
+# BERT-base encoder dimensions
+NUM_LAYERS = 12
+HIDDEN_SIZE = 768
+INTERMEDIATE_SIZE = 3072
+
+SAMPLE_QUERIES = [
+    "Bu ayın müşteri sayısı",
+    "Geçen yıl sipariş toplamı",
+    "Son 30 gün ürün listesi",
+    "2022 3. çeyrek çalışan maaşları",
+    "Tüm tedarikçileri listele",
+    "Geçen ay en çok satılan ürünlerin kategorilerine göre toplam satış tutarı"
+]
+
+
+def encoder_flops(sequence_length):
+    """
+    Forward FLOPs of one sequence through the encoder (2 FLOPs per multiply-add)
+
+    Projections and feed-forward grow linearly with length, attention scores
+    and the weighted sum grow quadratically.
+    """
+    linear = 4 * sequence_length * HIDDEN_SIZE ** 2 + 2 * sequence_length * HIDDEN_SIZE * INTERMEDIATE_SIZE
+    attention = 2 * sequence_length ** 2 * HIDDEN_SIZE
+    return 2 * NUM_LAYERS * (linear + attention)
+
+
+def round_up(length, multiple):
+    return -(-length // multiple) * multiple if multiple else length
+
+
+def padded_lengths(lengths, batch_size, policy):
+    """Padded length of every sample under a padding policy"""
+    if policy == "fixed":
+        return [MAX_SEQUENCE_LENGTH] * len(lengths)
+
+    order = list(range(len(lengths)))
+    if policy == "bucketed":
+        order.sort(key=lambda index: lengths[index])
+
+    padded = []
+    for start in range(0, len(order), batch_size):
+        batch = [lengths[index] for index in order[start:start + batch_size]]
+        longest = round_up(max(batch), PAD_TO_MULTIPLE_OF) if policy == "bucketed" else max(batch)
+        padded.extend([min(longest, MAX_SEQUENCE_LENGTH)] * len(batch))
+    return padded
+
+
+def load_lengths(data_path, tokenizer_name):
+    """Token counts of the processed test split, or of the sample queries"""
+    if data_path.exists():
+        with open(data_path, 'rb') as f:
+            return [len(item["input_ids"]) for item in pickle.load(f)]
+
+    print(f"⚠️ {data_path} not found, tokenizing sample queries")
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+    return [len(tokenizer(text)["input_ids"]) for text in SAMPLE_QUERIES]
+
+
+def build_report(lengths, batch_size):
+    """Tokens and FLOPs per padding policy, relative to fixed padding"""
+    real_tokens = sum(lengths)
+    report = {"samples": len(lengths), "real_tokens": real_tokens, "batch_size": batch_size, "policies": {}}
+
+    for policy in ("fixed", "dynamic", "bucketed"):
+        padded = padded_lengths(lengths, batch_size, policy)
+        report["policies"][policy] = {
+            "padded_tokens": sum(padded),
+            "padding_ratio": round(sum(padded) / max(real_tokens, 1), 2),
+            "gflops": round(sum(encoder_flops(length) for length in padded) / 1e9, 2)
+        }
+
+    fixed_gflops = report["policies"]["fixed"]["gflops"]
+    for stats in report["policies"].values():
+        stats["flops_saved_pct"] = round(100 * (1 - stats["gflops"] / fixed_gflops), 2) if fixed_gflops else 0.0
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare fixed and dynamic padding cost")
+    parser.add_argument("--data", default=str(MODELS_DIR / "ner_data" / "test_data.pkl"))
+    parser.add_argument("--batch_size", type=int, default=16)
+    parser.add_argument("--tokenizer", default="dbmdz/bert-base-turkish-cased")
+    args = parser.parse_args()
+
+    print("🚀 Padding Benchmark Script")
+    print("=" * 40)
+
+    lengths = load_lengths(Path(args.data), args.tokenizer)
+    random.shuffle(lengths)
+    report = build_report(lengths, args.batch_size)
+
+    print(f"📊 {report['samples']} samples, {report['real_tokens']} real tokens, batch size {args.batch_size}")
+    for policy, stats in report["policies"].items():
+        print(f"   {policy:<9} {stats['padded_tokens']:>10} tokens (x{stats['padding_ratio']}) "
+              f"{stats['gflops']:>10} GFLOPs  saved {stats['flops_saved_pct']}%")
+
+    print(json.dumps(report, indent=2))
+    print("=" * 40)
+    print("Done!")
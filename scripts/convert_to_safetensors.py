@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Safetensors Conversion Script - Rewrites pytorch_model.bin checkpoints as model.safetensors
+so that model loading memory-maps the weights instead of unpickling and copying them
+"""
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.model_config import MODELS_DIR, BERTURK_LOCAL_PATH
+
+
+DEFAULT_MODEL_DIRS = [
+    BERTURK_LOCAL_PATH,
+    MODELS_DIR / "ner_model" / "best_model",
+    MODELS_DIR / "ner_model"
+]
+
+
+def needs_conversion(model_dir):
+    """A directory with a .bin checkpoint and no safetensors file"""
+    model_dir = Path(model_dir)
+    return (model_dir / "pytorch_model.bin").exists() and not (model_dir / "model.safetensors").exists()
+
+
+def convert_model_dir(model_dir, remove_bin=False):
+    """Load the checkpoint once and save it back with safe serialization"""
+    from transformers import AutoModel, AutoModelForTokenClassification
+
+    model_dir = Path(model_dir)
+    with open(model_dir / "config.json", 'r', encoding='utf-8') as f:
+        architectures = json.load(f).get("architectures") or []
+
+    model_class = AutoModelForTokenClassification if any(
+        "TokenClassification" in arch for arch in architectures
+    ) else AutoModel
+
+    model = model_class.from_pretrained(model_dir, local_files_only=True)
+    model.save_pretrained(model_dir, safe_serialization=True)
+
+    if remove_bin:
+        (model_dir / "pytorch_model.bin").unlink()
+
+    size_mb = (model_dir / "model.safetensors").stat().st_size / (1024 * 1024)
+    print(f"✅ {model_dir} → model.safetensors ({size_mb:.1f} MB)")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert model checkpoints to safetensors")
+    parser.add_argument("model_dirs", nargs="*", help="Defaults to the BERTurk and NER model directories")
+    parser.add_argument("--remove_bin", action="store_true", help="Delete pytorch_model.bin after converting")
+    args = parser.parse_args()
+
+    print("🚀 Safetensors Conversion Script")
+    print("=" * 40)
+
+    model_dirs = [Path(d) for d in args.model_dirs] or DEFAULT_MODEL_DIRS
+    for model_dir in model_dirs:
+        if not (model_dir / "config.json").exists():
+            print(f"⏭️ Skipping {model_dir}: no model found")
+        elif not needs_conversion(model_dir):
+            print(f"⏭️ Skipping {model_dir}: already safetensors")
+        else:
+            try:
+                convert_model_dir(model_dir, remove_bin=args.remove_bin)
+            except Exception as e:
+                print(f"❌ Conversion failed for {model_dir}: {e}")
+
+    print("=" * 40)
+    print("Done!")
@@ -71,7 +71,6 @@ def verify_download():
     """Verify downloaded model"""
     required_files = [
         "config.json",
-        "pytorch_model.bin",
         "tokenizer_config.json",
         "vocab.txt"
     ]
@@ -82,7 +81,16 @@ def verify_download():
             print(f"❌ Missing: {file}")
             return False
 
-    print("✅ All model files present")
+    # Either weight format loads; safetensors is memory-mapped (faster cold start)
+    if (BERTURK_LOCAL_PATH / "model.safetensors").exists():
+        print("✅ All model files present (safetensors)")
+    elif (BERTURK_LOCAL_PATH / "pytorch_model.bin").exists():
+        print("✅ All model files present")
+        print("💡 Run scripts/convert_to_safetensors.py for memory-mapped loading")
+    else:
+        print("❌ Missing: model.safetensors or pytorch_model.bin")
+        return False
+
     return True
 
 
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+ONNX Export Script - Converts the fine-tuned NER model for onnxruntime serving
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.model_config import MODELS_DIR
+from src.nlp.ner_model.turkish_ner import TurkishNER, ONNX_MODEL_FILENAME
+
+
+SAMPLE_TEXTS = [
+    "Bu ayın müşteri sayısı",
+    "Geçen yıl sipariş toplamı",
+    "Son 30 gün ürün listesi",
+    "2022 3. çeyrek çalışan maaşları"
+]
+
+
+def export_model(model_dir, output_path):
+    """Export the torch model found in model_dir to ONNX"""
+    ner = TurkishNER(backend="torch")
+    if not ner.load_model(model_dir):
+        print(f"❌ No trained model found at: {model_dir}")
+        return None
+
+    return ner.export_onnx(output_path)
+
+
+def verify_export(model_dir, runs=20):
+    """Compare torch and onnxruntime predictions and latency on sample texts"""
+    torch_ner = TurkishNER(backend="torch")
+    onnx_ner = TurkishNER(backend="onnx")
+    if not torch_ner.load_model(model_dir) or not onnx_ner.load_model(model_dir):
+        print("❌ Could not load both backends for verification")
+        return False
+
+    all_match = True
+    for text in SAMPLE_TEXTS:
+        torch_entities = torch_ner.predict(text)
+        onnx_entities = onnx_ner.predict(text)
+        match = torch_entities == onnx_entities
+        all_match = all_match and match
+        print(f"  {'✅' if match else '❌'} '{text}' → {len(onnx_entities)} entities")
+
+    for name, ner in (("torch", torch_ner), ("onnx", onnx_ner)):
+        latencies = []
+        for _ in range(runs):
+            start_time = time.perf_counter()
+            ner.predict(SAMPLE_TEXTS[0])
+            latencies.append((time.perf_counter() - start_time) * 1000)
+        print(f"⏱️ {name}: median {np.median(latencies):.2f} ms, p95 {np.percentile(latencies, 95):.2f} ms")
+
+    return all_match
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the Turkish NER model to ONNX")
+    parser.add_argument("--model_dir", default=str(MODELS_DIR / "ner_model" / "best_model"))
+    parser.add_argument("--output", default=None, help=f"Defaults to <model_dir>/{ONNX_MODEL_FILENAME}")
+    parser.add_argument("--skip_verify", action="store_true")
+    args = parser.parse_args()
+
+    print("🚀 NER ONNX Export Script")
+    print("=" * 40)
+
+    model_dir = Path(args.model_dir)
+    output_path = Path(args.output) if args.output else model_dir / ONNX_MODEL_FILENAME
+
+    exported = export_model(model_dir, output_path)
+    if exported and not args.skip_verify and output_path.parent == model_dir:
+        print("🔍 Verifying exported model...")
+        if verify_export(model_dir):
+            print("✅ ONNX predictions match the torch model")
+        else:
+            print("⚠️ ONNX predictions differ from the torch model")
+
+    print("=" * 40)
+    print("Done!")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+NER Quantization Script - Dynamic int8 conversion with accuracy-regression report
+"""
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add project root and ner_model directory to path (ner_trainer uses flat imports)
+sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent / "src" / "nlp" / "ner_model"))
+
+from config.model_config import MODELS_DIR
+from turkish_ner import TurkishNER, QUANTIZED_MODEL_DIRNAME, QUANTIZED_WEIGHTS_FILENAME
+from ner_trainer import NERTrainer
+
+
+LATENCY_TEXTS = [
+    "Bu ayın müşteri sayısı",
+    "Geçen yıl sipariş toplamı",
+    "Son 30 gün ürün listesi",
+    "2022 3. çeyrek çalışan maaşları"
+]
+
+
+def quantize_model(model_dir, output_dir):
+    """Load the fp32 model, quantize Linear layers to int8 and save the artifact"""
+    ner = TurkishNER(backend="torch", quantized=False)
+    if not ner.load_model(model_dir):
+        return None
+
+    ner.quantize_dynamic()
+    if not ner.save_quantized_model(output_dir):
+        return None
+
+    return ner
+
+
+def measure_latency(ner, runs=30):
+    """Median and p95 single-query latency in milliseconds"""
+    latencies = []
+    for i in range(runs):
+        text = LATENCY_TEXTS[i % len(LATENCY_TEXTS)]
+        start_time = time.perf_counter()
+        ner.predict(text)
+        latencies.append((time.perf_counter() - start_time) * 1000)
+
+    return {
+        "median_ms": round(float(np.median(latencies)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3)
+    }
+
+
+def directory_size_mb(path, pattern):
+    """Size of the weight files in a model directory"""
+    return round(sum(f.stat().st_size for f in Path(path).glob(pattern)) / (1024 * 1024), 2)
+
+
+def evaluate_on_test_split(trainer, ner):
+    """Run NERTrainer.evaluate_on_test for the given model on CPU"""
+    trainer.model = ner
+    trainer.device = "cpu"
+    ner.model.to("cpu")
+    return trainer.evaluate_on_test()
+
+
+def build_report(model_dir, output_dir, fp32_ner, int8_ner):
+    """Compare fp32 and int8 models on the NERTrainer test split"""
+    report = {
+        "fp32_model": str(model_dir),
+        "int8_model": str(output_dir),
+        "quantization": "torch.ao.quantization.quantize_dynamic(Linear → qint8)",
+        "latency": {
+            "fp32": measure_latency(fp32_ner),
+            "int8": measure_latency(int8_ner)
+        },
+        "size_mb": {
+            "fp32": directory_size_mb(model_dir, "*.safetensors") or directory_size_mb(model_dir, "*.bin"),
+            "int8": directory_size_mb(output_dir, QUANTIZED_WEIGHTS_FILENAME)
+        }
+    }
+
+    trainer = NERTrainer()
+    if trainer.load_data():
+        fp32_results = evaluate_on_test_split(trainer, fp32_ner)
+        int8_results = evaluate_on_test_split(trainer, int8_ner)
+        report["test_results"] = {"fp32": fp32_results, "int8": int8_results}
+        report["f1_delta"] = int8_results["test_f1"] - fp32_results["test_f1"]
+    else:
+        print("⚠️ Test split not found, report contains latency and size only")
+
+    report["speedup"] = round(
+        report["latency"]["fp32"]["median_ms"] / max(report["latency"]["int8"]["median_ms"], 1e-9), 2
+    )
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quantize the Turkish NER model to dynamic int8")
+    parser.add_argument("--model_dir", default=str(MODELS_DIR / "ner_model" / "best_model"))
+    parser.add_argument("--output_dir", default=str(MODELS_DIR / "ner_model" / QUANTIZED_MODEL_DIRNAME))
+    parser.add_argument("--skip_report", action="store_true")
+    args = parser.parse_args()
+
+    print("🚀 NER Quantization Script")
+    print("=" * 40)
+
+    int8_ner = quantize_model(args.model_dir, args.output_dir)
+    if int8_ner is None:
+        print("❌ Quantization failed!")
+        sys.exit(1)
+
+    if not args.skip_report:
+        fp32_ner = TurkishNER(backend="torch", quantized=False)
+        fp32_ner.load_model(args.model_dir)
+
+        report = build_report(Path(args.model_dir), Path(args.output_dir), fp32_ner, int8_ner)
+        report_path = Path(args.output_dir) / "quantization_report.json"
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+        print(f"\n📊 Quantization Report:")
+        print(f"   Size: {report['size_mb']['fp32']} MB → {report['size_mb']['int8']} MB")
+        print(f"   Median latency: {report['latency']['fp32']['median_ms']} ms → "
+              f"{report['latency']['int8']['median_ms']} ms (x{report['speedup']})")
+        if "f1_delta" in report:
+            print(f"   Test F1: {report['test_results']['fp32']['test_f1']:.4f} → "
+                  f"{report['test_results']['int8']['test_f1']:.4f} (Δ {report['f1_delta']:+.4f})")
+        print(f"💾 Report saved to: {report_path}")
+
+    print("=" * 40)
+    print("Done!")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Thread Topology Tuning Script - Benchmarks workers x torch threads on this machine
+and saves the fastest combination for config.model_config to pick up
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.model_config import THREAD_TOPOLOGY_PATH
+from src.nlp.thread_topology import available_cpus
+
+
+BENCHMARK_TEXTS = [
+    "Bu ayın müşteri sayısı",
+    "Geçen yıl sipariş toplamı",
+    "Son 30 gün ürün listesi",
+    "2022 3. çeyrek çalışan maaşları",
+    "Son 30 gün içinde İstanbul'daki müşterilerin verdiği siparişlerin ortalama tutarı"
+]
+
+
+def candidate_topologies(cpus):
+    """(workers, threads_per_worker) pairs with workers * threads <= cpus"""
+    worker_counts = sorted({1, cpus} | {2 ** i for i in range(1, cpus.bit_length()) if 2 ** i <= cpus})
+    return [(workers, cpus // workers) for workers in worker_counts]
+
+
+def benchmark_worker(threads, workers, batch_size, duration, barrier, results):
+    """One simulated API worker: load the model, then serve batches until the deadline"""
+    # Must be set before the config module is imported in this process
+    os.environ["NLPSQL_TORCH_THREADS"] = str(threads)
+    os.environ["NLPSQL_WORKERS"] = str(workers)
+
+    from src.nlp.ner_model.turkish_ner import TurkishNER
+
+    ner = TurkishNER()
+    if not ner.load_model():
+        ner.initialize_model()
+
+    texts = [BENCHMARK_TEXTS[i % len(BENCHMARK_TEXTS)] for i in range(batch_size)]
+    ner.predict_batch(texts, batch_size=batch_size)  # warmup
+
+    barrier.wait()
+    processed = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        ner.predict_batch(texts, batch_size=batch_size)
+        processed += len(texts)
+    results.put(processed)
+
+
+def measure_topology(workers, threads, batch_size, duration):
+    """Queries per second of `workers` concurrent processes with `threads` torch threads each"""
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+
+    processes = [
+        context.Process(target=benchmark_worker, args=(threads, workers, batch_size, duration, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    processed = sum(results.get() for _ in processes)
+    for process in processes:
+        process.join()
+
+    return round(processed / duration, 2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pick API workers and torch threads per worker")
+    parser.add_argument("--batch_size", type=int, default=4, help="Texts per forward pass")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per candidate")
+    parser.add_argument("--output", default=str(THREAD_TOPOLOGY_PATH))
+    args = parser.parse_args()
+
+    print("🚀 Thread Topology Tuning Script")
+    print("=" * 40)
+
+    cpus = available_cpus()
+    print(f"🖥️ Available CPUs: {cpus}")
+
+    measurements = []
+    for workers, threads in candidate_topologies(cpus):
+        throughput = measure_topology(workers, threads, args.batch_size, args.duration)
+        measurements.append({"workers": workers, "threads_per_worker": threads, "queries_per_second": throughput})
+        print(f"   {workers:>3} workers x {threads:>3} threads → {throughput} q/s")
+
+    best = max(measurements, key=lambda m: m["queries_per_second"])
+    topology = {
+        "cpus": cpus,
+        "workers": best["workers"],
+        "threads_per_worker": best["threads_per_worker"],
+        "batch_size": args.batch_size,
+        "measurements": measurements
+    }
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(topology, f, indent=2)
+
+    print(f"✅ Best: {best['workers']} workers x {best['threads_per_worker']} threads")
+    print(f"💾 Saved to: {output_path}")
+    print("=" * 40)
+    print("Done!")
@@ -0,0 +1,5 @@
+from .lru_cache import ArrayLRUCache, LRUCache, normalize_query_text
+from .backends import (
+    CacheBackend, MemoryCacheBackend, MmapCacheBackend, SQLiteCacheBackend,
+    create_cache_backend, make_cache_key
+)
@@ -0,0 +1,342 @@
+# src/cache/backends.py
+"""
+Result cache backends for NLP analyses and generated SQL
+
+Three interchangeable stores with the same get/set interface:
+- memory: in-process LRU (one copy per worker)
+- mmap:   fixed-slot shared file, visible to every worker on the host
+- sqlite: persistent on-disk store that also survives restarts
+
+Values must be JSON-serializable. Entries carry an absolute expiry time.
+"""
+
+import hashlib
+import json
+import mmap
+import sqlite3
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: mmap still works, cross-process locking does not
+    fcntl = None
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from config.model_config import (
+    CACHE_DIR, RESULT_CACHE_BACKEND, RESULT_CACHE_TTL, RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_PATH
+)
+from src.cache.lru_cache import LRUCache
+
+SUPPORTED_CACHE_BACKENDS = ("none", "memory", "mmap", "sqlite")
+
+
+def make_cache_key(namespace, text, model_version="", schema_version=""):
+    """
+    Stable cross-process cache key
+
+    Exact text plus model and schema versions, so retraining the model or
+    changing the schema never serves stale entries. The text is not
+    normalized: the cased model can analyse two spellings differently, and
+    analyses hold character offsets into the text.
+    """
+    raw = "\x1f".join([namespace, text, model_version or "", schema_version or ""])
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class CacheBackend:
+    """Base class: TTL handling and hit/miss counters shared by all backends"""
+
+    name = "base"
+
+    def __init__(self, default_ttl=RESULT_CACHE_TTL):
+        # default_ttl in seconds, 0 or None means entries never expire
+        self.default_ttl = default_ttl
+
+        # Statistics (per process)
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.errors = 0
+
+    def _expires_at(self, ttl):
+        ttl = self.default_ttl if ttl is None else ttl
+        return time.time() + ttl if ttl else 0.0
+
+    @staticmethod
+    def _is_expired(expires_at):
+        return expires_at and expires_at <= time.time()
+
+    def get(self, key):
+        """Return the cached value or None (a failing store counts as a miss)"""
+        try:
+            value = self._get(key)
+        except Exception as e:
+            print(f"⚠️ Result cache read failed ({self.name}): {e}")
+            self.errors += 1
+            value = None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value, ttl=None):
+        """Store a JSON-serializable value, ttl overrides the default"""
+        try:
+            self._set(key, value, self._expires_at(ttl))
+            self.sets += 1
+        except Exception as e:
+            print(f"⚠️ Result cache write failed ({self.name}): {e}")
+            self.errors += 1
+
+    def _get(self, key):
+        raise NotImplementedError
+
+    def _set(self, key, value, expires_at):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def close(self):
+        """Release file handles (no-op for in-process backends)"""
+
+    def get_statistics(self):
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        hit_rate = (self.hits / lookups * 100) if lookups > 0 else 0
+
+        return {
+            "backend": self.name,
+            "default_ttl": self.default_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "errors": self.errors,
+            "hit_rate": round(hit_rate, 2)
+        }
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU with TTL, not shared between workers"""
+
+    name = "memory"
+
+    def __init__(self, max_entries=RESULT_CACHE_MAX_ENTRIES, default_ttl=RESULT_CACHE_TTL):
+        super().__init__(default_ttl)
+        self._lru = LRUCache(max_size=max_entries)
+
+    def _get(self, key):
+        entry = self._lru.get(key)
+        if entry is None or self._is_expired(entry["expires_at"]):
+            return None
+        return entry["value"]
+
+    def _set(self, key, value, expires_at):
+        self._lru.put(key, {"expires_at": expires_at, "value": value})
+
+    def clear(self):
+        self._lru.clear()
+
+    def get_statistics(self):
+        stats = super().get_statistics()
+        lru_stats = self._lru.get_statistics()
+        stats.update({"size": lru_stats["size"], "max_entries": lru_stats["max_size"],
+                      "evictions": lru_stats["evictions"]})
+        return stats
+
+
+class MmapCacheBackend(CacheBackend):
+    """
+    Direct-mapped shared-memory store backed by a file
+
+    The file is split into fixed-size slots; a key always lands in the same
+    slot, so a newer entry simply replaces an older colliding one. Slot
+    writes are guarded by a POSIX record lock on that slot's byte range.
+    """
+
+    name = "mmap"
+    # key digest, expiry timestamp, payload length
+    SLOT_HEADER = struct.Struct("<16sdI")
+
+    def __init__(self, path, slot_count=2048, slot_size=16384, default_ttl=RESULT_CACHE_TTL):
+        super().__init__(default_ttl)
+        if slot_size <= self.SLOT_HEADER.size:
+            raise ValueError(f"Slot size must exceed the {self.SLOT_HEADER.size} byte slot header")
+
+        self.path = Path(path)
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.overwrites = 0
+        self.oversized = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a+b")
+        file_size = slot_count * slot_size
+        self._locked(0, 0, fcntl.LOCK_EX if fcntl else None, lambda: self._reset_if_resized(file_size))
+        self._mmap = mmap.mmap(self._file.fileno(), file_size)
+
+    def _reset_if_resized(self, file_size):
+        """A file created with another slot layout is wiped and resized"""
+        self._file.seek(0, 2)
+        if self._file.tell() != file_size:
+            self._file.truncate(0)
+            self._file.truncate(file_size)
+
+    def _locked(self, offset, length, mode, func):
+        """Run func under the thread lock and a record lock on [offset, offset+length)"""
+        with self._lock:
+            if fcntl is None or mode is None:
+                return func()
+            fcntl.lockf(self._file, mode, length, offset)
+            try:
+                return func()
+            finally:
+                fcntl.lockf(self._file, fcntl.LOCK_UN, length, offset)
+
+    def _slot(self, key):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        return digest, (int.from_bytes(digest[:8], "little") % self.slot_count) * self.slot_size
+
+    def _get(self, key):
+        digest, offset = self._slot(key)
+
+        def read():
+            slot_digest, expires_at, length = self.SLOT_HEADER.unpack_from(self._mmap, offset)
+            if slot_digest != digest or length == 0 or self._is_expired(expires_at):
+                return None
+            start = offset + self.SLOT_HEADER.size
+            return bytes(self._mmap[start:start + length])
+
+        payload = self._locked(offset, self.slot_size, fcntl.LOCK_SH if fcntl else None, read)
+        return json.loads(payload) if payload is not None else None
+
+    def _set(self, key, value, expires_at):
+        payload = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        if len(payload) > self.slot_size - self.SLOT_HEADER.size:
+            self.oversized += 1
+            return
+
+        digest, offset = self._slot(key)
+
+        def write():
+            slot_digest, _, length = self.SLOT_HEADER.unpack_from(self._mmap, offset)
+            if length and slot_digest != digest:
+                self.overwrites += 1
+            start = offset + self.SLOT_HEADER.size
+            self._mmap[start:start + len(payload)] = payload
+            self.SLOT_HEADER.pack_into(self._mmap, offset, digest, expires_at, len(payload))
+
+        self._locked(offset, self.slot_size, fcntl.LOCK_EX if fcntl else None, write)
+
+    def clear(self):
+        def wipe():
+            for offset in range(0, self.slot_count * self.slot_size, self.slot_size):
+                self.SLOT_HEADER.pack_into(self._mmap, offset, b"\0" * 16, 0.0, 0)
+
+        self._locked(0, 0, fcntl.LOCK_EX if fcntl else None, wipe)
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    def get_statistics(self):
+        stats = super().get_statistics()
+        stats.update({"path": str(self.path), "slot_count": self.slot_count, "slot_size": self.slot_size,
+                      "overwrites": self.overwrites, "oversized": self.oversized})
+        return stats
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Persistent store in a WAL-mode SQLite database"""
+
+    name = "sqlite"
+    # Expired/overflow rows are pruned every PRUNE_INTERVAL writes
+    PRUNE_INTERVAL = 256
+
+    def __init__(self, path, max_entries=RESULT_CACHE_MAX_ENTRIES, default_ttl=RESULT_CACHE_TTL):
+        super().__init__(default_ttl)
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS result_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, created_at REAL NOT NULL)"
+        )
+
+    def _get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM result_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or self._is_expired(row[1]):
+            return None
+        return json.loads(row[0])
+
+    def _set(self, key, value, expires_at):
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO result_cache (key, value, expires_at, created_at) VALUES (?, ?, ?, ?)",
+                (key, payload, expires_at, time.time())
+            )
+            if (self.sets + 1) % self.PRUNE_INTERVAL == 0:
+                self._prune()
+
+    def _prune(self):
+        """Drop expired rows, then the oldest rows beyond max_entries"""
+        self._conn.execute("DELETE FROM result_cache WHERE expires_at > 0 AND expires_at <= ?", (time.time(),))
+        if self.max_entries:
+            self._conn.execute(
+                "DELETE FROM result_cache WHERE key NOT IN "
+                "(SELECT key FROM result_cache ORDER BY created_at DESC LIMIT ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM result_cache")
+
+    def close(self):
+        self._conn.close()
+
+    def get_statistics(self):
+        stats = super().get_statistics()
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM result_cache").fetchone()[0]
+        stats.update({"path": str(self.path), "size": size, "max_entries": self.max_entries})
+        return stats
+
+
+def create_cache_backend(backend=RESULT_CACHE_BACKEND, path=RESULT_CACHE_PATH, ttl=RESULT_CACHE_TTL,
+                         max_entries=RESULT_CACHE_MAX_ENTRIES):
+    """
+    Factory function to create the configured result cache
+
+    Returns None for backend "none".
+    """
+    if backend not in SUPPORTED_CACHE_BACKENDS:
+        raise ValueError(f"Unsupported cache backend: {backend} (expected one of {SUPPORTED_CACHE_BACKENDS})")
+
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return MemoryCacheBackend(max_entries=max_entries, default_ttl=ttl)
+    if backend == "mmap":
+        return MmapCacheBackend(path or CACHE_DIR / "result_cache.mmap", default_ttl=ttl)
+    return SQLiteCacheBackend(path or CACHE_DIR / "result_cache.sqlite", max_entries=max_entries, default_ttl=ttl)
@@ -0,0 +1,131 @@
+# src/cache/lru_cache.py
+"""
+Bounded LRU cache for NLP results
+Keys are normalized Turkish query texts, values are copied on the way in and out
+(ArrayLRUCache: NumPy arrays are frozen and shared instead of copied)
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+# Turkish dotted/dotless I must be mapped before str.lower()
+# ("I".lower() == "i" and "İ".lower() == "i̇" would be wrong for Turkish)
+_TURKISH_UPPER_I = str.maketrans({"I": "ı", "İ": "i"})
+
+
+def normalize_query_text(text):
+    """Turkish-aware casefolding plus whitespace collapse, used as cache key"""
+    return " ".join(text.translate(_TURKISH_UPPER_I).lower().split())
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with hit/miss/eviction counters
+
+    Values are deep-copied on put and on get so callers can never corrupt
+    a cached entry. A max_size of 0 disables caching.
+    """
+
+    def __init__(self, max_size=1024):
+        if max_size < 0:
+            raise ValueError("Cache size cannot be negative")
+
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return a copy of the cached value or None"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = self._entries[key]
+
+        return self._copy_out(value)
+
+    def put(self, key, value):
+        """Store a copy of value, evicting the least recently used entry if full"""
+        if self.max_size == 0:
+            return
+
+        value = self._copy_in(value)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._entries[key] = value
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _copy_in(self, value):
+        return copy.deepcopy(value)
+
+    def _copy_out(self, value):
+        return copy.deepcopy(value)
+
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get_statistics(self):
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        hit_rate = (self.hits / lookups * 100) if lookups > 0 else 0
+
+        return {
+            "enabled": self.max_size > 0,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(hit_rate, 2)
+        }
+
+
+class ArrayLRUCache(LRUCache):
+    """
+    LRUCache for NumPy arrays (or tuples/lists of them) that never copies
+
+    Stored arrays are made read-only in place and every hit returns the same
+    objects, so a hit allocates nothing; lists become tuples. Callers that
+    need to modify a value must copy it themselves.
+    """
+
+    def _copy_in(self, value):
+        return _freeze(value)
+
+    def _copy_out(self, value):
+        return value
+
+
+def _freeze(value):
+    """Read-only arrays inside immutable containers"""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+        return value
+    if isinstance(value, (tuple, list)):
+        return tuple(_freeze(item) for item in value)
+    return value
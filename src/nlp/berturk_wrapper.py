@@ -1,10 +1,13 @@
 """
 BERTurk Wrapper with Local Cache Support
+
+The model is materialized on first use (get_embeddings, get_similarity, ...);
+torch and transformers are only imported at that point.
 """
 import sys
+import threading
+import time
 import numpy as np
-import torch
-from transformers import AutoTokenizer, AutoModel
 from pathlib import Path
 
 # Add config to path
@@ -13,8 +16,14 @@ from config.model_config import (
     setup_model_environment,
     get_hf_token,
     BERTURK_MODEL_NAME,
-    BERTURK_LOCAL_PATH
+    BERTURK_LOCAL_PATH,
+    SHARE_NER_ENCODER,
+    OFFLINE_MODE,
+    MAX_SEQUENCE_LENGTH,
+    PAD_TO_MULTIPLE_OF
 )
+from src.nlp.model_registry import get_registered_model, NER_ENCODER
+from src.nlp.thread_topology import apply_torch_threads
 
 class BERTurkWrapper:
     _instance = None
@@ -27,9 +36,35 @@ class BERTurkWrapper:
 
     def __init__(self):
         if not self._initialized:
+            self._tokenizer = None
+            self._model = None
+            self._load_lock = threading.Lock()
+            self._load_time = None
+            self._initialized = True
+
+    def _shared_encoder(self):
+        """Registered NER model that can serve embeddings, if sharing is enabled"""
+        if not SHARE_NER_ENCODER:
+            return None
+        encoder = get_registered_model(NER_ENCODER)
+        if encoder is not None and encoder.supports_embeddings():
+            return encoder
+        return None
+
+    def ensure_loaded(self):
+        """Load the model if it has not been loaded yet (thread-safe)"""
+        if self.is_loaded():
+            return
+
+        with self._load_lock:
+            if self.is_loaded():
+                return
+
+            start_time = time.perf_counter()
             setup_model_environment()
+            apply_torch_threads()
             self._load_model()
-            self._initialized = True
+            self._load_time = time.perf_counter() - start_time
 
     def _load_model(self):
         """Load BERTurk model with local-first strategy"""
@@ -38,7 +73,12 @@ class BERTurkWrapper:
         if self._try_local_load():
             return
 
-        # Strategy 2: Download and cache
+        # Strategy 2: Download and cache (never in offline mode)
+        if OFFLINE_MODE:
+            raise RuntimeError(
+                f"BERTurk not found at {BERTURK_LOCAL_PATH} and offline mode is on (NLPSQL_OFFLINE=1). "
+                "Run scripts/download_models.py first."
+            )
         if self._download_and_load():
             return
 
@@ -46,11 +86,15 @@ class BERTurkWrapper:
 
     def _try_local_load(self):
         """Try loading from local cache"""
+        from transformers import AutoTokenizer, AutoModel
+
         try:
             if (BERTURK_LOCAL_PATH / "config.json").exists():
                 print("🔄 Loading BERTurk from local cache...")
-                self._tokenizer = AutoTokenizer.from_pretrained(str(BERTURK_LOCAL_PATH))
-                self._model = AutoModel.from_pretrained(str(BERTURK_LOCAL_PATH))
+                self._tokenizer = AutoTokenizer.from_pretrained(str(BERTURK_LOCAL_PATH), local_files_only=True)
+                self._model = AutoModel.from_pretrained(
+                    str(BERTURK_LOCAL_PATH), low_cpu_mem_usage=True, local_files_only=True
+                )
                 self._model.eval()
                 print("✅ Loaded from local cache")
                 return True
@@ -62,6 +106,7 @@ class BERTurkWrapper:
         """Download model and load"""
         try:
             from huggingface_hub import login, snapshot_download
+            from transformers import AutoTokenizer, AutoModel
 
             token = get_hf_token()
             if not token:
@@ -94,12 +139,18 @@ class BERTurkWrapper:
         if not text or not text.strip():
             raise ValueError("Text input cannot be empty")
 
+        if self._shared_encoder() is not None:
+            return self.get_embeddings_batch([text])[0]
+
+        self.ensure_loaded()
+        import torch
+
         try:
             inputs = self._tokenizer(
                 text,
                 return_tensors="pt",
                 truncation=True,
-                max_length=512
+                max_length=MAX_SEQUENCE_LENGTH
             )
 
             with torch.no_grad():
@@ -116,13 +167,25 @@ class BERTurkWrapper:
         if not texts:
             raise ValueError("Text list cannot be empty")
 
+        # One set of weights: NER prediction and embeddings share the encoder
+        shared_encoder = self._shared_encoder()
+        if shared_encoder is not None:
+            try:
+                return shared_encoder.get_embeddings_batch(texts)
+            except Exception as e:
+                raise RuntimeError(f"Batch embedding generation failed: {e}")
+
+        self.ensure_loaded()
+        import torch
+
         try:
             inputs = self._tokenizer(
                 texts,
                 return_tensors="pt",
                 truncation=True,
-                max_length=512,
-                padding=True
+                max_length=MAX_SEQUENCE_LENGTH,
+                padding="longest",
+                pad_to_multiple_of=PAD_TO_MULTIPLE_OF
             )
 
             with torch.no_grad():
@@ -150,19 +213,30 @@ class BERTurkWrapper:
         return float(similarity)
 
     def is_loaded(self):
-        """Check if model is loaded"""
-        return hasattr(self, '_model') and self._model is not None
+        """Check if an encoder is available (never triggers loading)"""
+        return getattr(self, '_model', None) is not None or self._shared_encoder() is not None
 
     def get_model_info(self):
-        """Get model information"""
+        """Get model information without forcing the model to load"""
         return {
             "model_name": BERTURK_MODEL_NAME,
             "local_path": str(BERTURK_LOCAL_PATH),
             "model_loaded": self.is_loaded(),
-            "max_length": 512,
+            "encoder_source": self._encoder_source(),
+            "load_strategy": "lazy",
+            "load_time_seconds": round(self._load_time, 3) if self._load_time is not None else None,
+            "max_length": MAX_SEQUENCE_LENGTH,
             "embedding_dimension": 768
         }
 
+    def _encoder_source(self):
+        """Which weights serve embeddings: the own BERTurk copy or the shared NER encoder"""
+        if self._shared_encoder() is not None:
+            return "shared_ner_encoder"
+        if getattr(self, '_model', None) is not None:
+            return "berturk"
+        return None
+
 # Convenience function
 def get_berturk_instance():
     """Get BERTurk singleton instance"""
@@ -4,8 +4,10 @@
 ✅ Tüm bu yapı üzerine SQL üretimi oturuyor.
 """
 from datetime import datetime
+import copy
 import re
 import sys
+import time
 from pathlib import Path
 
 # Add project root to path
@@ -13,6 +15,21 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 # Import our trained NER model
 from src.nlp.ner_model.turkish_ner import TurkishNER
+from src.nlp.model_registry import register_model, NER_ENCODER
+from src.nlp.startup_timer import timed_startup
+from src.nlp.gazetteer import Gazetteer
+from src.cache.lru_cache import LRUCache
+from config.model_config import (
+    EXTRACTION_CACHE_SIZE, GAZETTEER_ENABLED, GAZETTEER_MIN_COVERAGE,
+    CASCADE_ENABLED, CASCADE_CONFIDENCE_THRESHOLD, STUDENT_MODEL_DIR
+)
+
+# Cascade tiers, cheapest first, and the extraction_method each one reports
+CASCADE_TIERS = {
+    "gazetteer": "gazetteer",
+    "student": "student_ner_model",
+    "teacher": "trained_ner_model"
+}
 
 
 
@@ -23,17 +40,42 @@ class EntityExtractor:
     Replaces similarity-based approach with deep learning
     """
     
-    def __init__(self):
-        """Initialize with trained NER model"""
-        self.ner_model = TurkishNER()
+    def __init__(self, backend=None, cache_size=EXTRACTION_CACHE_SIZE, use_gazetteer=GAZETTEER_ENABLED,
+                 use_cascade=CASCADE_ENABLED):
+        """
+        Initialize with trained NER model
+
+        Args:
+            backend: "torch" or "onnx"; defaults to NER_BACKEND from config
+            cache_size: Max cached extraction results (0 disables the cache)
+            use_gazetteer: Serve fully covered closed-vocabulary queries without the model
+            use_cascade: Try the small student model (if trained) before the full model
+        """
+        self.ner_model = TurkishNER(backend=backend) if backend else TurkishNER()
+        self.student_model = None
         self.is_loaded = False
+
+        # Repeated texts skip the regex passes and the forward pass
+        self.result_cache = LRUCache(max_size=cache_size)
+        self.gazetteer = None
         
         # Statistics
         self.extracted_queries = 0
         self.successful_extractions = 0
+        self.cascade_escalations = 0
+        self.tier_stats = {tier: {"hits": 0, "queries": 0, "total_time": 0.0} for tier in CASCADE_TIERS}
         
         # Load trained model
-        self._load_ner_model()
+        with timed_startup("ner_model"):
+            self._load_ner_model()
+
+        if use_gazetteer:
+            # Gazetteer entities carry the loaded model's labels
+            self.gazetteer = Gazetteer(label_to_id=self.ner_model.label_to_id if self.is_loaded else None)
+
+        if use_cascade and self.is_loaded:
+            with timed_startup("student_model"):
+                self._load_student_model()
 
     def _load_ner_model(self):
         """Load the trained NER model"""
@@ -41,7 +83,13 @@ class EntityExtractor:
         
         if self.ner_model.load_model():
             self.is_loaded = True
+            # BERTurkWrapper reuses this encoder for embeddings
+            register_model(NER_ENCODER, self.ner_model)
             print("✅ NER model loaded successfully!")
+        elif self.ner_model.backend != "torch":
+            # A fresh, untrained model can only be built with torch
+            print(f"❌ Failed to load NER model for the {self.ner_model.backend} backend!")
+            self.is_loaded = False
         else:
             print("⚠️ Trained model not found, initializing fresh model...")
             if self.ner_model.initialize_model():
@@ -51,28 +99,202 @@ class EntityExtractor:
                 print("❌ Failed to initialize NER model!")
                 self.is_loaded = False
 
-    def extract(self, text):
+    def _load_student_model(self):
+        """Load the cascade student if one has been trained"""
+        student_path = STUDENT_MODEL_DIR / "best_model"
+        if not (student_path / "config.json").exists():
+            return
+
+        student = TurkishNER(backend=self.ner_model.backend)
+        if student.load_model(student_path):
+            self.student_model = student
+            print("✅ Cascade student model loaded!")
+        else:
+            print("⚠️ Cascade student model could not be loaded, using the full model only")
+
+    def extract(self, text, use_cache=True):
         """
         Extract entities and intents from text using trained NER model
         
         Args:
             text: Input Turkish text
+            use_cache: Read/write the extraction cache (False always runs the model)
             
         Returns:
             Dictionary with extracted entities, intents, and metadata
         """
-        if not text or not text.strip():
-            raise ValueError("Text input cannot be empty")
-        
+        return self.extract_batch([text], batch_size=1, use_cache=use_cache)[0]
+
+    def extract_batch(self, texts, batch_size=8, use_cache=True):
+        """
+        Extract entities and intents for multiple texts
+        Runs the NER model once per padded batch instead of once per text
+
+        Args:
+            texts: List of input Turkish texts
+            batch_size: Number of texts per NER forward pass
+            use_cache: Read/write the extraction cache (False always runs the model)
+
+        Returns:
+            List of extraction dictionaries (same format as extract)
+        """
+        for text in texts:
+            if not text or not text.strip():
+                raise ValueError("Text input cannot be empty")
+
         if not self.is_loaded:
             raise RuntimeError("NER model not loaded. Cannot perform extraction.")
-        
-        self.extracted_queries += 1
-        parsed_entities = {}
-        # 👇 Manuel tarih yakalama (örneğin 2025-08-12 gibi)
-        date_matches = re.findall(r"\b\d{2}\.\d{2}\.\d{4}\b", text)
 
+        self.extracted_queries += len(texts)
+        results = [None] * len(texts)
+
+        # Serve cached texts directly, group misses by cache key. The key is
+        # the exact text: entity/time filter offsets and matched_pattern are
+        # positions in that text, another spelling would get wrong spans
+        use_cache = use_cache and self.result_cache.max_size > 0
+        pending = {}
+        for index, text in enumerate(texts):
+            cache_key = text
+            cached = self.result_cache.get(cache_key) if use_cache else None
+            if cached is not None:
+                results[index] = cached
+                self.successful_extractions += 1
+            else:
+                pending.setdefault(cache_key, []).append(index)
+
+        if not pending:
+            return results
+
+        miss_texts = [texts[indices[0]] for indices in pending.values()]
+        manual_time_filters = [self._extract_manual_time_filters(text) for text in miss_texts]
+
+        # Cheapest tier first: gazetteer, then the student model, then the full model
+        batch_entities = [None] * len(miss_texts)
+        tiers = [None] * len(miss_texts)
+
+        if self.gazetteer is not None:
+            start_time = time.perf_counter()
+            for position, (text, time_filters) in enumerate(zip(miss_texts, manual_time_filters)):
+                batch_entities[position] = self._match_gazetteer(text, time_filters)
+                if batch_entities[position] is not None:
+                    tiers[position] = "gazetteer"
+            self._record_tier("gazetteer", len(miss_texts), time.perf_counter() - start_time)
+
+        if self.student_model is not None:
+            try:
+                self._run_model_tier("student", self.student_model, miss_texts, batch_entities, tiers,
+                                     batch_size, accept=self._student_is_confident)
+            except Exception as e:
+                # The full model still answers every query
+                print(f"⚠️ Student model failed, escalating: {e}")
+
+        try:
+            self._run_model_tier("teacher", self.ner_model, miss_texts, batch_entities, tiers, batch_size)
+        except Exception as e:
+            print(f"❌ Entity extraction failed: {e}")
+            for indices in pending.values():
+                for index in indices:
+                    results[index] = self._create_error_result(texts[index], e)
+            return results
+
+        for (cache_key, indices), text, all_entities, time_filters, tier in zip(
+                pending.items(), miss_texts, batch_entities, manual_time_filters, tiers):
+            try:
+                extraction = self._build_extraction(text, all_entities, time_filters)
+                extraction["metadata"]["extraction_method"] = CASCADE_TIERS[tier]
+                self.tier_stats[tier]["hits"] += len(indices)
+            except Exception as e:
+                print(f"❌ Entity extraction failed: {e}")
+                for index in indices:
+                    results[index] = self._create_error_result(texts[index], e)
+                continue
+
+            # Errors are never cached
+            if use_cache:
+                self.result_cache.put(cache_key, extraction)
+            results[indices[0]] = extraction
+            for index in indices[1:]:
+                results[index] = copy.deepcopy(extraction)
+            self.successful_extractions += len(indices)
+
+        return results
+
+    def _run_model_tier(self, tier, model, texts, batch_entities, tiers, batch_size, accept=None):
+        """
+        Run a NER model on every text no cheaper tier has answered
+
+        Results rejected by accept (if given) stay unanswered for the next tier.
+        """
+        positions = [position for position, answered_by in enumerate(tiers) if answered_by is None]
+        if not positions:
+            return
+
+        start_time = time.perf_counter()
+        predictions = model.predict_batch(
+            [texts[position] for position in positions],
+            batch_size=batch_size,
+            return_confidence=True
+        )
+        self._record_tier(tier, len(positions), time.perf_counter() - start_time)
+
+        for position, entities in zip(positions, predictions):
+            if accept is None or accept(entities):
+                batch_entities[position] = entities
+                tiers[position] = tier
+            else:
+                self.cascade_escalations += 1
+
+    def _student_is_confident(self, entities):
+        """Every span above the cascade threshold and the result SQL-ready"""
+        if not entities:
+            return False
+        if min(entity["confidence"] or 0.0 for entity in entities) < CASCADE_CONFIDENCE_THRESHOLD:
+            return False
+
+        by_confidence = sorted(entities, key=lambda e: e["confidence"] or 0.0, reverse=True)
+        tables = [entity for entity in by_confidence if entity["label"].startswith("TABLE_")]
+        intents = [entity for entity in by_confidence if entity["label"].startswith("INTENT_")]
+        return self._is_sql_ready(tables, intents)
+
+    def _record_tier(self, tier, queries, elapsed):
+        """Accumulate how many queries a tier saw and how long it took"""
+        self.tier_stats[tier]["queries"] += queries
+        self.tier_stats[tier]["total_time"] += elapsed
+
+    def _match_gazetteer(self, text, manual_time_filters):
+        """
+        Gazetteer entities if they cover the whole query well enough to skip the model
+
+        Returns:
+            Entity list in TurkishNER.predict format, or None when the model must run
+        """
+        if self.gazetteer is None:
+            return None
+
+        entities = self.gazetteer.match(text)
+        labels = [entity["label"] for entity in entities]
+        if not any(label.startswith("TABLE_") for label in labels):
+            return None
+        if not any(label.startswith("INTENT_") for label in labels):
+            return None
+        if self.gazetteer.coverage(text, entities, manual_time_filters) < GAZETTEER_MIN_COVERAGE:
+            return None
+
+        # A table named twice ("işçilerin maaşı") is still one table
+        seen_tables = set()
+        unique_entities = []
+        for entity in entities:
+            if entity["label"].startswith("TABLE_"):
+                if entity["label"] in seen_tables:
+                    continue
+                seen_tables.add(entity["label"])
+            unique_entities.append(entity)
+        return unique_entities
+
+    def _extract_manual_time_filters(self, text):
+        """Regex-based date and year detection that complements the NER model"""
         manual_time_filters = []
+        # 👇 Manuel tarih yakalama (örneğin 2025-08-12 gibi)
         # Tarih formatları (yyyy-mm-dd veya dd.mm.yyyy)
         date_matches_iter = re.finditer(r"\b\d{4}-\d{2}-\d{2}\b|\b\d{2}\.\d{2}\.\d{4}\b", text)
         for match in date_matches_iter:
@@ -122,82 +344,80 @@ class EntityExtractor:
             except ValueError:
                 continue
 
-                
-        try:
-            # Get all entities from NER model
-            all_entities = self.ner_model.predict(text, return_confidence=True)
-            
-            # Separate entities by type
-            tables = []
-            time_filters = manual_time_filters.copy()
-            intents = []
-            numbers = []
-            other_entities = []
-            
-            for entity in all_entities:
-                label = entity["label"]
-                
-                if label.startswith("TABLE_"):
-                    tables.append(self._format_table_entity(entity))
-                elif label.startswith("TIME_"):
-                    time_filters.append(self._format_time_entity(entity))
-                elif label.startswith("INTENT_"):
-                    intents.append(self._format_intent_entity(entity))
-                    # Ek olarak aggregation_modifier olarak işaretle
-                    if label == "INTENT_MAX":
-                        parsed_entities["aggregation_modifier"] = "MAX"
-                    elif label == "INTENT_MIN":
-                        parsed_entities["aggregation_modifier"] = "MIN"
-                elif label in ["TIME_NUMBER", "TIME_UNIT"]:
-                    numbers.append(self._format_number_entity(entity))
-                else:
-                    other_entities.append(entity)
-            
-            # Sort by confidence
-            tables.sort(key=lambda x: x["confidence"], reverse=True)
-            time_filters.sort(key=lambda x: x["confidence"], reverse=True)
-            intents.sort(key=lambda x: x["confidence"], reverse=True)
-            
-            # Determine primary intent
-            primary_intent = self._determine_primary_intent(intents)
-            
-            # Create metadata
-            metadata = self._create_metadata(tables, time_filters, intents, all_entities)
-            
-            result = {
-                "text": text,
-                "tables": tables,
-                "time_filters": time_filters,
-                "intents": intents,
-                "primary_intent": primary_intent,
-                "numbers": numbers,
-                "other_entities": other_entities,
-                "all_entities": all_entities,
-                "metadata": metadata,
-                "entities": parsed_entities
-            }
-            
-            self.successful_extractions += 1
-            return result
+        return manual_time_filters
+
+    def _build_extraction(self, text, all_entities, manual_time_filters):
+        """Group raw NER entities into the extraction result format"""
+        parsed_entities = {}
+
+        # Separate entities by type
+        tables = []
+        time_filters = manual_time_filters.copy()
+        intents = []
+        numbers = []
+        other_entities = []
+        
+        for entity in all_entities:
+            label = entity["label"]
             
-        except Exception as e:
-            print(f"❌ Entity extraction failed: {e}")
-            return {
-                "text": text,
-                "tables": [],
-                "time_filters": [],
-                "intents": [],
-                "primary_intent": None,
-                "numbers": [],
-                "other_entities": [],
-                "all_entities": [],
-                "metadata": {
-                    "processing_status": "error",
-                    "error_message": str(e),
-                    "total_entities": 0,
-                    "complexity": "error"
-                }
+            if label.startswith("TABLE_"):
+                tables.append(self._format_table_entity(entity))
+            elif label.startswith("TIME_"):
+                time_filters.append(self._format_time_entity(entity))
+            elif label.startswith("INTENT_"):
+                intents.append(self._format_intent_entity(entity))
+                # Ek olarak aggregation_modifier olarak işaretle
+                if label == "INTENT_MAX":
+                    parsed_entities["aggregation_modifier"] = "MAX"
+                elif label == "INTENT_MIN":
+                    parsed_entities["aggregation_modifier"] = "MIN"
+            elif label in ["TIME_NUMBER", "TIME_UNIT"]:
+                numbers.append(self._format_number_entity(entity))
+            else:
+                other_entities.append(entity)
+        
+        # Sort by confidence
+        tables.sort(key=lambda x: x["confidence"], reverse=True)
+        time_filters.sort(key=lambda x: x["confidence"], reverse=True)
+        intents.sort(key=lambda x: x["confidence"], reverse=True)
+        
+        # Determine primary intent
+        primary_intent = self._determine_primary_intent(intents)
+        
+        # Create metadata
+        metadata = self._create_metadata(tables, time_filters, intents, all_entities)
+        
+        return {
+            "text": text,
+            "tables": tables,
+            "time_filters": time_filters,
+            "intents": intents,
+            "primary_intent": primary_intent,
+            "numbers": numbers,
+            "other_entities": other_entities,
+            "all_entities": all_entities,
+            "metadata": metadata,
+            "entities": parsed_entities
+        }
+
+    def _create_error_result(self, text, error):
+        """Empty extraction result returned when the NER step fails"""
+        return {
+            "text": text,
+            "tables": [],
+            "time_filters": [],
+            "intents": [],
+            "primary_intent": None,
+            "numbers": [],
+            "other_entities": [],
+            "all_entities": [],
+            "metadata": {
+                "processing_status": "error",
+                "error_message": str(error),
+                "total_entities": 0,
+                "complexity": "error"
             }
+        }
 
     def _format_table_entity(self, entity):
         """Format table entity for consistency with old interface"""
@@ -362,9 +582,58 @@ class EntityExtractor:
             "success_rate": round(success_rate, 2),
             "extraction_method": "trained_ner_model",
             "model_loaded": self.is_loaded,
-            "model_info": self.ner_model.get_model_info() if self.is_loaded else None
+            "cascade": self.get_cascade_statistics(),
+            "model_info": self.ner_model.get_model_info() if self.is_loaded else None,
+            "result_cache": self.result_cache.get_statistics()
         }
 
+    def get_cascade_statistics(self):
+        """Per-tier hit counters and latency breakdown"""
+        tiers = {}
+        for tier, stats in self.tier_stats.items():
+            tiers[tier] = {
+                "hits": stats["hits"],
+                "queries": stats["queries"],
+                "total_time_ms": round(stats["total_time"] * 1000.0, 3),
+                "avg_time_ms": round(stats["total_time"] * 1000.0 / stats["queries"], 3) if stats["queries"] else 0.0
+            }
+
+        return {
+            "student_loaded": self.student_model is not None,
+            "confidence_threshold": CASCADE_CONFIDENCE_THRESHOLD,
+            "escalations": self.cascade_escalations,
+            "tiers": tiers
+        }
+
+    def get_model_version(self):
+        """Version of the loaded NER artifacts (None for untrained weights)"""
+        if not self.is_loaded or not self.ner_model.model_version:
+            return None
+        if self.student_model is not None:
+            # Cascade results depend on both models
+            return f"{self.ner_model.model_version}+{self.student_model.model_version}"
+        return self.ner_model.model_version
+
+    def get_cache_version(self):
+        """
+        Model version plus the routing settings that change extraction results
+
+        Shared (mmap/sqlite) result caches outlive a process, so workers or
+        restarts with another gazetteer/cascade configuration must not read
+        each other's entries. None for untrained weights.
+        """
+        model_version = self.get_model_version()
+        if not model_version:
+            return None
+
+        gazetteer = f"gazetteer={GAZETTEER_MIN_COVERAGE}" if self.gazetteer is not None else "gazetteer=off"
+        cascade = f"cascade={CASCADE_CONFIDENCE_THRESHOLD}" if self.student_model is not None else "cascade=off"
+        return f"{model_version};{gazetteer};{cascade}"
+
+    def clear_cache(self):
+        """Drop cached extraction results (e.g. after reloading the model)"""
+        self.result_cache.clear()
+
     def is_ready(self):
         """Check if extractor is ready for use"""
         return self.is_loaded
@@ -0,0 +1,252 @@
+# src/nlp/gazetteer.py
+"""
+Gazetteer fast path for entity extraction
+A compiled Aho-Corasick matcher over the closed query vocabulary (table
+aliases, intent words, time phrases). Queries it fully covers never reach
+the NER model.
+"""
+
+import re
+from collections import deque
+
+# Vocabulary mirrors the aliases used to generate the NER training data and
+# labels entities exactly as scripts/generate_ner_data.py does, so gazetteer
+# and model results look the same (TABLE_<table>, TIME_FILTER, INTENT_<...>)
+TABLE_ALIASES = {
+    "TABLE_customers": ["müşteri", "firma", "şirket"],
+    "TABLE_products": ["ürün"],
+    "TABLE_orders": ["sipariş", "talep"],
+    "TABLE_categories": ["kategori", "sınıf"],
+    "TABLE_suppliers": ["tedarikçi", "sağlayıcı"],
+    "TABLE_employees": ["çalışan", "personel", "işçi", "maaş", "ücret"],
+    "TABLE_order_details": ["sipariş detay", "sipariş kalemi"],
+    "TABLE_purchase_orders": ["satın alma siparişi", "alım siparişi"]
+}
+
+# Very short stems ("say", "ver", "ort", "mal") are left out: with suffixes
+# allowed they would match unrelated words. Select verbs are labelled with the
+# word itself (INTENT_GÖSTER), aggregations with their type (INTENT_COUNT)
+INTENT_WORDS = {
+    **{f"INTENT_{word.upper()}": [word] for word in ("göster", "listele", "getir")},
+    "INTENT_COUNT": ["kaç", "adet", "sayı"],
+    "INTENT_SUM": ["toplam", "tutar", "ne kadar"],
+    "INTENT_AVG": ["ortalama", "vasati"],
+    "INTENT_MAX": ["en yüksek", "maksimum", "en fazla"],
+    "INTENT_MIN": ["en düşük", "minimum", "en az"]
+}
+
+TIME_PHRASES = {
+    "TIME_FILTER": [
+        "bu ay", "mevcut ay", "geçen ay", "önceki ay",
+        "bu yıl", "mevcut yıl", "bu sene", "geçen yıl", "önceki yıl", "geçen sene",
+        "bu hafta", "geçen hafta", "önceki hafta", "bugün", "bu gün"
+    ]
+}
+
+# Words that carry no entity; a query made only of these and matches is covered
+FILLER_WORDS = {
+    "için", "ve", "ile", "birlikte", "tüm", "bütün", "olan", "olanlar", "hepsi",
+    "bilgi", "bilgileri", "bilgilerini", "bilgisi", "liste", "listesi", "kayıt",
+    "kayıtları", "kayıtlarını", "tablo", "tablosu", "tablosundaki", "değer",
+    "değeri", "nedir", "ne", "kadar", "var", "hesapla", "çıkar", "bul", "ver"
+}
+
+# Inflectional suffixes a vocabulary stem may carry ("siparişlerin", "bu ayın")
+TURKISH_SUFFIXES = {
+    "ler", "lar", "leri", "ları",
+    "in", "ın", "un", "ün", "nin", "nın", "nun", "nün",
+    "i", "ı", "u", "ü", "si", "sı", "su", "sü", "yi", "yı", "yu", "yü",
+    "ni", "nı", "nu", "nü", "ini", "ını", "sini", "sını",
+    "e", "a", "ye", "ya", "ne", "na",
+    "de", "da", "te", "ta", "nde", "nda",
+    "den", "dan", "ten", "tan", "nden", "ndan",
+    "ki", "deki", "daki", "ndeki", "ndaki",
+    "le", "la", "yle", "yla", "dir", "dır", "tir", "tır"
+}
+MAX_SUFFIX_LENGTH = 10
+
+EXACT_CONFIDENCE = 1.0
+SUFFIXED_CONFIDENCE = 0.95
+
+_WORD_PATTERN = re.compile(r"[\w']+")
+_TURKISH_UPPER_I = str.maketrans({"I": "ı", "İ": "i"})
+
+
+def casefold_preserving_offsets(text):
+    """Turkish-aware lowercasing that keeps every character at its index"""
+    return "".join(
+        lowered if len(lowered) == 1 else char
+        for char, lowered in ((char, char.lower()) for char in text.translate(_TURKISH_UPPER_I))
+    )
+
+
+def is_suffix_chain(rest):
+    """True if rest splits into known suffixes (apostrophes ignored)"""
+    rest = rest.replace("'", "")
+    if not rest:
+        return True
+    if len(rest) > MAX_SUFFIX_LENGTH:
+        return False
+
+    # reachable[i]: rest[:i] is a valid suffix chain
+    reachable = [True] + [False] * len(rest)
+    for end in range(1, len(rest) + 1):
+        reachable[end] = any(
+            reachable[start] and rest[start:end] in TURKISH_SUFFIXES
+            for start in range(max(0, end - 5), end)
+        )
+    return reachable[-1]
+
+
+class AhoCorasick:
+    """
+    Multi-pattern string matcher
+
+    All patterns are compiled into one automaton, so a text is scanned once
+    regardless of vocabulary size.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            self._add(pattern, pattern_id)
+        self._build_failure_links()
+
+    def _add(self, pattern, pattern_id):
+        state = 0
+        for char in pattern:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._output[state].append(pattern_id)
+
+    def _build_failure_links(self):
+        """Breadth-first failure links; outputs are merged along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text):
+        """Yield (start, end, pattern_id) for every occurrence of every pattern"""
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern_id in self._output[state]:
+                yield index + 1 - len(self.patterns[pattern_id]), index + 1, pattern_id
+
+
+class Gazetteer:
+    """
+    Closed-vocabulary entity matcher
+
+    Matches start at a word boundary and may end inside a word only if the
+    rest of the word is a chain of Turkish suffixes. Overlapping matches are
+    resolved leftmost-longest. Entities use the TurkishNER.predict format.
+    """
+
+    def __init__(self, vocabulary=None, label_to_id=None):
+        """
+        Args:
+            vocabulary: {label: [phrase, ...]}, defaults to the training data vocabulary
+            label_to_id: Label mapping of the loaded NER model; labels are taken
+                from it, and phrases whose label the model does not know are dropped
+        """
+        if vocabulary is None:
+            vocabulary = {**TABLE_ALIASES, **INTENT_WORDS, **TIME_PHRASES}
+        model_labels = self._model_labels(label_to_id) if label_to_id else None
+
+        phrases = []
+        self._labels = []
+        for label, label_phrases in vocabulary.items():
+            if model_labels is not None and f"B-{label}" not in label_to_id:
+                # Same entity type spelled differently (TABLE_CUSTOMERS)
+                label = model_labels.get(label.casefold())
+                if label is None:
+                    continue
+            for phrase in label_phrases:
+                phrases.append(casefold_preserving_offsets(phrase))
+                self._labels.append(label)
+
+        self.matcher = AhoCorasick(phrases)
+
+    def match(self, text):
+        """
+        Find vocabulary entities in text
+
+        Returns:
+            List of entity dicts (text, label, start, end, confidence)
+        """
+        folded = casefold_preserving_offsets(text)
+        candidates = []
+
+        for start, end, pattern_id in self.matcher.iter_matches(folded):
+            if start > 0 and self._is_word_char(folded[start - 1]):
+                continue
+
+            word_end = end
+            while word_end < len(folded) and self._is_word_char(folded[word_end]):
+                word_end += 1
+            if not is_suffix_chain(folded[end:word_end]):
+                continue
+
+            confidence = EXACT_CONFIDENCE if word_end == end else SUFFIXED_CONFIDENCE
+            candidates.append((start, word_end, self._labels[pattern_id], confidence))
+
+        entities = []
+        last_end = 0
+        for start, end, label, confidence in sorted(candidates, key=lambda c: (c[0], c[0] - c[1])):
+            if start < last_end:
+                continue
+            last_end = end
+            entities.append({
+                "text": text[start:end],
+                "label": label,
+                "start": start,
+                "end": end,
+                "confidence": confidence
+            })
+
+        return entities
+
+    def coverage(self, text, entities, extra_spans=()):
+        """Fraction of words inside an entity/extra span or known to carry no entity"""
+        spans = [(e["start"], e["end"]) for e in entities] + [(s["start"], s["end"]) for s in extra_spans]
+        words = list(_WORD_PATTERN.finditer(casefold_preserving_offsets(text)))
+        if not words:
+            return 0.0
+
+        covered = sum(
+            1 for word in words
+            if word.group() in FILLER_WORDS
+            or any(start <= word.start() and word.end() <= end for start, end in spans)
+        )
+        return covered / len(words)
+
+    @staticmethod
+    def _model_labels(label_to_id):
+        """Entity labels of a BIO label mapping, keyed case-insensitively"""
+        return {
+            tag[2:].casefold(): tag[2:]
+            for tag in label_to_id
+            if tag.startswith("B-")
+        }
+
+    @staticmethod
+    def _is_word_char(char):
+        return char.isalnum() or char == "'"
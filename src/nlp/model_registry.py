@@ -0,0 +1,37 @@
+# src/nlp/model_registry.py
+"""
+Process-wide model registry
+Lets components share one loaded model instead of each loading its own copy
+"""
+
+import threading
+
+# Fine-tuned NER model whose encoder also serves sentence embeddings
+NER_ENCODER = "ner_encoder"
+
+_models = {}
+_lock = threading.Lock()
+
+
+def register_model(name, model):
+    """Register (or replace) a loaded model under name"""
+    with _lock:
+        _models[name] = model
+
+
+def get_registered_model(name):
+    """Return the model registered under name, or None"""
+    with _lock:
+        return _models.get(name)
+
+
+def unregister_model(name):
+    """Remove a model from the registry"""
+    with _lock:
+        _models.pop(name, None)
+
+
+def get_registry_info():
+    """Registered names and model types"""
+    with _lock:
+        return {name: type(model).__name__ for name, model in _models.items()}
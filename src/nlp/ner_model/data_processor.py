@@ -4,10 +4,12 @@ Data Processor for Turkish NER Model
 Converts NER JSON data to training format for BERT-based model
 """
 
+import hashlib
 import json
+import random
 import torch
 from transformers import AutoTokenizer
-from torch.utils.data import Dataset
+from torch.utils.data import Dataset, Sampler
 import numpy as np
 from pathlib import Path
 import sys
@@ -317,15 +319,34 @@ class NERDataProcessor:
 
 
 class NERDataset(Dataset):
-    """PyTorch Dataset for NER training"""
+    """
+    PyTorch Dataset for NER training
+
+    With pad_to_max_length=False items keep their own length and batches are
+    padded by collate_dynamic_padding instead.
+    """
 
-    def __init__(self, data, max_length=512):
+    def __init__(self, data, max_length=512, pad_to_max_length=True):
         self.data = data
         self.max_length = max_length
+        self.pad_to_max_length = pad_to_max_length
 
     def __len__(self):
         return len(self.data)
 
+    def get_lengths(self):
+        """Unpadded token count of every sample (for length-grouped sampling)"""
+        return [min(len(item["input_ids"]), self.max_length) for item in self.data]
+
+    def get_fingerprint(self):
+        """Hash of every sample's (truncated) token ids; changes whenever the tokenized data does"""
+        digest = hashlib.blake2b(digest_size=16)
+        for item in self.data:
+            input_ids = np.asarray(item["input_ids"][:self.max_length], dtype=np.int64)
+            digest.update(np.int64(input_ids.size).tobytes())
+            digest.update(input_ids.tobytes())
+        return digest.hexdigest()
+
     def __getitem__(self, idx):
         item = self.data[idx]
 
@@ -336,7 +357,7 @@ class NERDataset(Dataset):
 
         # Pad if necessary
         padding_length = self.max_length - len(input_ids)
-        if padding_length > 0:
+        if self.pad_to_max_length and padding_length > 0:
             input_ids.extend([0] * padding_length)  # PAD token ID
             attention_mask.extend([0] * padding_length)
             labels.extend([-100] * padding_length)  # Ignore index for loss
@@ -348,6 +369,96 @@ class NERDataset(Dataset):
         }
 
 
+# Padding value per batch field (labels are ignored by the loss at -100)
+PADDING_VALUES = {"input_ids": 0, "attention_mask": 0, "labels": -100, "teacher_logits": 0.0}
+
+
+def collate_dynamic_padding(batch, pad_to_multiple_of=8):
+    """Pad every field only up to the longest sample of the batch"""
+    longest = max(item["input_ids"].size(0) for item in batch)
+    if pad_to_multiple_of:
+        longest = -(-longest // pad_to_multiple_of) * pad_to_multiple_of
+
+    collated = {}
+    for key in batch[0]:
+        rows = []
+        for item in batch:
+            value = item[key]
+            padding_length = longest - value.size(0)
+            if padding_length > 0:
+                padding = value.new_full((padding_length,) + tuple(value.shape[1:]), PADDING_VALUES[key])
+                value = torch.cat([value, padding])
+            rows.append(value)
+        collated[key] = torch.stack(rows)
+    return collated
+
+
+class LengthGroupedSampler(Sampler):
+    """
+    Batch sampler that keeps similar lengths together
+
+    Indices are shuffled, cut into mega-batches of ``batch_size * group_factor``,
+    sorted by length inside each mega-batch and split into batches; the batch
+    order is shuffled again so training still sees a random mix of lengths.
+    """
+
+    def __init__(self, lengths, batch_size, group_factor=50, shuffle=True):
+        self.lengths = list(lengths)
+        self.batch_size = batch_size
+        self.group_size = batch_size * group_factor
+        self.shuffle = shuffle
+
+    def __len__(self):
+        return -(-len(self.lengths) // self.batch_size)
+
+    def __iter__(self):
+        indices = list(range(len(self.lengths)))
+        if self.shuffle:
+            random.shuffle(indices)
+
+        batches = []
+        for start in range(0, len(indices), self.group_size):
+            group = sorted(indices[start:start + self.group_size], key=lambda index: self.lengths[index])
+            batches.extend(group[i:i + self.batch_size] for i in range(0, len(group), self.batch_size))
+
+        if self.shuffle:
+            random.shuffle(batches)
+        return iter(batches)
+
+
+class DistillationDataset(Dataset):
+    """
+    NERDataset plus cached teacher logits for knowledge distillation
+
+    Teacher logits are stored once for the unpadded tokens of every sample
+    (concatenated rows + per-sample offsets) and padded here on access.
+    """
+
+    def __init__(self, base_dataset, teacher_logits, offsets):
+        self.base_dataset = base_dataset
+        self.teacher_logits = teacher_logits
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.base_dataset)
+
+    def __getitem__(self, idx):
+        item = self.base_dataset[idx]
+
+        start, end = int(self.offsets[idx]), int(self.offsets[idx + 1])
+        token_count = int(item["attention_mask"].sum())
+        if end - start != token_count:
+            raise ValueError(
+                f"Teacher logits for sample {idx} cover {end - start} tokens, the sample has {token_count}; "
+                "delete the teacher_logits cache to recompute it"
+            )
+        logits = torch.zeros(item["input_ids"].size(0), self.teacher_logits.shape[1], dtype=torch.float32)
+        logits[:end - start] = torch.from_numpy(np.asarray(self.teacher_logits[start:end], dtype=np.float32))
+
+        item["teacher_logits"] = logits
+        return item
+
+
 def create_ner_data_processor():
     """Factory function to create NER data processor"""
     return NERDataProcessor()
@@ -0,0 +1,146 @@
+# src/nlp/ner_model/inference_session.py
+"""
+Inference Session for TurkishNER
+Caches tokenizer outputs of recent texts and fills reusable, pre-allocated
+input buffers (one set per padded length bucket) instead of building fresh
+arrays for every request.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+from config.model_config import (
+    MAX_SEQUENCE_LENGTH, PAD_TO_MULTIPLE_OF, NER_WINDOW_STRIDE, TOKENIZATION_CACHE_SIZE
+)
+from src.cache.lru_cache import ArrayLRUCache
+
+
+class InferenceSession:
+    """
+    Tokenization cache + per-bucket input buffers
+
+    ``encode`` returns views into the session's buffers; they stay valid
+    until the next ``encode`` call, so each batch must be consumed (run
+    through the model) before the next one is encoded. ``lock`` serializes
+    callers that share the session.
+    """
+
+    def __init__(self, tokenizer, sliding_window=True, cache_size=TOKENIZATION_CACHE_SIZE,
+                 max_length=MAX_SEQUENCE_LENGTH, pad_to_multiple_of=PAD_TO_MULTIPLE_OF, stride=NER_WINDOW_STRIDE):
+        self.tokenizer = tokenizer
+        self.sliding_window = sliding_window
+        self.max_length = max_length
+        self.pad_to_multiple_of = pad_to_multiple_of
+        self.stride = stride
+        self.pad_token_id = getattr(tokenizer, "pad_token_id", None) or 0
+
+        # text -> tuple of (input_ids, offsets) windows; read-only arrays shared
+        # with the caller, so a hit costs no allocation
+        self.token_cache = ArrayLRUCache(max_size=cache_size)
+        # padded length -> (input_ids, attention_mask, offsets) buffers
+        self._buffers = {}
+        self.lock = threading.Lock()
+
+        # Statistics
+        self.buffer_allocations = 0
+
+    def encode(self, texts):
+        """
+        Tokenize texts (cached) into padded buffers
+
+        Returns:
+            (input_ids, attention_mask, offset_mapping, window_texts) where
+            window_texts[row] is the index of the text that row belongs to
+        """
+        windows_per_text = self._tokenize(texts)
+
+        rows = []
+        window_texts = []
+        for text_index, windows in enumerate(windows_per_text):
+            rows.extend(windows)
+            window_texts.extend([text_index] * len(windows))
+
+        longest = max(len(input_ids) for input_ids, _ in rows)
+        padded_length = self._bucket_length(longest)
+        input_ids, attention_mask, offsets = self._get_buffers(len(rows), padded_length)
+
+        for row, (row_ids, row_offsets) in enumerate(rows):
+            length = len(row_ids)
+            input_ids[row, :length] = row_ids
+            attention_mask[row, :length] = 1
+            offsets[row, :length] = row_offsets
+
+        return input_ids, attention_mask, offsets, window_texts
+
+    def _tokenize(self, texts):
+        """Windows of every text; only cache misses go through the tokenizer"""
+        windows_per_text = [self.token_cache.get(text) for text in texts]
+        missing = list(dict.fromkeys(text for text, windows in zip(texts, windows_per_text) if windows is None))
+        if not missing:
+            return windows_per_text
+
+        encoded = self.tokenizer(
+            missing,
+            padding=False,
+            truncation=True,
+            max_length=self.max_length,
+            return_offsets_mapping=True,
+            return_overflowing_tokens=self.sliding_window,
+            stride=self.stride if self.sliding_window else 0
+        )
+        sample_mapping = encoded.get("overflow_to_sample_mapping") or list(range(len(missing)))
+
+        tokenized = {text: [] for text in missing}
+        for row, text_index in enumerate(sample_mapping):
+            tokenized[missing[text_index]].append((
+                np.asarray(encoded["input_ids"][row], dtype=np.int64),
+                np.asarray(encoded["offset_mapping"][row], dtype=np.int64).reshape(-1, 2)
+            ))
+        for text, windows in tokenized.items():
+            self.token_cache.put(text, windows)
+
+        return [windows if windows is not None else tokenized[text]
+                for text, windows in zip(texts, windows_per_text)]
+
+    def _bucket_length(self, length):
+        """Round up to the bucket size, never beyond max_length"""
+        if self.pad_to_multiple_of:
+            length = -(-length // self.pad_to_multiple_of) * self.pad_to_multiple_of
+        return min(length, self.max_length)
+
+    def _get_buffers(self, rows, padded_length):
+        """Reset and return [:rows] views of the buffers for this length bucket"""
+        buffers = self._buffers.get(padded_length)
+        if buffers is None or buffers[0].shape[0] < rows:
+            capacity = max(rows, 2 * buffers[0].shape[0]) if buffers is not None else rows
+            buffers = (
+                np.empty((capacity, padded_length), dtype=np.int64),
+                np.empty((capacity, padded_length), dtype=np.int64),
+                np.empty((capacity, padded_length, 2), dtype=np.int64)
+            )
+            self._buffers[padded_length] = buffers
+            self.buffer_allocations += 1
+
+        input_ids, attention_mask, offsets = (buffer[:rows] for buffer in buffers)
+        input_ids.fill(self.pad_token_id)
+        attention_mask.fill(0)
+        offsets.fill(0)  # (0, 0) marks padding like special tokens
+        return input_ids, attention_mask, offsets
+
+    def clear(self):
+        """Drop cached tokenizations and buffers (e.g. after changing the tokenizer)"""
+        self.token_cache.clear()
+        self._buffers = {}
+
+    def get_statistics(self):
+        """Get session statistics"""
+        return {
+            "token_cache": self.token_cache.get_statistics(),
+            "buffer_buckets": sorted(self._buffers),
+            "buffer_allocations": self.buffer_allocations
+        }
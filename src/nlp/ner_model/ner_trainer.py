@@ -19,12 +19,19 @@ import sys
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
-from config.model_config import MODELS_DIR
+from config.model_config import MODELS_DIR, STUDENT_MODEL_DIR, STUDENT_MODEL_CONFIG, DISTILL_STUDENT_CONFIG
 
 # Import our modules
-from data_processor import NERDataset
+from data_processor import NERDataset, DistillationDataset, LengthGroupedSampler, collate_dynamic_padding
 from turkish_ner import TurkishNER
 
+LATENCY_TEXTS = [
+    "Bu ayın müşteri sayısı",
+    "Geçen yıl sipariş toplamı",
+    "Son 30 gün ürün listesi",
+    "2022 3. çeyrek çalışan maaşları"
+]
+
 
 class NERTrainer:
     """
@@ -32,8 +39,18 @@ class NERTrainer:
     Handles complete training pipeline with validation and evaluation
     """
 
-    def __init__(self, model_name="dbmdz/bert-base-turkish-cased"):
+    def __init__(self, model_name="dbmdz/bert-base-turkish-cased", student_config=None, teacher_path=None):
+        """
+        Args:
+            model_name: Pretrained encoder to fine-tune
+            student_config: Architecture overrides for a small cascade student
+                (e.g. {"num_hidden_layers": 4}); saved under STUDENT_MODEL_DIR
+            teacher_path: Trained model to distill the student from (distillation mode)
+        """
         self.model_name = model_name
+        self.student_config = student_config
+        self.teacher_path = Path(teacher_path) if teacher_path else None
+        self.teacher = None
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
         # Training components
@@ -55,7 +72,10 @@ class NERTrainer:
             "max_grad_norm": 1.0,
             "early_stopping_patience": 3,
             "save_best_model": True,
-            "fp16": True
+            "fp16": True,
+            # Distillation: loss = alpha * hard CE + (1 - alpha) * T^2 * KL(teacher || student)
+            "distill_alpha": 0.5,
+            "distill_temperature": 2.0
         }
 
         # Training state
@@ -66,7 +86,11 @@ class NERTrainer:
 
         # Paths
         self.data_dir = MODELS_DIR / "ner_data"
-        self.model_save_dir = MODELS_DIR / "ner_model"
+        self.model_save_dir = STUDENT_MODEL_DIR if student_config else MODELS_DIR / "ner_model"
+
+        if student_config:
+            # Shallow students converge slower from a truncated encoder
+            self.config["learning_rate"] = 5e-5
 
         print(f"🎯 NER Trainer initialized")
         print(f"📱 Device: {self.device}")
@@ -92,32 +116,15 @@ class NERTrainer:
             with open(data_dir / "label_mappings.json", 'r', encoding='utf-8') as f:
                 label_mappings = json.load(f)
 
-            # Create datasets
-            train_dataset = NERDataset(train_data, max_length=512)
-            val_dataset = NERDataset(val_data, max_length=512)
-            test_dataset = NERDataset(test_data, max_length=512)
+            # Create datasets (padded per batch by the collator, not to 512)
+            train_dataset = NERDataset(train_data, max_length=512, pad_to_max_length=False)
+            val_dataset = NERDataset(val_data, max_length=512, pad_to_max_length=False)
+            test_dataset = NERDataset(test_data, max_length=512, pad_to_max_length=False)
 
             # Create data loaders
-            self.train_loader = DataLoader(
-                train_dataset,
-                batch_size=self.config["batch_size"],
-                shuffle=True,
-                num_workers=0  # Set to 0 for Windows compatibility
-            )
-
-            self.val_loader = DataLoader(
-                val_dataset,
-                batch_size=self.config["batch_size"],
-                shuffle=False,
-                num_workers=0
-            )
-
-            self.test_loader = DataLoader(
-                test_dataset,
-                batch_size=self.config["batch_size"],
-                shuffle=False,
-                num_workers=0
-            )
+            self.train_loader = self._create_loader(train_dataset, shuffle=True)
+            self.val_loader = self._create_loader(val_dataset, shuffle=False)
+            self.test_loader = self._create_loader(test_dataset, shuffle=False)
 
             print(f"📊 Data loaded successfully:")
             print(f"   Train: {len(train_data)} samples")
@@ -131,6 +138,15 @@ class NERTrainer:
             print(f"❌ Error loading data: {e}")
             return None
 
+    def _create_loader(self, dataset, shuffle):
+        """Length-grouped batches, each padded only to its longest sample"""
+        return DataLoader(
+            dataset,
+            batch_sampler=LengthGroupedSampler(dataset.get_lengths(), self.config["batch_size"], shuffle=shuffle),
+            collate_fn=collate_dynamic_padding,
+            num_workers=0  # Set to 0 for Windows compatibility
+        )
+
     def initialize_model(self, label_mappings):
         """Initialize model and training components"""
         try:
@@ -143,7 +159,7 @@ class NERTrainer:
             self.model.num_labels = len(label_mappings["label_to_id"])
 
             # Initialize model
-            if not self.model.initialize_model():
+            if not self.model.initialize_model(config_overrides=self.student_config):
                 return False
 
             # Setup optimizer
@@ -196,6 +212,11 @@ class NERTrainer:
             loss = outputs.loss
             logits = outputs.logits
 
+            if "teacher_logits" in batch:
+                loss = self._distillation_loss(
+                    logits, batch["teacher_logits"].to(self.device), attention_mask, loss
+                )
+
             loss.backward()  # Doğrudan backward
             torch.nn.utils.clip_grad_norm_(
                 self.model.model.parameters(),
@@ -269,6 +290,165 @@ class NERTrainer:
 
         return avg_loss, f1_score, precision, recall
 
+    def _distillation_loss(self, student_logits, teacher_logits, attention_mask, hard_loss):
+        """Blend the label loss with a temperature-scaled KL term over real tokens"""
+        temperature = self.config["distill_temperature"]
+        alpha = self.config["distill_alpha"]
+
+        student_log_probs = torch.log_softmax(student_logits / temperature, dim=-1)
+        teacher_probs = torch.softmax(teacher_logits / temperature, dim=-1)
+        token_kl = (teacher_probs * (torch.log(teacher_probs + 1e-12) - student_log_probs)).sum(dim=-1)
+
+        mask = attention_mask.float()
+        soft_loss = (token_kl * mask).sum() / mask.sum().clamp(min=1.0)
+
+        return alpha * hard_loss + (1 - alpha) * (temperature ** 2) * soft_loss
+
+    def prepare_distillation(self, label_mappings):
+        """
+        Load the teacher, cache its logits for the training split and switch
+        the train loader to a DistillationDataset
+
+        Logits are computed once and stored next to the student; they are
+        reused as long as the teacher artifact and the tokenized training
+        data do not change.
+        """
+        self.teacher = TurkishNER(model_name=self.model_name, backend="torch", quantized=False)
+        if not self.teacher.load_model(self.teacher_path):
+            print(f"❌ Teacher model not found at: {self.teacher_path}")
+            return False
+
+        # The student must predict exactly the teacher's label ids
+        if self.teacher.label_to_id != label_mappings["label_to_id"]:
+            print("❌ Teacher label mappings differ from the training data label_mappings.json")
+            return False
+
+        train_dataset = self.train_loader.dataset
+        logits, offsets = self._load_or_cache_teacher_logits(train_dataset)
+
+        self.train_loader = DataLoader(
+            DistillationDataset(train_dataset, logits, offsets),
+            batch_sampler=LengthGroupedSampler(train_dataset.get_lengths(), self.config["batch_size"]),
+            collate_fn=collate_dynamic_padding,
+            num_workers=0
+        )
+        return True
+
+    def _load_or_cache_teacher_logits(self, train_dataset):
+        """Teacher logits for every unpadded training token, memory-mapped from disk"""
+        cache_dir = self.model_save_dir / "teacher_logits"
+        logits_path = cache_dir / "logits.npy"
+        offsets_path = cache_dir / "offsets.npy"
+        meta_path = cache_dir / "meta.json"
+
+        # Regenerated training data (even with the same sample count) must not reuse old logits
+        meta = {
+            "teacher_version": self.teacher.model_version,
+            "samples": len(train_dataset),
+            "train_fingerprint": train_dataset.get_fingerprint()
+        }
+        if meta_path.exists() and logits_path.exists() and offsets_path.exists():
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                if json.load(f) == meta:
+                    print(f"📦 Using cached teacher logits: {cache_dir}")
+                    return np.load(logits_path, mmap_mode="r"), np.load(offsets_path)
+
+        print("🧑‍🏫 Computing teacher logits (once)...")
+        offsets = np.concatenate([[0], np.cumsum(train_dataset.get_lengths())]).astype(np.int64)
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        logits = np.lib.format.open_memmap(
+            logits_path, mode="w+", dtype=np.float16, shape=(int(offsets[-1]), self.teacher.num_labels)
+        )
+
+        # Sequential order so row i of every batch maps back to its sample index
+        teacher_loader = DataLoader(
+            train_dataset,
+            batch_size=self.config["batch_size"],
+            shuffle=False,
+            collate_fn=collate_dynamic_padding,
+            num_workers=0
+        )
+        self.teacher.model.eval()
+        sample_index = 0
+        with torch.no_grad():
+            for batch in teacher_loader:
+                batch_logits = self.teacher.model(
+                    input_ids=batch["input_ids"].to(self.teacher.device),
+                    attention_mask=batch["attention_mask"].to(self.teacher.device)
+                ).logits.float().cpu().numpy()
+
+                for row in batch_logits:
+                    start, end = offsets[sample_index], offsets[sample_index + 1]
+                    logits[start:end] = row[:end - start]
+                    sample_index += 1
+
+        logits.flush()
+        np.save(offsets_path, offsets)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+        print(f"💾 Teacher logits cached: {cache_dir} ({logits.nbytes / (1024 * 1024):.1f} MB)")
+        return np.load(logits_path, mmap_mode="r"), offsets
+
+    def build_distillation_report(self, student_results):
+        """Student vs. teacher test F1, median latency and weight size"""
+        student = self.model
+        self.model = self.teacher
+        teacher_results = self.evaluate_on_test()
+        self.model = student
+
+        report = {
+            "student_config": self.student_config,
+            "teacher_model": str(self.teacher_path),
+            "test_f1": {
+                "teacher": teacher_results["test_f1"],
+                "student": student_results["test_f1"]
+            },
+            "latency": {
+                "teacher": self._measure_latency(self.teacher),
+                "student": self._measure_latency(student)
+            },
+            "size_mb": {
+                "teacher": self._model_size_mb(self.teacher),
+                "student": self._model_size_mb(student)
+            }
+        }
+        report["f1_delta"] = report["test_f1"]["student"] - report["test_f1"]["teacher"]
+        report["speedup"] = round(
+            report["latency"]["teacher"]["median_ms"] / max(report["latency"]["student"]["median_ms"], 1e-9), 2
+        )
+
+        with open(self.model_save_dir / "distillation_report.json", 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+        print(f"📊 Distillation Report:")
+        print(f"   Test F1: {report['test_f1']['teacher']:.4f} → {report['test_f1']['student']:.4f} "
+              f"(Δ {report['f1_delta']:+.4f})")
+        print(f"   Median latency: {report['latency']['teacher']['median_ms']} ms → "
+              f"{report['latency']['student']['median_ms']} ms (x{report['speedup']})")
+        print(f"   Size: {report['size_mb']['teacher']} MB → {report['size_mb']['student']} MB")
+        return report
+
+    def _measure_latency(self, ner, runs=30):
+        """Median and p95 single-query latency in milliseconds"""
+        latencies = []
+        for i in range(runs):
+            text = LATENCY_TEXTS[i % len(LATENCY_TEXTS)]
+            start_time = time.perf_counter()
+            ner.predict(text)
+            latencies.append((time.perf_counter() - start_time) * 1000)
+
+        return {
+            "median_ms": round(float(np.median(latencies)), 3),
+            "p95_ms": round(float(np.percentile(latencies, 95)), 3)
+        }
+
+    def _model_size_mb(self, ner):
+        """In-memory size of the model weights"""
+        size = sum(p.numel() * p.element_size() for p in ner.model.parameters())
+        return round(size / (1024 * 1024), 2)
+
     def _calculate_f1_score(self, true_labels, predictions):
         """Calculate macro F1 score"""
         from sklearn.metrics import f1_score
@@ -483,12 +663,19 @@ class NERTrainer:
             print("❌ Failed to initialize model")
             return False
 
+        if self.teacher_path and not self.prepare_distillation(label_mappings):
+            print("❌ Failed to prepare distillation")
+            return False
+
         # Step 3: Train model
         training_history = self.train()
 
         # Step 4: Evaluate on test set
         test_results = self.evaluate_on_test()
 
+        if self.teacher is not None:
+            self.build_distillation_report(test_results)
+
         # Step 5: Save final results
         final_results = {
             "training_completed": True,
@@ -519,8 +706,21 @@ if __name__ == "__main__":
     print("🎯 Turkish NER Model Training")
     print("=" * 50)
 
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train the Turkish NER model")
+    parser.add_argument("--student", action="store_true",
+                        help=f"Train the small cascade student {STUDENT_MODEL_CONFIG} instead of the full model")
+    parser.add_argument("--distill", action="store_true",
+                        help=f"Distill a {DISTILL_STUDENT_CONFIG} student from the trained model")
+    parser.add_argument("--teacher_path", default=str(MODELS_DIR / "ner_model" / "best_model"))
+    args = parser.parse_args()
+
     # Create trainer
-    trainer = NERTrainer()
+    if args.distill:
+        trainer = NERTrainer(student_config=DISTILL_STUDENT_CONFIG, teacher_path=args.teacher_path)
+    else:
+        trainer = NERTrainer(student_config=STUDENT_MODEL_CONFIG if args.student else None)
 
     # Run full training pipeline
     success = trainer.run_full_training()
@@ -2,15 +2,12 @@
 """
 Turkish NER Model for NLP-SQL Project
 BERT-based Named Entity Recognition for Turkish text
+
+torch is imported lazily so that processes serving the ONNX Runtime
+backend never pay the torch import cost.
 """
 
-import torch
-import torch.nn as nn
-from transformers import (
-    AutoTokenizer,
-    AutoModelForTokenClassification,
-    AutoConfig
-)
+import hashlib
 import json
 import pickle
 import numpy as np
@@ -19,7 +16,35 @@ import sys
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
-from config.model_config import BERTURK_MODEL_NAME, MODELS_DIR
+# config sets the HF cache/offline env vars, so it must be imported before transformers
+from config.model_config import (
+    BERTURK_MODEL_NAME, MODELS_DIR, NER_BACKEND, NER_QUANTIZED, NER_COMPILED, EMBEDDING_MEMO_SIZE, OFFLINE_MODE,
+    NER_SLIDING_WINDOW, resolve_model_source
+)
+from src.cache.lru_cache import ArrayLRUCache
+from src.nlp.ner_model.inference_session import InferenceSession
+from src.nlp.thread_topology import apply_torch_threads, get_thread_topology
+from transformers import AutoTokenizer
+
+SUPPORTED_BACKENDS = ("torch", "onnx")
+ONNX_MODEL_FILENAME = "model.onnx"
+
+# BIO prefix codes used by the vectorized span decoder
+PREFIX_O, PREFIX_B, PREFIX_I, PREFIX_OTHER = 0, 1, 2, 3
+
+# Int8 dynamically quantized artifact, saved next to best_model
+QUANTIZED_MODEL_DIRNAME = "best_model_int8"
+QUANTIZED_WEIGHTS_FILENAME = "quantized_model.pt"
+
+# TorchScript artifact (+ the model version/torch version it was traced from),
+# saved in the directory of the weights it was traced from
+COMPILED_MODEL_FILENAME = "model_torchscript.pt"
+COMPILED_META_FILENAME = "model_torchscript.json"
+COMPILED_BENCHMARK_FILENAME = "compiled_benchmark.json"
+# Derived files that must not change the model version
+DERIVED_ARTIFACTS = {COMPILED_MODEL_FILENAME, COMPILED_META_FILENAME, COMPILED_BENCHMARK_FILENAME}
+COMPILED_TRACE_TEXT = "Bu ayın müşteri sayısı"
+COMPILED_CHECK_TEXTS = ["Geçen yıl sipariş toplamı", "Son 30 gün içinde İstanbul'daki müşterilerin siparişleri"]
 
 
 class TurkishNER:
@@ -28,26 +53,59 @@ class TurkishNER:
     Uses BERTurk with Token Classification head for entity detection
     """
 
-    def __init__(self, model_name=BERTURK_MODEL_NAME, num_labels=None):
+    def __init__(self, model_name=BERTURK_MODEL_NAME, num_labels=None, backend=NER_BACKEND,
+                 quantized=NER_QUANTIZED, sliding_window=NER_SLIDING_WINDOW, compiled=NER_COMPILED):
+        if backend not in SUPPORTED_BACKENDS:
+            raise ValueError(f"Unsupported NER backend: {backend} (expected one of {SUPPORTED_BACKENDS})")
+
         self.model_name = model_name
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.backend = backend
+        # Long inputs are split into overlapping windows instead of truncated
+        self.sliding_window = sliding_window
+        # Int8 dynamic quantization only applies to the torch backend
+        self.quantized = quantized and backend == "torch"
+        # TorchScript inference only applies to the torch backend on CPU
+        self.compiled = compiled and backend == "torch"
+
+        if backend == "torch":
+            # Keep workers x threads within the machine's cores
+            apply_torch_threads()
+
+        if backend == "torch" and not self.quantized:
+            import torch
+            self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        else:
+            # onnxruntime sessions and quantized int8 kernels run on CPU
+            self.device = "cpu"
 
         # Model components
         self.tokenizer = None
         self.model = None
+        # Traced (logits, [CLS]) module used instead of self.model when available
+        self.compiled_model = None
         self.config = None
+        self._onnx_input_names = set()
 
         # Label mappings
         self.label_to_id = {}
         self.id_to_label = {}
         self.num_labels = num_labels
+        self._label_arrays = None
+
+        # [CLS] vectors from recent forward passes, keyed by exact text
+        # (read-only arrays, not copied on hits)
+        self.embedding_memo = ArrayLRUCache(max_size=EMBEDDING_MEMO_SIZE)
+        # Tokenization cache + reusable input buffers, bound to the loaded tokenizer
+        self._session = None
 
         # Model state
         self.is_trained = False
         self.model_path = MODELS_DIR / "ner_model"
+        # Fingerprint of the loaded artifact, None for untrained weights
+        self.model_version = None
 
         print(f"🤖 Turkish NER Model initialized")
-        print(f"📱 Device: {self.device}")
+        print(f"📱 Device: {self.device} (backend: {self.backend})")
 
     def load_label_mappings(self, mappings_path):
         """Load label mappings from JSON file"""
@@ -66,9 +124,23 @@ class TurkishNER:
             print(f"❌ Error loading label mappings: {e}")
             return False
 
-    def initialize_model(self, mappings_path=None):
-        """Initialize tokenizer and model"""
+    def initialize_model(self, mappings_path=None, config_overrides=None):
+        """
+        Initialize tokenizer and model
+
+        Args:
+            mappings_path: label_mappings.json to use (defaults to the ner_data one)
+            config_overrides: Architecture changes for a smaller student model, e.g.
+                {"num_hidden_layers": 4}. Fewer layers keep the first pretrained
+                layers; any other change (hidden size, heads) starts from random weights.
+        """
+        if self.backend != "torch":
+            print(f"❌ Fresh model initialization requires the torch backend (current: {self.backend})")
+            return False
+
         try:
+            from transformers import AutoConfig, AutoModelForTokenClassification
+
             # Load label mappings first
             if mappings_path:
                 if not self.load_label_mappings(mappings_path):
@@ -80,23 +152,35 @@ class TurkishNER:
                     print("❌ No label mappings found!")
                     return False
 
+            # Prefer the local BERTurk copy; in offline mode never touch the hub
+            model_source = resolve_model_source(self.model_name)
+
             # Initialize tokenizer
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            print(f"🔤 Tokenizer loaded: {self.model_name}")
+            self.tokenizer = AutoTokenizer.from_pretrained(model_source, local_files_only=OFFLINE_MODE)
+            print(f"🔤 Tokenizer loaded: {model_source}")
 
             # Initialize model configuration
+            config_overrides = config_overrides or {}
             self.config = AutoConfig.from_pretrained(
-                self.model_name,
+                model_source,
                 num_labels=self.num_labels,
                 id2label=self.id_to_label,
-                label2id=self.label_to_id
+                label2id=self.label_to_id,
+                local_files_only=OFFLINE_MODE,
+                **config_overrides
             )
 
             # Initialize model
-            self.model = AutoModelForTokenClassification.from_pretrained(
-                self.model_name,
-                config=self.config
-            )
+            if set(config_overrides) - {"num_hidden_layers"}:
+                # Pretrained weights no longer fit the layer shapes
+                self.model = AutoModelForTokenClassification.from_config(self.config)
+            else:
+                self.model = AutoModelForTokenClassification.from_pretrained(
+                    model_source,
+                    config=self.config,
+                    low_cpu_mem_usage=True,
+                    local_files_only=OFFLINE_MODE
+                )
 
             # Move to device
             self.model.to(self.device)
@@ -119,115 +203,334 @@ class TurkishNER:
         Returns:
             List of detected entities
         """
+        return self.predict_batch([text], batch_size=1, return_confidence=return_confidence)[0]
+
+    def predict_batch(self, texts, batch_size=8, return_confidence=False):
+        """
+        Predict entities for multiple texts
+
+        Texts are grouped by length before slicing, so each slice of
+        ``batch_size`` texts is padded only to its own longest item and run
+        through a single forward pass; every row is then decoded with its own
+        offsets and results are returned in input order.
+
+        Args:
+            texts: List of input text strings
+            batch_size: Number of texts per forward pass
+            return_confidence: Whether to return confidence scores
+
+        Returns:
+            List of entity lists, one per input text (same format as predict)
+        """
         if not self.model or not self.tokenizer:
             raise RuntimeError("Model not initialized. Call initialize_model() first.")
 
-        # Tokenize input
-        inputs = self.tokenizer(
-            text,
-            return_tensors="pt",
-            padding=True,
-            truncation=True,
-            max_length=512,
-            return_offsets_mapping=True
-        )
+        all_entities = [None] * len(texts)
 
-        # Move to device
-        input_ids = inputs["input_ids"].to(self.device)
-        attention_mask = inputs["attention_mask"].to(self.device)
-        offset_mapping = inputs["offset_mapping"]
+        # Length buckets: similar lengths share a batch, so little padding is computed
+        order = sorted(range(len(texts)), key=lambda index: len(texts[index]))
+        for i in range(0, len(order), batch_size):
+            batch_indices = order[i:i + batch_size]
+            batch_entities = self._predict_padded_batch([texts[index] for index in batch_indices], return_confidence)
+            for index, entities in zip(batch_indices, batch_entities):
+                all_entities[index] = entities
 
-        # Model prediction
-        self.model.eval()
-        with torch.no_grad():
-            outputs = self.model(input_ids=input_ids, attention_mask=attention_mask)
-            predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
-            predicted_ids = torch.argmax(predictions, dim=-1)
-
-        # Convert predictions to entities
-        entities = self._extract_entities_from_predictions(
-            text,
-            predicted_ids[0].cpu().numpy(),
-            offset_mapping[0],
-            predictions[0].cpu().numpy() if return_confidence else None
-        )
+        return all_entities
 
-        return entities
+    def _predict_padded_batch(self, texts, return_confidence=False):
+        """
+        Run one padded forward pass and decode each row separately
 
-    def predict_batch(self, texts, batch_size=8):
-        """Predict entities for multiple texts"""
-        all_entities = []
+        In sliding-window mode a text longer than MAX_SEQUENCE_LENGTH is split
+        into overlapping windows (NER_WINDOW_STRIDE tokens shared between
+        neighbours) that join the same forward pass; their entities, whose
+        offsets already point into the original text, are merged by confidence.
+        """
+        # Tokenize input (cached per text, padded to the longest text in the
+        # batch inside the session's reusable buffers)
+        session = self.get_inference_session()
+        with session.lock:
+            input_ids, attention_mask, offsets, window_texts = session.encode(texts)
+            # The buffers are refilled by the next encode: keep one array copy
+            # of the offsets (decoded row by row, no Python lists)
+            offsets = offsets.copy()
+
+            # Model prediction (reads the buffers, so it runs under the same lock)
+            logits, cls_embeddings = self._predict_logits(input_ids, attention_mask)
+        has_overflow = len(window_texts) > len(texts)
+
+        if cls_embeddings is not None and has_overflow:
+            # A text's embedding is the [CLS] of its first window
+            first_rows = [window_texts.index(text_index) for text_index in range(len(texts))]
+            cls_embeddings = cls_embeddings[first_rows]
+        self._memoize_embeddings(texts, cls_embeddings)
+        predicted_ids = np.argmax(logits, axis=-1)
+
+        # Max softmax probability per token without materializing the full
+        # softmax: max(softmax(x)) = 1 / sum(exp(x - max(x)))
+        # (also needed to merge overlapping windows)
+        token_confidence = None
+        if return_confidence or has_overflow:
+            shifted = logits - logits.max(axis=-1, keepdims=True)
+            token_confidence = 1.0 / np.exp(shifted).sum(axis=-1)
+
+        # Convert predictions to entities; padding positions have (0, 0)
+        # offsets and are skipped like special tokens
+        window_entities = [[] for _ in texts]
+        for row, text_index in enumerate(window_texts):
+            window_entities[text_index].append(self._extract_entities_from_predictions(
+                texts[text_index],
+                predicted_ids[row],
+                offsets[row],
+                token_confidence[row] if token_confidence is not None else None
+            ))
+
+        batch_entities = []
+        for windows in window_entities:
+            entities = windows[0] if len(windows) == 1 else self._merge_window_entities(windows)
+            if not return_confidence:
+                for entity in entities:
+                    entity["confidence"] = None
+            batch_entities.append(entities)
+
+        return batch_entities
+
+    def _merge_window_entities(self, windows):
+        """
+        Merge entities found by overlapping windows of one text
 
-        for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i:i + batch_size]
-            batch_entities = []
+        Where spans overlap, the most confident one (then the longest) wins;
+        identical spans seen by two windows collapse into one.
+        """
+        candidates = [entity for entities in windows for entity in entities]
+        candidates.sort(key=lambda e: (e["confidence"] or 0.0, e["end"] - e["start"]), reverse=True)
 
-            for text in batch_texts:
-                entities = self.predict(text)
-                batch_entities.append(entities)
+        merged = []
+        for entity in candidates:
+            if all(entity["end"] <= kept["start"] or entity["start"] >= kept["end"] for kept in merged):
+                merged.append(entity)
 
-            all_entities.extend(batch_entities)
+        merged.sort(key=lambda e: e["start"])
+        return merged
 
-        return all_entities
+    def get_inference_session(self):
+        """Inference session for the current tokenizer (rebuilt if the tokenizer changes)"""
+        if self._session is None or self._session.tokenizer is not self.tokenizer:
+            self._session = InferenceSession(self.tokenizer, sliding_window=self.sliding_window)
+        return self._session
 
-    def _extract_entities_from_predictions(self, text, predicted_ids, offset_mapping, confidence_scores=None):
-        """Extract entities from model predictions"""
-        entities = []
-        current_entity = None
+    def _predict_logits(self, input_ids, attention_mask):
+        """
+        Run the active backend
 
-        for i, (pred_id, (start, end)) in enumerate(zip(predicted_ids, offset_mapping)):
-            if start == 0 and end == 0:  # Special tokens
+        Returns:
+            (logits, cls_embeddings) as NumPy arrays; cls_embeddings is the
+            last-layer [CLS] hidden state, None for the ONNX backend
+        """
+        if self.backend == "onnx":
+            feeds = {
+                "input_ids": np.asarray(input_ids, dtype=np.int64),
+                "attention_mask": np.asarray(attention_mask, dtype=np.int64)
+            }
+            if "token_type_ids" in self._onnx_input_names:
+                feeds["token_type_ids"] = np.zeros_like(feeds["input_ids"])
+
+            return self.model.run(["logits"], feeds)[0], None
+
+        import torch
+
+        if self.compiled_model is not None:
+            try:
+                with torch.inference_mode():
+                    logits, cls_embeddings = self.compiled_model(
+                        torch.from_numpy(input_ids), torch.from_numpy(attention_mask)
+                    )
+                return logits.float().numpy(), cls_embeddings.float().numpy()
+            except Exception as e:
+                print(f"⚠️ Compiled model failed, falling back to eager mode: {e}")
+                self.compiled_model = None
+
+        # inference_mode also skips autograd's version counters and view tracking
+        if self.model.training:
+            self.model.eval()
+        with torch.inference_mode():
+            outputs = self.model(
+                input_ids=torch.from_numpy(input_ids).to(self.device),
+                attention_mask=torch.from_numpy(attention_mask).to(self.device),
+                output_hidden_states=True
+            )
+
+        cls_embeddings = outputs.hidden_states[-1][:, 0, :].float().cpu().numpy()
+        return outputs.logits.float().cpu().numpy(), cls_embeddings
+
+    def _memoize_embeddings(self, texts, cls_embeddings):
+        """Remember [CLS] vectors so a later get_embeddings call is free"""
+        if cls_embeddings is None:
+            return
+        for text, embedding in zip(texts, cls_embeddings):
+            self.embedding_memo.put(text, embedding.astype(np.float32))
+
+    def supports_embeddings(self):
+        """Embeddings need hidden states, which only the torch backend exposes"""
+        return self.backend == "torch" and self.model is not None and self.tokenizer is not None
+
+    def get_embeddings_batch(self, texts, batch_size=8):
+        """
+        Sentence embeddings ([CLS] of the last encoder layer)
+
+        Texts already seen by predict/predict_batch are served from the memo,
+        the rest share padded forward passes (whose NER outputs are discarded).
+        """
+        if not self.supports_embeddings():
+            raise RuntimeError("Embeddings need a loaded torch model. Call load_model() first.")
+
+        embeddings = {}
+        for text in texts:
+            if text not in embeddings:
+                embeddings[text] = self.embedding_memo.get(text)
+        # Length-sorted so each padded batch holds similar lengths
+        missing = sorted((text for text, embedding in embeddings.items() if embedding is None), key=len)
+
+        for i in range(0, len(missing), batch_size):
+            batch_texts = missing[i:i + batch_size]
+            session = self.get_inference_session()
+            with session.lock:
+                input_ids, attention_mask, _, window_texts = session.encode(batch_texts)
+                _, cls_embeddings = self._predict_logits(input_ids, attention_mask)
+            if len(window_texts) > len(batch_texts):
+                # Same convention as prediction: the [CLS] of a text's first window
+                cls_embeddings = cls_embeddings[[window_texts.index(index) for index in range(len(batch_texts))]]
+            self._memoize_embeddings(batch_texts, cls_embeddings)
+            embeddings.update(zip(batch_texts, cls_embeddings.astype(np.float32)))
+
+        return np.stack([embeddings[text] for text in texts])
+
+    def _get_label_arrays(self):
+        """
+        Label lookup tables indexed by label id (rebuilt when id_to_label changes)
+
+        Returns:
+            (prefix_codes, type_codes, type_names) where prefix_codes holds
+            one of the BIO prefix constants and type_codes indexes type_names
+            (-1 for labels without an entity type)
+        """
+        cache = self._label_arrays
+        if cache is not None and cache[0] is self.id_to_label and cache[1] == len(self.id_to_label):
+            return cache[2]
+
+        size = max(self.id_to_label.keys(), default=-1) + 1
+        prefix_codes = np.full(size, PREFIX_O, dtype=np.int8)
+        type_codes = np.full(size, -1, dtype=np.int64)
+        type_names = []
+        type_index = {}
+
+        for label_id, label in self.id_to_label.items():
+            if label == "O":
+                continue
+            if label.startswith("B-"):
+                prefix_codes[label_id] = PREFIX_B
+            elif label.startswith("I-"):
+                prefix_codes[label_id] = PREFIX_I
+            else:
+                prefix_codes[label_id] = PREFIX_OTHER
                 continue
 
-            predicted_label = self.id_to_label.get(pred_id, "O")
-            confidence = float(np.max(confidence_scores[i])) if confidence_scores is not None else None
-
-            if predicted_label == "O":
-                # End current entity if exists
-                if current_entity:
-                    entities.append(current_entity)
-                    current_entity = None
-
-            elif predicted_label.startswith("B-"):
-                # Begin new entity
-                if current_entity:
-                    entities.append(current_entity)
-
-                entity_type = predicted_label[2:]  # Remove "B-" prefix
-                current_entity = {
-                    "text": text[start:end],
-                    "label": entity_type,
-                    "start": start,
-                    "end": end,
-                    "confidence": confidence
-                }
-
-            elif predicted_label.startswith("I-") and current_entity:
-                # Continue current entity
-                entity_type = predicted_label[2:]  # Remove "I-" prefix
-
-                if current_entity["label"] == entity_type:
-                    # Extend current entity
-                    current_entity["end"] = end
-                    current_entity["text"] = text[current_entity["start"]:end]
-
-                    # Update confidence (average)
-                    if confidence and current_entity["confidence"]:
-                        current_entity["confidence"] = (current_entity["confidence"] + confidence) / 2
-                else:
-                    # Label mismatch, start new entity
-                    entities.append(current_entity)
-                    current_entity = {
-                        "text": text[start:end],
-                        "label": entity_type,
-                        "start": start,
-                        "end": end,
-                        "confidence": confidence
-                    }
-
-        # Add final entity if exists
-        if current_entity:
-            entities.append(current_entity)
+            entity_type = label[2:]
+            if entity_type not in type_index:
+                type_index[entity_type] = len(type_names)
+                type_names.append(entity_type)
+            type_codes[label_id] = type_index[entity_type]
+
+        arrays = (prefix_codes, type_codes, type_names)
+        self._label_arrays = (self.id_to_label, len(self.id_to_label), arrays)
+        return arrays
+
+    def _extract_entities_from_predictions(self, text, predicted_ids, offset_mapping, confidence_scores=None):
+        """
+        Extract entities from model predictions (vectorized BIO decoding)
+
+        Args:
+            text: Original input text
+            predicted_ids: Label id per token
+            offset_mapping: (start, end) character offsets per token
+            confidence_scores: Per-token max probability (1D) or full
+                probability rows (2D); None to skip confidences
+        """
+        prefix_codes, type_codes, type_names = self._get_label_arrays()
+
+        predicted_ids = np.asarray(predicted_ids, dtype=np.int64)
+        offsets = np.asarray(offset_mapping, dtype=np.int64).reshape(-1, 2)
+
+        # Unknown ids decode as "O", like id_to_label.get(pred_id, "O")
+        known = (predicted_ids >= 0) & (predicted_ids < len(prefix_codes))
+        safe_ids = np.where(known, predicted_ids, 0)
+        prefixes = np.where(known, prefix_codes[safe_ids], PREFIX_O)
+        types = np.where(known, type_codes[safe_ids], -1)
+
+        # Special/padding tokens (0, 0) and labels without a BIO prefix never change the state
+        is_special = (offsets[:, 0] == 0) & (offsets[:, 1] == 0)
+        token_index = np.flatnonzero(~is_special & (prefixes != PREFIX_OTHER))
+        if token_index.size == 0:
+            return []
+
+        prefixes = prefixes[token_index]
+        types = types[token_index]
+        is_begin = prefixes == PREFIX_B
+        is_inside = prefixes == PREFIX_I
+
+        # An I- token belongs to an open entity only if the closest preceding
+        # non-I token is a B- token (O closes entities, orphan I- tokens are ignored)
+        positions = np.arange(len(prefixes))
+        anchor = np.maximum.accumulate(np.where(is_inside, -1, positions))
+        attached = is_inside & (anchor >= 0) & is_begin[np.maximum(anchor, 0)]
+
+        previous_types = np.concatenate(([-1], types[:-1]))
+        continues = attached & (types == previous_types)
+        starts = is_begin | (attached & (types != previous_types))
+
+        span_starts = np.flatnonzero(starts)
+        if span_starts.size == 0:
+            return []
+
+        # A span runs until the next token that does not continue it
+        boundaries = np.flatnonzero(~continues)
+        next_boundary = np.searchsorted(boundaries, span_starts, side="right")
+        span_ends = np.where(
+            next_boundary < len(boundaries),
+            boundaries[np.minimum(next_boundary, len(boundaries) - 1)] - 1,
+            len(prefixes) - 1
+        )
+
+        char_starts = offsets[token_index[span_starts], 0].tolist()
+        char_ends = offsets[token_index[span_ends], 1].tolist()
+        labels = [type_names[type_id] for type_id in types[span_starts].tolist()]
+
+        token_confidence = None
+        if confidence_scores is not None:
+            scores = np.asarray(confidence_scores)
+            # Max probability computed once for the whole sequence
+            if scores.ndim == 2:
+                scores = scores.max(axis=-1)
+            token_confidence = scores[token_index].tolist()
+
+        entities = []
+        for span_start, span_end, start, end, label in zip(
+                span_starts.tolist(), span_ends.tolist(), char_starts, char_ends, labels):
+            confidence = None
+            if token_confidence is not None:
+                confidence = token_confidence[span_start]
+                # Running average over continuation tokens, as tokens are appended
+                for token_conf in token_confidence[span_start + 1:span_end + 1]:
+                    if token_conf and confidence:
+                        confidence = (confidence + token_conf) / 2
+
+            entities.append({
+                "text": text[start:end],
+                "label": label,
+                "start": start,
+                "end": end,
+                "confidence": confidence
+            })
 
         return entities
 
@@ -326,6 +629,10 @@ class TurkishNER:
 
     def save_model(self, save_path=None):
         """Save trained model"""
+        if self.backend != "torch":
+            print(f"❌ Saving is only supported for the torch backend (current: {self.backend})")
+            return False
+
         if save_path is None:
             save_path = self.model_path
 
@@ -355,11 +662,21 @@ class TurkishNER:
             return False
 
     def load_model(self, load_path=None):
-        """Load trained model"""
+        """
+        Load trained model
+
+        A directory containing quantized_model.pt is loaded as an int8 model.
+        With quantized=True the best_model_int8 artifact is preferred and, if
+        it does not exist yet, the fp32 model is quantized after loading.
+        """
         if load_path is None:
+            # Try the quantized artifact first when running in int8 mode
+            quantized_path = self.model_path / QUANTIZED_MODEL_DIRNAME
             # Try best_model first (from training)
             best_model_path = self.model_path / "best_model"
-            if (best_model_path / "config.json").exists():
+            if self.quantized and (quantized_path / QUANTIZED_WEIGHTS_FILENAME).exists():
+                load_path = quantized_path
+            elif (best_model_path / "config.json").exists():
                 load_path = best_model_path
             else:
                 load_path = self.model_path
@@ -378,24 +695,329 @@ class TurkishNER:
                 return False
 
             # Load tokenizer
-            self.tokenizer = AutoTokenizer.from_pretrained(load_path)
+            self.tokenizer = AutoTokenizer.from_pretrained(load_path, local_files_only=True)
 
             # Load model
-            self.model = AutoModelForTokenClassification.from_pretrained(load_path)
-            self.model.to(self.device)
+            if self.backend == "onnx":
+                self.model = self._load_onnx_session(load_path / ONNX_MODEL_FILENAME)
+            elif (load_path / QUANTIZED_WEIGHTS_FILENAME).exists():
+                self.model = self._load_quantized_model(load_path)
+                self.quantized = True
+                self.device = "cpu"
+            else:
+                from transformers import AutoModelForTokenClassification
+
+                # safetensors weights are memory-mapped; low_cpu_mem_usage skips the
+                # random init + copy, so workers share the weights via the page cache
+                self.model = AutoModelForTokenClassification.from_pretrained(
+                    load_path, low_cpu_mem_usage=True, local_files_only=True
+                )
+                if self.quantized:
+                    self.quantize_dynamic()
+                else:
+                    self.model.to(self.device)
 
             self.is_trained = True
-            print(f"📥 Model loaded from: {load_path}")
+            self.model_version = self._compute_model_version(load_path)
+            if self.compiled:
+                self.compile_model(load_path)
+            print(f"📥 Model loaded from: {load_path} (backend: {self.backend})")
             return True
 
         except Exception as e:
             print(f"❌ Error loading model: {e}")
             return False
 
+    def _compute_model_version(self, load_path):
+        """
+        Identical on every process that loads the same artifact
+
+        Hashes the names, sizes and modification times of the files in the
+        model directory together with the backend and quantization mode.
+        """
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(f"{self.backend}:{self.quantized}".encode("utf-8"))
+        for path in sorted(Path(load_path).iterdir()):
+            if path.is_file() and path.name not in DERIVED_ARTIFACTS:
+                stat = path.stat()
+                digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def quantize_dynamic(self):
+        """Apply dynamic int8 quantization to every Linear layer (CPU only)"""
+        if self.backend != "torch" or not self.model:
+            raise RuntimeError("Quantization needs a loaded torch model. Call load_model() first.")
+
+        import torch
+
+        self.model.to("cpu")
+        self.model.eval()
+        self.model = torch.ao.quantization.quantize_dynamic(
+            self.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        self.quantized = True
+        self.device = "cpu"
+
+        print("🗜️ Model quantized: Linear layers → dynamic int8")
+        return self.model
+
+    def save_quantized_model(self, save_path=None):
+        """Save the int8 model as config + tokenizer + quantized state dict"""
+        if not self.quantized:
+            print("❌ Model is not quantized. Call quantize_dynamic() first.")
+            return False
+
+        import torch
+
+        if save_path is None:
+            save_path = self.model_path / QUANTIZED_MODEL_DIRNAME
+
+        save_path = Path(save_path)
+        save_path.mkdir(parents=True, exist_ok=True)
+
+        try:
+            self.model.config.save_pretrained(save_path)
+            self.tokenizer.save_pretrained(save_path)
+            torch.save(self.model.state_dict(), save_path / QUANTIZED_WEIGHTS_FILENAME)
+
+            mappings = {
+                "label_to_id": self.label_to_id,
+                "id_to_label": self.id_to_label,
+                "num_labels": self.num_labels
+            }
+
+            with open(save_path / "label_mappings.json", 'w', encoding='utf-8') as f:
+                json.dump(mappings, f, ensure_ascii=False, indent=2)
+
+            print(f"💾 Quantized model saved to: {save_path}")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error saving quantized model: {e}")
+            return False
+
+    def _load_quantized_model(self, load_path):
+        """Rebuild the quantized module structure and load its int8 weights"""
+        import torch
+        from transformers import AutoConfig, AutoModelForTokenClassification
+
+        config = AutoConfig.from_pretrained(load_path)
+        model = AutoModelForTokenClassification.from_config(config)
+        model.eval()
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        state_dict = torch.load(load_path / QUANTIZED_WEIGHTS_FILENAME, map_location="cpu")
+        model.load_state_dict(state_dict)
+        return model
+
+    def compile_model(self, artifact_dir=None):
+        """
+        Switch inference to a TorchScript-traced model
+
+        Loads artifact_dir/model_torchscript.pt if it was traced from the same
+        model version and torch version, otherwise traces the eager model and
+        saves the artifact there. The module is frozen and optimized for CPU
+        inference, then checked against the eager model on a batch whose shape
+        differs from the trace input. Any failure keeps eager mode.
+
+        Returns:
+            True if the compiled model is active
+        """
+        self.compiled_model = None
+        if self.backend != "torch" or not self.model or not self.tokenizer:
+            print("⚠️ Compiled inference needs a loaded torch model, using eager mode")
+            return False
+        if str(self.device) != "cpu":
+            print(f"⚠️ Compiled inference targets CPU (device: {self.device}), using eager mode")
+            return False
+
+        import torch
+
+        artifact_dir = Path(artifact_dir) if artifact_dir else self.model_path / "best_model"
+        artifact_path = artifact_dir / COMPILED_MODEL_FILENAME
+        meta_path = artifact_dir / COMPILED_META_FILENAME
+        meta = {
+            "model_version": self.model_version,
+            "torch_version": torch.__version__,
+            "quantized": self.quantized
+        }
+
+        try:
+            saved_meta = None
+            if artifact_path.exists() and meta_path.exists():
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    saved_meta = json.load(f)
+
+            if saved_meta == meta:
+                module = torch.jit.load(str(artifact_path), map_location="cpu")
+                print(f"📥 Compiled model loaded from: {artifact_path}")
+            else:
+                module = self._trace_model()
+                self._save_compiled_model(module, artifact_path, meta_path, meta)
+
+            module = torch.jit.optimize_for_inference(module)
+            self._check_compiled_model(module)
+
+        except Exception as e:
+            print(f"⚠️ Compiled model unavailable, using eager mode: {e}")
+            return False
+
+        self.compiled_model = module
+        print("⚡ Compiled (TorchScript) inference enabled")
+        return True
+
+    def _trace_model(self):
+        """Trace a frozen (logits, [CLS]) module from the eager model"""
+        import torch
+
+        class LogitsAndCls(torch.nn.Module):
+            """
+            Tensor-only outputs for the tracer; position and token type ids
+            are built from the input shape so no sequence length is baked in
+            """
+
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, input_ids, attention_mask):
+                position_ids = torch.arange(input_ids.size(1), device=input_ids.device).unsqueeze(0)
+                outputs = self.model(
+                    input_ids=input_ids,
+                    attention_mask=attention_mask,
+                    token_type_ids=torch.zeros_like(input_ids),
+                    position_ids=position_ids.expand_as(input_ids),
+                    output_hidden_states=True
+                )
+                return outputs.logits, outputs.hidden_states[-1][:, 0, :]
+
+        self.model.eval()
+        sample = self.tokenizer([COMPILED_TRACE_TEXT], return_tensors="pt")
+        with torch.no_grad():
+            traced = torch.jit.trace(
+                LogitsAndCls(self.model).eval(),
+                (sample["input_ids"], sample["attention_mask"]),
+                strict=False,
+                check_trace=False
+            )
+        print("🔧 Model traced with TorchScript")
+        return torch.jit.freeze(traced)
+
+    def _save_compiled_model(self, module, artifact_path, meta_path, meta):
+        """Save the traced module; a read-only model directory only costs a re-trace later"""
+        import torch
+
+        try:
+            artifact_path.parent.mkdir(parents=True, exist_ok=True)
+            torch.jit.save(module, str(artifact_path))
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, indent=2)
+            print(f"💾 Compiled model saved to: {artifact_path}")
+        except Exception as e:
+            print(f"⚠️ Could not save compiled model: {e}")
+
+    def _check_compiled_model(self, module):
+        """Compiled and eager outputs must agree on a differently shaped padded batch"""
+        import torch
+
+        sample = self.tokenizer(COMPILED_CHECK_TEXTS, return_tensors="pt", padding=True)
+        with torch.inference_mode():
+            compiled_logits, _ = module(sample["input_ids"], sample["attention_mask"])
+            eager_logits = self.model(
+                input_ids=sample["input_ids"], attention_mask=sample["attention_mask"]
+            ).logits
+
+        if compiled_logits.shape != eager_logits.shape or not torch.allclose(
+            compiled_logits.float(), eager_logits.float(), atol=1e-3
+        ):
+            raise RuntimeError("compiled outputs differ from the eager model")
+
+    def _load_onnx_session(self, onnx_path):
+        """Create a CPU onnxruntime session for an exported model"""
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise RuntimeError("onnxruntime is not installed. Install it with: pip install onnxruntime")
+
+        if not onnx_path.exists():
+            raise FileNotFoundError(
+                f"ONNX model not found at {onnx_path}. Run scripts/export_onnx_model.py first."
+            )
+
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        topology = get_thread_topology()
+        session_options.intra_op_num_threads = topology["threads_per_worker"]
+        session_options.inter_op_num_threads = topology["interop_threads"]
+
+        session = ort.InferenceSession(
+            str(onnx_path),
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"]
+        )
+        self._onnx_input_names = {model_input.name for model_input in session.get_inputs()}
+        return session
+
+    def export_onnx(self, save_path=None, opset_version=14):
+        """
+        Export the loaded torch model to ONNX
+
+        The graph takes input_ids and attention_mask with dynamic batch and
+        sequence axes and returns per-token logits.
+        """
+        if self.backend != "torch" or not self.model or not self.tokenizer:
+            raise RuntimeError("Export needs a loaded torch model. Call load_model() first.")
+
+        import torch
+
+        if save_path is None:
+            save_path = self.model_path / "best_model" / ONNX_MODEL_FILENAME
+        save_path = Path(save_path)
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+
+        class LogitsOnly(torch.nn.Module):
+            """Expose only the logits tensor to the exporter"""
+
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, input_ids, attention_mask):
+                return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+        sample = self.tokenizer(["Bu ayın müşteri sayısı"], return_tensors="pt")
+        wrapper = LogitsOnly(self.model).to("cpu").eval()
+
+        with torch.no_grad():
+            torch.onnx.export(
+                wrapper,
+                (sample["input_ids"], sample["attention_mask"]),
+                str(save_path),
+                input_names=["input_ids", "attention_mask"],
+                output_names=["logits"],
+                dynamic_axes={
+                    "input_ids": {0: "batch", 1: "sequence"},
+                    "attention_mask": {0: "batch", 1: "sequence"},
+                    "logits": {0: "batch", 1: "sequence"}
+                },
+                opset_version=opset_version,
+                dynamo=False
+            )
+
+        self.model.to(self.device)
+        print(f"📦 ONNX model exported to: {save_path}")
+        return save_path
+
     def get_model_info(self):
         """Get model information"""
         return {
             "model_name": self.model_name,
+            "backend": self.backend,
+            "quantized": self.quantized,
+            "compiled": self.compiled_model is not None,
+            "sliding_window": self.sliding_window,
+            "inference_session": self._session.get_statistics() if self._session else None,
+            "model_version": self.model_version,
             "num_labels": self.num_labels,
             "device": str(self.device),
             "is_trained": self.is_trained,
@@ -5,9 +5,17 @@ Coordinates NER-based entity and intent extraction
 No longer uses separate Intent Classifier
 """
 
+import sys
+from pathlib import Path
+
 from entity_extractor import EntityExtractor
 from berturk_wrapper import BERTurkWrapper
 
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.cache.backends import create_cache_backend, make_cache_key
+from src.nlp.thread_topology import get_thread_topology
+
 
 class NLPProcessor:
     """
@@ -16,10 +24,17 @@ class NLPProcessor:
     Simplified architecture with better performance
     """
 
-    def __init__(self):
-        """Initialize with NER-based entity extractor only"""
+    def __init__(self, result_cache=None):
+        """
+        Initialize with NER-based entity extractor only
+
+        Args:
+            result_cache: Cache backend for analyses; defaults to the configured one
+        """
         self.entity_extractor = EntityExtractor()
-        self.berturk = BERTurkWrapper()  # Keep for potential future use
+        # Cheap handle only: the BERTurk model is loaded on first embedding/similarity call
+        self.berturk = BERTurkWrapper()
+        self.result_cache = result_cache if result_cache is not None else create_cache_backend()
 
         # Processing statistics
         self.processed_queries = 0
@@ -28,12 +43,13 @@ class NLPProcessor:
         print("🤖 NLP Processor initialized (NER-only mode)")
         print(f"📊 Entity Extractor ready: {self.entity_extractor.is_ready()}")
 
-    def analyze(self, text):
+    def analyze(self, text, use_cache=True):
         """
         Analyze Turkish text for SQL Generation using NER model
 
         Args:
             text: Turkish text input
+            use_cache: Read/write the result caches (False always runs the model)
         Returns:
             Dictionary with complete NLP analysis
         """
@@ -44,48 +60,92 @@ class NLPProcessor:
             # Track processing
             self.processed_queries += 1
 
-            # Extract entities and intents using NER model
-            extraction_result = self.entity_extractor.extract(text)
-
-            # Format result to match expected interface
-            formatted_intent = self._format_intent_output(extraction_result)
-            formatted_entities = self._format_entities_output(extraction_result)
-            formatted_metadata = self._format_metadata_output(extraction_result)
-
-            # Başarılı işlenme kontrolü
-            processing_success = extraction_result["metadata"]["processing_status"] == "success"
-            sql_ready = processing_success and formatted_intent["type"] != "UNKNOWN"
-
-            # Metadata'yı güncelle
-            formatted_metadata["processing_status"] = "success" if processing_success else "error"
-            formatted_metadata["sql_ready"] = sql_ready
-
-            # Sonuç nesnesini oluştur
-            analysis_result = {
-                "text": text,
-                "intent": formatted_intent,
-                "entities": formatted_entities,
-                "analysis_metadata": formatted_metadata
-            }
+            cache_key = self._analysis_cache_key(text) if use_cache else None
+            cached = self._get_cached_analysis(cache_key)
+            if cached is not None:
+                return cached
 
-            if processing_success:
-                self.successful_analyzes += 1
+            # Extract entities and intents using NER model
+            extraction_result = self.entity_extractor.extract(text, use_cache=use_cache)
 
-            return analysis_result
+            return self._store_analysis(cache_key, self._build_analysis(text, extraction_result))
 
         except Exception as e:
             # Hata durumunda dönecek minimum formatlı çıktı
-            return {
-                "text": text,
-                "intent": {"type": "UNKNOWN", "confidence": 0.0},
-                "entities": {"tables": [], "time_filters": [], "metadata": {}},
-                "analysis_metadata": {
-                    "processing_status": "error",
-                    "error_message": str(e),
-                    "sql_ready": False,
-                    "extraction_method": "ner_model"
-                }
+            return self._create_error_analysis(text, e)
+
+    def _analysis_cache_key(self, text):
+        """
+        Cache key for text, None when caching is off or the model is untrained
+
+        The exact text is hashed (analyses carry character offsets into it)
+        together with the model version and extraction settings.
+        """
+        cache_version = self.entity_extractor.get_cache_version()
+        if self.result_cache is None or not cache_version:
+            return None
+        return make_cache_key("analysis", text, cache_version)
+
+    def _get_cached_analysis(self, cache_key):
+        """Return the cached analysis of exactly this text, or None"""
+        if cache_key is None:
+            return None
+
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            self.successful_analyzes += 1
+        return cached
+
+    def _store_analysis(self, cache_key, analysis_result):
+        """Cache successful analyses only"""
+        if cache_key is not None and analysis_result["analysis_metadata"]["processing_status"] == "success":
+            self.result_cache.set(cache_key, analysis_result)
+        return analysis_result
+
+    def _build_analysis(self, text, extraction_result):
+        """Turn an EntityExtractor result into the analysis format"""
+        # Format result to match expected interface
+        formatted_intent = self._format_intent_output(extraction_result)
+        formatted_entities = self._format_entities_output(extraction_result)
+        formatted_metadata = self._format_metadata_output(extraction_result)
+
+        # Başarılı işlenme kontrolü
+        processing_success = extraction_result["metadata"]["processing_status"] == "success"
+        sql_ready = processing_success and formatted_intent["type"] != "UNKNOWN"
+
+        # Metadata'yı güncelle
+        formatted_metadata["processing_status"] = "success" if processing_success else "error"
+        formatted_metadata["sql_ready"] = sql_ready
+        # Lets downstream caches (SQLGenerator) key on the model and extraction
+        # settings that produced this analysis
+        formatted_metadata["model_version"] = self.entity_extractor.get_cache_version()
+
+        # Sonuç nesnesini oluştur
+        analysis_result = {
+            "text": text,
+            "intent": formatted_intent,
+            "entities": formatted_entities,
+            "analysis_metadata": formatted_metadata
+        }
+
+        if processing_success:
+            self.successful_analyzes += 1
+
+        return analysis_result
+
+    def _create_error_analysis(self, text, error):
+        """Minimum formatted analysis returned when processing fails"""
+        return {
+            "text": text,
+            "intent": {"type": "UNKNOWN", "confidence": 0.0},
+            "entities": {"tables": [], "time_filters": [], "metadata": {}},
+            "analysis_metadata": {
+                "processing_status": "error",
+                "error_message": str(error),
+                "sql_ready": False,
+                "extraction_method": "ner_model"
             }
+        }
 
     def _format_intent_output(self, extraction_result):
         """Format intent output to match expected interface"""
@@ -162,38 +222,74 @@ class NLPProcessor:
             "intent_count": metadata.get("intent_count", 0)
         }
 
-    def analyze_batch(self, texts):
+    def analyze_batch(self, texts, use_cache=True):
         """
         Analyze multiple texts
+        Valid texts share batched NER forward passes
 
         Args:
             texts: List of Turkish text inputs
+            use_cache: Read/write the result caches (False always runs the model)
         Returns:
             List of analysis results
         """
         if not texts:
             raise ValueError("Text list cannot be empty")
 
-        results = []
-        for text in texts:
+        results = [None] * len(texts)
+        valid_indices = []
+        cache_keys = {}
+
+        for index, text in enumerate(texts):
+            if text and text.strip():
+                self.processed_queries += 1
+                cache_keys[index] = self._analysis_cache_key(text) if use_cache else None
+                cached = self._get_cached_analysis(cache_keys[index])
+                if cached is not None:
+                    results[index] = cached
+                else:
+                    valid_indices.append(index)
+            else:
+                results[index] = self._create_batch_error_result(
+                    text, ValueError("Text input cannot be empty")
+                )
+
+        if valid_indices:
+            valid_texts = [texts[index] for index in valid_indices]
+
             try:
-                result = self.analyze(text)
-                results.append(result)
+                # One batched NER pass for all valid texts
+                extraction_results = self.entity_extractor.extract_batch(valid_texts, use_cache=use_cache)
             except Exception as e:
-                results.append({
-                    "text": text,
-                    "intent": {"type": "ERROR", "confidence": 0.0},
-                    "entities": {"tables": [], "time_filters": []},
-                    "analysis_metadata": {
-                        "processing_status": "error",
-                        "error_message": str(e),
-                        "sql_ready": False,
-                        "extraction_method": "ner_model"
-                    }
-                })
+                extraction_results = None
+                for index in valid_indices:
+                    results[index] = self._create_error_analysis(texts[index], e)
+
+            if extraction_results is not None:
+                for index, extraction_result in zip(valid_indices, extraction_results):
+                    try:
+                        results[index] = self._store_analysis(
+                            cache_keys[index], self._build_analysis(texts[index], extraction_result)
+                        )
+                    except Exception as e:
+                        results[index] = self._create_error_analysis(texts[index], e)
 
         return results
 
+    def _create_batch_error_result(self, text, error):
+        """Error entry used by analyze_batch for texts that could not be processed"""
+        return {
+            "text": text,
+            "intent": {"type": "ERROR", "confidence": 0.0},
+            "entities": {"tables": [], "time_filters": []},
+            "analysis_metadata": {
+                "processing_status": "error",
+                "error_message": str(error),
+                "sql_ready": False,
+                "extraction_method": "ner_model"
+            }
+        }
+
     def get_query_context(self, analysis_result):
         """
         Extract query context for SQL generation
@@ -290,7 +386,8 @@ class NLPProcessor:
                 "ner_model": extractor_stats.get("model_loaded", False),
                 "berturk": self.berturk.is_loaded()
             },
-            "extractor_stats": extractor_stats
+            "extractor_stats": extractor_stats,
+            "result_cache": self.result_cache.get_statistics() if self.result_cache is not None else None
         }
 
     def get_system_info(self):
@@ -308,7 +405,8 @@ class NLPProcessor:
             },
             "supported_intents": ["SELECT", "COUNT", "SUM", "AVG"],
             "supported_entities": ["tables", "time_filters", "numbers"],
-            "model_info": extractor_stats.get("model_info", {})
+            "model_info": extractor_stats.get("model_info", {}),
+            "thread_topology": get_thread_topology()
         }
 
     def test_extraction(self, test_texts=None):
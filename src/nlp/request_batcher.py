@@ -0,0 +1,157 @@
+# src/nlp/request_batcher.py
+"""
+Async Request Batcher for the NLP-SQL API
+Coalesces concurrent requests into batched NER forward passes
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RequestBatcher:
+    """
+    Asyncio micro-batching scheduler
+
+    Requests that arrive within ``max_wait_ms`` of the first queued request
+    (up to ``max_batch_size`` of them) are handed to ``batch_fn`` together.
+    ``batch_fn`` is a blocking callable that maps a list of texts to a list of
+    results in the same order; it runs on a single worker thread so the model
+    only ever sees one batch at a time and the event loop stays free.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=16, max_wait_ms=5, max_queue_size=1024):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_queue_size = max_queue_size
+
+        self._queue = None
+        self._worker = None
+        self._executor = None
+
+        # Statistics
+        self.requests_processed = 0
+        self.batches_processed = 0
+        self.largest_batch = 0
+        self.total_batch_time = 0.0
+
+    async def start(self):
+        """Start the background batching loop on the running event loop"""
+        if self._worker is not None:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nlp-batch")
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the batching loop and fail any request still waiting"""
+        if self._worker is None:
+            return
+
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Request batcher stopped"))
+
+        self._executor.shutdown(wait=False)
+        self._worker = None
+        self._executor = None
+
+    def is_running(self):
+        """Check if the batching loop is active"""
+        return self._worker is not None and not self._worker.done()
+
+    async def run_in_worker(self, fn, *args):
+        """Run a blocking callable on the batch worker thread (serialized with batches)"""
+        if not self.is_running():
+            raise RuntimeError("Request batcher is not running. Call start() first.")
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def submit(self, text):
+        """Queue a single text and wait for its own result"""
+        if not self.is_running():
+            raise RuntimeError("Request batcher is not running. Call start() first.")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self):
+        """Collect requests into batches and dispatch them one at a time"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._dispatch(batch, loop)
+
+    async def _dispatch(self, batch, loop):
+        """Run one batch in the worker thread and resolve every future"""
+        texts = [text for text, _ in batch]
+        start_time = time.perf_counter()
+
+        try:
+            results = await loop.run_in_executor(self._executor, self.batch_fn, texts)
+            if len(results) != len(texts):
+                raise RuntimeError(f"Batch function returned {len(results)} results for {len(texts)} inputs")
+        except asyncio.CancelledError:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(RuntimeError("Request batcher stopped"))
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.total_batch_time += time.perf_counter() - start_time
+        self.batches_processed += 1
+        self.requests_processed += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+        for (_, future), result in zip(batch, results):
+            # Client may have disconnected and cancelled its future
+            if not future.done():
+                future.set_result(result)
+
+    def get_statistics(self):
+        """Get batching statistics"""
+        avg_batch_size = (self.requests_processed / self.batches_processed) if self.batches_processed > 0 else 0
+        avg_batch_time = (self.total_batch_time / self.batches_processed) if self.batches_processed > 0 else 0
+
+        return {
+            "running": self.is_running(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "queued_requests": self._queue.qsize() if self._queue is not None else 0,
+            "requests_processed": self.requests_processed,
+            "batches_processed": self.batches_processed,
+            "average_batch_size": round(avg_batch_size, 2),
+            "largest_batch": self.largest_batch,
+            "average_batch_time_ms": round(avg_batch_time * 1000.0, 3)
+        }
+
+
+def create_request_batcher(batch_fn, max_batch_size=16, max_wait_ms=5):
+    """Factory function to create a request batcher"""
+    return RequestBatcher(batch_fn, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
@@ -0,0 +1,38 @@
+# src/nlp/startup_timer.py
+"""
+Startup timing report
+Records how long each component takes to import/load during process start
+"""
+
+import time
+from contextlib import contextmanager
+
+_process_start = time.perf_counter()
+_timings = {}
+
+
+@contextmanager
+def timed_startup(component):
+    """Time a startup step; nested steps are reported separately"""
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        _timings[component] = round(time.perf_counter() - start_time, 3)
+
+
+def get_startup_report():
+    """Per-component seconds plus wall time since this module was imported"""
+    return {
+        "components": dict(_timings),
+        "since_first_import_seconds": round(time.perf_counter() - _process_start, 3)
+    }
+
+
+def print_startup_report():
+    """Print the startup timing report"""
+    report = get_startup_report()
+    print("⏱️ Startup timing:")
+    for component, seconds in report["components"].items():
+        print(f"   {component:<16} {seconds:>7.3f} s")
+    print(f"   {'total':<16} {report['since_first_import_seconds']:>7.3f} s")
@@ -0,0 +1,97 @@
+# src/nlp/thread_topology.py
+"""
+CPU thread topology for inference
+Decides how many API workers share this machine and how many torch threads
+each of them uses, so that workers x threads never oversubscribes the cores
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from config.model_config import TORCH_NUM_THREADS, TORCH_INTEROP_THREADS, API_WORKERS, THREAD_TOPOLOGY_PATH
+
+_applied = False
+_topology = None
+
+
+def available_cpus():
+    """Cores this process may run on (respects affinity / container cpusets)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def load_tuned_topology(path=THREAD_TOPOLOGY_PATH):
+    """Topology saved by the tuning script, None if missing or for another core count"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            tuned = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if tuned.get("cpus") != available_cpus():
+        return None
+    return tuned
+
+
+def resolve_topology(num_threads=TORCH_NUM_THREADS, workers=API_WORKERS,
+                     interop_threads=TORCH_INTEROP_THREADS, tuned=None):
+    """
+    Combine explicit settings, the tuned file and the core count
+
+    Explicit (non-zero) values always win; a missing value is taken from the
+    tuned topology, else derived so that workers * threads <= cpus.
+    """
+    cpus = available_cpus()
+    source = "config" if num_threads and workers else "auto"
+
+    if source == "auto" and tuned:
+        num_threads = num_threads or tuned.get("threads_per_worker", 0)
+        workers = workers or tuned.get("workers", 0)
+        source = "tuned"
+
+    if not workers:
+        workers = max(1, cpus // num_threads) if num_threads else 1
+    if not num_threads:
+        num_threads = max(1, cpus // workers)
+
+    return {
+        "cpus": cpus,
+        "workers": workers,
+        "threads_per_worker": num_threads,
+        "interop_threads": max(1, interop_threads),
+        "oversubscribed": workers * num_threads > cpus,
+        "source": source
+    }
+
+
+def get_thread_topology():
+    """Topology for this process (resolved once)"""
+    global _topology
+    if _topology is None:
+        _topology = resolve_topology(tuned=load_tuned_topology())
+    return _topology
+
+
+def apply_torch_threads():
+    """Set torch intra/inter-op thread counts once per process"""
+    global _applied
+    if _applied:
+        return get_thread_topology()
+
+    import torch
+
+    topology = get_thread_topology()
+    torch.set_num_threads(topology["threads_per_worker"])
+    try:
+        # Only allowed before any inter-op parallel work has started
+        torch.set_num_interop_threads(topology["interop_threads"])
+    except RuntimeError:
+        pass
+
+    _applied = True
+    return topology
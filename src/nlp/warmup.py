@@ -0,0 +1,102 @@
+# src/nlp/warmup.py
+"""
+Model Warmup for serving processes
+Runs representative queries through the full pipeline before live traffic
+so the first real request does not pay for allocator setup, tokenizer
+initialization and kernel selection
+"""
+
+import time
+
+# Short, medium and long queries so several padded sequence lengths are seen
+WARMUP_QUERIES = [
+    "Müşteri sayısı",
+    "Bu ayın sipariş toplamı",
+    "Geçen yıl en çok satılan ürünlerin listesi",
+    "Son 30 gün içinde İstanbul'daki müşterilerin verdiği siparişlerin ortalama tutarı",
+    "2022 3. çeyrekte satış departmanında çalışan personelin maaşlarının toplamı ve "
+    "aynı dönemde tamamlanan siparişlerin sayısı ile ürün kategorilerine göre dağılımı"
+]
+
+
+class ModelWarmup:
+    """
+    Warms up an NLPProcessor + SQLGenerator pair
+
+    Every batch size runs the whole query set (cycled to fill the batch)
+    with caches bypassed, so each process really executes the model.
+    ``is_ready()`` turns True only once every round has finished.
+    """
+
+    def __init__(self, nlp_processor, sql_generator, batch_sizes=(1, 4, 16), queries=None):
+        self.nlp_processor = nlp_processor
+        self.sql_generator = sql_generator
+        self.batch_sizes = [size for size in batch_sizes if size > 0]
+        self.queries = list(queries) if queries else list(WARMUP_QUERIES)
+
+        self.status = "pending"
+        self.error = None
+        self.rounds = []
+        self.total_time = 0.0
+
+    def run(self):
+        """Run every warmup round; blocking, call it on the model worker thread"""
+        self.status = "running"
+        start_time = time.perf_counter()
+
+        try:
+            for batch_size in self.batch_sizes:
+                round_start = time.perf_counter()
+                self._run_round(batch_size)
+                self.rounds.append({
+                    "batch_size": batch_size,
+                    "seconds": round(time.perf_counter() - round_start, 3)
+                })
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+            print(f"❌ Warmup failed: {e}")
+            return False
+        finally:
+            self.total_time = time.perf_counter() - start_time
+
+        self.status = "ready"
+        print(f"🔥 Warmup finished in {self.total_time:.3f} s ({len(self.rounds)} rounds)")
+        return True
+
+    def _run_round(self, batch_size):
+        """One pass over the query set in batches of batch_size"""
+        if batch_size == 1:
+            analyses = [self.nlp_processor.analyze(text, use_cache=False) for text in self.queries]
+        else:
+            analyses = []
+            for start in range(0, len(self.queries), batch_size):
+                texts = [self._query_at(start + i) for i in range(batch_size)]
+                analyses.extend(self.nlp_processor.analyze_batch(texts, use_cache=False))
+
+        for analysis in analyses:
+            self.sql_generator.generate_sql(analysis, use_cache=False)
+
+    def _query_at(self, index):
+        """Cycle through the query set; repeats get a suffix so batches are not deduplicated"""
+        cycle, position = divmod(index, len(self.queries))
+        query = self.queries[position]
+        return f"{query} {cycle}" if cycle else query
+
+    def skip(self):
+        """Mark the process ready without warming up (warmup disabled)"""
+        self.status = "skipped"
+
+    def is_ready(self):
+        """True once warmup finished (or was skipped); a failed warmup is never ready"""
+        return self.status in ("ready", "skipped")
+
+    def get_status(self):
+        """Get warmup status"""
+        return {
+            "ready": self.is_ready(),
+            "status": self.status,
+            "error": self.error,
+            "rounds": list(self.rounds),
+            "total_time_seconds": round(self.total_time, 3)
+        }
@@ -0,0 +1,174 @@
+"""
+Join planning for multi-table queries
+The referenced tables are connected with a minimum Steiner tree over the FK
+graph (fewest joins, shared intermediate tables joined once) instead of one
+shortest path per table. Every relation costs one join. Small table sets are
+solved exactly (Dreyfus-Wagner style subset DP), larger ones with the
+shortest-path heuristic (at most 2x the optimum). Joins come out in
+topological order: a table is always joined after the table it hangs off.
+"""
+
+import heapq
+from collections import deque
+
+from config.model_config import JOIN_PLANNER_EXACT_LIMIT
+
+
+class JoinPlanner:
+    """
+    Minimum join tree over RelationMapper's FK graph
+
+    plan() returns steps (from_table, from_col, to_table, to_col) in the same
+    orientation as RelationMapper.get_join_paths.
+    """
+
+    def __init__(self, relation_mapper, exact_limit=JOIN_PLANNER_EXACT_LIMIT):
+        self.relation_mapper = relation_mapper
+        # Exact solver up to this many tables besides the main one (the DP is O(3^k · n))
+        self.exact_limit = exact_limit
+
+    def plan(self, main_table, tables):
+        """
+        Join steps connecting main_table with all tables, parent before child
+
+        Raises:
+            ValueError: a table is not reachable from main_table
+        """
+        terminals = []
+        for table in tables:
+            if table != main_table and table not in terminals:
+                terminals.append(table)
+
+        # Ulaşılamayan tablo varsa hangisi olduğunu söyle
+        reachable = self.relation_mapper.shortest_paths.get(main_table, {})
+        for table in terminals:
+            if table not in reachable:
+                raise ValueError(f"No join path found between {main_table} and {table}")
+
+        if not terminals:
+            return []
+        if len(terminals) == 1:
+            # Two tables: the Steiner tree is the shortest path itself
+            return self.relation_mapper.get_join_paths(main_table, terminals[0])
+
+        if len(terminals) <= self.exact_limit:
+            steps = self._exact_tree(main_table, terminals)
+        else:
+            steps = self._approximate_tree(main_table, terminals)
+        return self._order_from_root(main_table, steps)
+
+    def _exact_tree(self, root, terminals):
+        """
+        Minimum Steiner tree by dynamic programming over terminal subsets
+
+        cost[mask][v] is the size of the smallest tree spanning the terminals
+        in mask plus table v. It is either a split at v (two smaller trees
+        meeting at v) or one edge longer than the tree at a neighbour.
+        """
+        adjacency = self.relation_mapper.adjacency
+        nodes = list(self.relation_mapper.shortest_paths[root])
+        full = (1 << len(terminals)) - 1
+        cost = {}
+        back = {}
+
+        for mask in range(1, full + 1):
+            costs = {}
+            choices = {}
+            if mask & (mask - 1) == 0:
+                leaf = terminals[mask.bit_length() - 1]
+                costs[leaf] = 0
+                choices[leaf] = ("leaf",)
+            else:
+                # Each unordered split once: sub holds mask's lowest terminal
+                low = mask & -mask
+                for node in nodes:
+                    sub = (mask - 1) & mask
+                    while sub:
+                        if sub & low:
+                            left, right = cost[sub].get(node), cost[mask ^ sub].get(node)
+                            if left is not None and right is not None:
+                                total = left + right
+                                if total < costs.get(node, float("inf")):
+                                    costs[node] = total
+                                    choices[node] = ("split", sub)
+                        sub = (sub - 1) & mask
+
+            # Grow every partial tree along FK edges (Dijkstra, unit weights)
+            heap = [(value, order, node) for order, (node, value) in enumerate(costs.items())]
+            heapq.heapify(heap)
+            counter = len(heap)
+            while heap:
+                value, _, node = heapq.heappop(heap)
+                if value > costs[node]:
+                    continue
+                for step in adjacency.get(node, ()):
+                    next_node = step[2]
+                    if value + 1 < costs.get(next_node, float("inf")):
+                        costs[next_node] = value + 1
+                        # Walked in reverse when the tree is rebuilt from the root
+                        choices[next_node] = ("edge", step)
+                        heapq.heappush(heap, (value + 1, counter, next_node))
+                        counter += 1
+
+            cost[mask] = costs
+            back[mask] = choices
+
+        steps = []
+        stack = [(full, root)]
+        while stack:
+            mask, node = stack.pop()
+            choice = back[mask][node]
+            while choice[0] == "edge":
+                steps.append(choice[1])
+                node = choice[1][0]
+                choice = back[mask][node]
+            if choice[0] == "split":
+                stack.append((choice[1], node))
+                stack.append((mask ^ choice[1], node))
+        return steps
+
+    def _approximate_tree(self, root, terminals):
+        """
+        Shortest-path heuristic: repeatedly attach the terminal closest to the
+        tree so far along its precomputed shortest path
+        """
+        shortest_paths = self.relation_mapper.shortest_paths
+        tree_tables = [root]
+        in_tree = {root}
+        remaining = list(terminals)
+        steps = []
+
+        while remaining:
+            best = None
+            for table in remaining:
+                for tree_table in tree_tables:
+                    path = shortest_paths[tree_table][table]
+                    if best is None or len(path) < len(best):
+                        best = path
+            for step in best:
+                steps.append(step)
+                if step[2] not in in_tree:
+                    in_tree.add(step[2])
+                    tree_tables.append(step[2])
+            remaining = [table for table in remaining if table not in in_tree]
+
+        return steps
+
+    def _order_from_root(self, root, steps):
+        """Tree edges as BFS-ordered join steps oriented away from root"""
+        neighbours = {}
+        for from_table, from_col, to_table, to_col in steps:
+            neighbours.setdefault(from_table, []).append((from_table, from_col, to_table, to_col))
+            neighbours.setdefault(to_table, []).append((to_table, to_col, from_table, from_col))
+
+        ordered = []
+        joined = {root}
+        queue = deque([root])
+        while queue:
+            table = queue.popleft()
+            for step in neighbours.get(table, ()):
+                if step[2] not in joined:
+                    joined.add(step[2])
+                    ordered.append(step)
+                    queue.append(step[2])
+        return ordered
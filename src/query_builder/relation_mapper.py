@@ -1,3 +1,6 @@
+from collections import deque
+
+
 class RelationMapper:
     """
     self.relations: Foreign key bağlantılarını manuel olarak belirtiyoruz.
@@ -5,11 +8,15 @@ class RelationMapper:
 get_related_table(): Belirli bir kolonun bağlı olduğu tabloyu verir.
 
 find_join_path(): Başlangıç ve hedef tablo verildiğinde JOIN sırasını çıkarır (örneğin order_details → orders → customers).
+
+İlişkiler bir kez komşuluk listesine çevrilir ve her tablodan BFS ile tüm
+tablolara en kısa join yolu önceden hesaplanır; sorgu anında yol bulmak
+sadece bir sözlük okumasıdır.
     """
 
-    def __init__(self):
+    def __init__(self, relations=None):
         # Format: (source_table, source_column) -> (target_table, target_column)
-        self.relations = {
+        self.relations = relations if relations is not None else {
             ("products", "category_id"): ("categories", "id"),
             ("products", "supplier_id"): ("suppliers", "id"),
             ("orders", "customer_id"): ("customers", "id"),
@@ -22,6 +29,36 @@ find_join_path(): Başlangıç ve hedef tablo verildiğinde JOIN sırasını ç
 
 
         }
+        self.rebuild_index()
+
+    def rebuild_index(self):
+        """
+        Adjacency list + all-pairs shortest join paths (call after changing self.relations)
+
+        Edges are walkable in both directions; a step is stored oriented in
+        walking direction as (from_table, from_col, to_table, to_col). Ties
+        between equally short paths go to the relation defined first.
+        """
+        self.adjacency = {}
+        for (src_table, src_col), (tgt_table, tgt_col) in self.relations.items():
+            # İleri yön ve geri yön (ters ilişki)
+            self.adjacency.setdefault(src_table, []).append((src_table, src_col, tgt_table, tgt_col))
+            self.adjacency.setdefault(tgt_table, []).append((tgt_table, tgt_col, src_table, src_col))
+
+        self.shortest_paths = {table: self._bfs_paths(table) for table in self.adjacency}
+
+    def _bfs_paths(self, start_table):
+        """Shortest join path (tuple of steps) from start_table to every reachable table"""
+        paths = {start_table: ()}
+        queue = deque([start_table])
+        while queue:
+            table = queue.popleft()
+            for step in self.adjacency[table]:
+                next_table = step[2]
+                if next_table not in paths:
+                    paths[next_table] = paths[table] + (step,)
+                    queue.append(next_table)
+        return paths
 
     def get_related_table(self, source_table, source_column):
         """Returns the related (target_table, target_column) if exists"""
@@ -32,35 +69,20 @@ find_join_path(): Başlangıç ve hedef tablo verildiğinde JOIN sırasını ç
         return self.relations
 
     def find_join_path(self, start_table, end_table, visited=None):
-        if visited is None:
-            visited = set()
-        visited.add(start_table)
-
-        for (src_table, src_col), (tgt_table, tgt_col) in self.relations.items():
-            # İleri yön
-            if src_table == start_table and tgt_table == end_table:
-                return [(src_table, src_col, tgt_table, tgt_col)]
-
-            if src_table == start_table and tgt_table not in visited:
-                path = self.find_join_path(tgt_table, end_table, visited)
-                if path:
-                    return [(src_table, src_col, tgt_table, tgt_col)] + path
-
-            # Geri yön (ters ilişkiyi de ara)
-            if tgt_table == start_table and src_table == end_table:
-                return [(tgt_table, tgt_col, src_table, src_col)]
-
-            if tgt_table == start_table and src_table not in visited:
-                path = self.find_join_path(src_table, end_table, visited)
-                if path:
-                    return [(tgt_table, tgt_col, src_table, src_col)] + path
+        """
+        En kısa join yolu (önceden hesaplanmış tablodan)
 
-        return None
+        visited eski DFS imzası için tutuluyor; kullanılmıyor.
+        Yol yoksa None, aynı tablo için boş liste döner.
+        """
+        path = self.shortest_paths.get(start_table, {}).get(end_table)
+        if path is None:
+            return [] if start_table == end_table else None
+        return list(path)
 
-    
     def get_join_paths(self, from_table, to_table):
         """
-        from_table'dan to_table'a join path'ı DFS ile bulur.
+        from_table'dan to_table'a en kısa join path'ı döner (O(1) lookup).
         Liste olarak join adımlarını döner:
         [(from_table, from_col, to_table, to_col), ...]
         """
@@ -1,3 +1,7 @@
+import hashlib
+import json
+
+
 class SchemaMapper:
     """
     Database schema mapper for SQL generation
@@ -7,9 +11,12 @@ class SchemaMapper:
 
     def __init__(self):
         # Database schema definition - matches actual PostgreSQL schema
+        # (column_types: declared types from data/create_database.sql, used to
+        # type bind parameters)
         self.schema = {
             "customers": {
                 "primary_key": "id",
+                "column_types": {"id": "integer", "company_name": "text", "contact_person": "text", "email": "text", "phone": "text", "address": "text", "city": "text", "created_date": "timestamp"},
                 "date_column": "created_date",
                 "display_columns": ["company_name", "contact_person", "city"],
                 "countable_column": "id",
@@ -18,6 +25,7 @@ class SchemaMapper:
             },
             "products": {
                 "primary_key": "id",
+                "column_types": {"id": "integer", "product_name": "text", "category_id": "integer", "supplier_id": "integer", "unit_price": "decimal", "unit": "text", "stock_quantity": "integer", "description": "text", "created_date": "timestamp"},
                 "date_column": "created_date",
                 "display_columns": ["product_name", "unit_price", "stock_quantity", "unit"],
                 "countable_column": "id",
@@ -27,6 +35,7 @@ class SchemaMapper:
             },
             "orders": {
                 "primary_key": "id",
+                "column_types": {"id": "integer", "customer_id": "integer", "employee_id": "integer", "order_date": "date", "total_amount": "decimal", "status": "text", "notes": "text"},
                 "date_column": "order_date",
                 "display_columns": ["id", "order_date", "total_amount", "status"],
                 "countable_column": "id",
@@ -37,6 +46,7 @@ class SchemaMapper:
             },
             "categories": {
                 "primary_key": "id",
+                "column_types": {"id": "integer", "category_name": "text", "description": "text", "created_date": "timestamp"},
                 "date_column": "created_date",
                 "display_columns": ["category_name", "description"],
                 "countable_column": "id",
@@ -45,6 +55,7 @@ class SchemaMapper:
             },
             "suppliers": {
                 "primary_key": "id",
+                "column_types": {"id": "integer", "company_name": "text", "contact_person": "text", "email": "text", "phone": "text", "address": "text", "city": "text", "created_date": "timestamp"},
                 "date_column": "created_date",
                 "display_columns": ["company_name", "contact_person", "city"],
                 "countable_column": "id",
@@ -53,6 +64,7 @@ class SchemaMapper:
             },
             "employees": {
                 "primary_key": "id",
+                "column_types": {"id": "integer", "first_name": "text", "last_name": "text", "department": "text", "position": "text", "salary": "decimal", "hire_date": "date", "email": "text", "phone": "text"},
                 "date_column": "hire_date",
                 "display_columns": ["first_name", "last_name", "department", "position"],
                 "countable_column": "id",
@@ -61,6 +73,7 @@ class SchemaMapper:
             },
             "order_details": {
                 "primary_key": "id",
+                "column_types": {"id": "integer", "order_id": "integer", "product_id": "integer", "quantity": "integer", "unit_price": "decimal", "total_price": "decimal"},
                 "date_column": "order_date",  # Will need JOIN for time filters
                 "display_columns": ["order_id", "product_id", "quantity", "unit_price", "total_price"],
                 "countable_column": "id",
@@ -69,6 +82,7 @@ class SchemaMapper:
             },
             "purchase_orders": {
                 "primary_key": "id",
+                "column_types": {"id": "integer", "supplier_id": "integer", "employee_id": "integer", "order_date": "date", "total_amount": "decimal", "status": "text", "delivery_date": "date", "notes": "text"},
                 "date_column": "order_date",
                 "display_columns": ["id", "order_date", "total_amount", "status", "delivery_date"],
                 "countable_column": "id",
@@ -77,10 +91,28 @@ class SchemaMapper:
             }
         }
 
+    def get_schema_version(self, relations=None):
+        """
+        Short hash of the schema (and optional FK relations)
+        Used to invalidate cached SQL when the schema definition changes
+        """
+        payload = {"schema": self.schema}
+        if relations:
+            payload["relations"] = sorted(
+                f"{src_table}.{src_col}->{tgt_table}.{tgt_col}"
+                for (src_table, src_col), (tgt_table, tgt_col) in relations.items()
+            )
+        encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+        return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
     def get_table_schema(self, table_name):
         """Get schema for table"""
         return self.schema.get(table_name, {})
 
+    def get_column_type(self, table_name, column_name):
+        """Declared type of a column (integer, decimal, text, date, timestamp) or None"""
+        return self.get_table_schema(table_name).get("column_types", {}).get(column_name)
+
     def is_valid_table(self, table_name):
         """Check if table exists in schema"""
         return table_name in self.schema
@@ -4,6 +4,10 @@ from src.query_builder.schema_mapper import SchemaMapper
 from src.query_builder.query_templates import QueryTemplates
 from src.query_builder.query_validator import QueryValidator
 from src.query_builder.relation_mapper import RelationMapper
+from src.query_builder.join_planner import JoinPlanner
+from src.cache.backends import create_cache_backend, make_cache_key
+from src.query_builder.sql_template import INLINE_BINDER, PlanCache, SlotBinder, SQLTemplate
+from config.model_config import SQL_PLAN_CACHE_SIZE, SQL_PARAMSTYLE
 
 #Bu yardımcı fonksiyon, NLP analizinden gelen varlıkları tarayarak "en fazla" (MAX) veya "en az" (MIN) gibi agregasyon modifikatörlerini tespit eder.
 def extract_aggregation_modifier(entities):
@@ -28,18 +32,69 @@ class SQLGenerator:
     Optimized without unnecessary table mapping
     """
 
-    def __init__(self):
+    def __init__(self, result_cache=None, plan_cache=None):
         self.schema_mapper = SchemaMapper()
         self.query_templates = QueryTemplates()
         self.validator = QueryValidator()
         self.relation_mapper = RelationMapper()
+        self.join_planner = JoinPlanner(self.relation_mapper)
+        # Cached SQL is only valid for this schema + relations
+        self.schema_version = self.schema_mapper.get_schema_version(self.relation_mapper.get_all_relations())
+        # Compiled SQL templates keyed by query shape (valid for schema_version)
+        self.plan_cache = plan_cache if plan_cache is not None else PlanCache(max_size=SQL_PLAN_CACHE_SIZE)
+        self.result_cache = result_cache if result_cache is not None else create_cache_backend()
         # Statistics
         self.queries_generated = 0
         self.successful_generations = 0
     
     
-    def generate_sql(self, nlp_analysis):
+    def generate_sql(self, nlp_analysis, use_cache=True, paramstyle=None):
+        """
+        Generate SQL for an NLP analysis
+
+        Args:
+            nlp_analysis: NLPProcessor.analyze result
+            use_cache: Look up / store results in the result cache
+            paramstyle: None for inline literals, "dollar" ($1, $2 ...) or
+                "format" (%s) for placeholders plus "params"/"param_types";
+                parameterized results bypass the result cache (their typed
+                params are not JSON values), the plan cache keeps them cheap
+        """
         self.queries_generated += 1
+
+        if paramstyle is not None:
+            return self._generate_sql(nlp_analysis, paramstyle)
+
+        # Analyses produced by NLPProcessor carry the model version; the
+        # same text + model + schema always yields the same SQL
+        cache_key = self._sql_cache_key(nlp_analysis) if use_cache else None
+        if cache_key is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                self.successful_generations += 1
+                return cached
+
+        result = self._generate_sql(nlp_analysis)
+        if cache_key is not None and result.get("success"):
+            self.result_cache.set(cache_key, result)
+        return result
+
+    def _sql_cache_key(self, nlp_analysis):
+        """Cache key for an analysis, None when it cannot be cached"""
+        if self.result_cache is None or not isinstance(nlp_analysis, dict):
+            return None
+
+        model_version = (nlp_analysis.get("analysis_metadata") or {}).get("model_version")
+        text = nlp_analysis.get("text")
+        if not model_version or not isinstance(text, str) or not text.strip():
+            return None
+        return make_cache_key("sql", text, model_version, self.schema_version)
+
+    def generate_parameterized_sql(self, nlp_analysis, paramstyle=SQL_PARAMSTYLE):
+        """Parameterized SQL (one text per query shape) for prepared-statement reuse"""
+        return self.generate_sql(nlp_analysis, paramstyle=paramstyle)
+
+    def _generate_sql(self, nlp_analysis, paramstyle=None):
         try:
             # 1. Girdi validasyonu
             if not self._validate_input(nlp_analysis):
@@ -50,138 +105,206 @@ class SQLGenerator:
                 return {"success": False, "error": "NLP analysis not ready for SQL generation", "sql": None,
                         "debug_info": self._get_debug_info(nlp_analysis)}
 
-            intent = nlp_analysis["intent"]["type"]
-            entities = nlp_analysis["entities"]
-            tables = entities["tables"]
-            time_filters = entities.get("time_filters", [])
-            filters = entities.get("filters", [])
-
-            # 2. aggregation_modifier'ın raw intent/entity listesinden çıkarımı
-            if "aggregation_modifier" not in entities:
-                raw_ents = entities.get("entities", [])#min max içermeyen entity ler
-    
-                entities["aggregation_modifier"] = extract_aggregation_modifier(raw_ents)
-
-            # 3. Alias ve join path hazırlığı tablolara alias atama t0 ve t1 gibi
-            main_table = tables[0]["table"]
-            join_clauses = []
-            used_joins = set()
-            aliases = {}
-            alias_counter = 0
-            used_aliases = set()
-
-            def assign_alias(table_name):
-                nonlocal alias_counter
-                if table_name not in aliases:
-                    alias = f"t{alias_counter}"
-                    while alias in used_aliases:
-                        alias_counter += 1
-                        alias = f"t{alias_counter}"
-                    aliases[table_name] = alias
-                    used_aliases.add(alias)
-                    alias_counter += 1
-                return aliases[table_name]
-
-            assign_alias(main_table)
-            for entry in tables[1:]:
-                assign_alias(entry["table"])
-                path = self.relation_mapper.get_join_paths(main_table, entry["table"])
-                if not path:
-                    return {"success": False,
-                            "error": f"No join path found between {main_table} and {entry['table']}",
-                            "sql": None}
-                for f_table, f_col, t_table, t_col in path:
-                    sig = (f_table, f_col, t_table, t_col)
-                    if sig in used_joins:
-                        continue
-                    used_joins.add(sig)
-                    fa, ta = assign_alias(f_table), assign_alias(t_table)
-                    join_clauses.append(
-                        f"JOIN {t_table} {ta} ON {fa}.{f_col} = {ta}.{t_col}"
-                    )
-
-            where_clause = self.build_where_clause(filters, time_filters, aliases)
-
-            # 4. Intent’e göre SQL oluşturma
-            if intent == "SELECT":
-                sql = self._generate_select_multi_table(tables, aliases, join_clauses, where_clause)
-
-            elif intent == "COUNT":
-                agg_mod = entities.get("aggregation_modifier")
-                if not agg_mod:
-                    lbl = nlp_analysis["intent"].get("label", "").lower()
-                    if "en fazla" in lbl or "en çok" in lbl:
-                        agg_mod = "MAX"
-                    elif "en az" in lbl or "en düşük" in lbl:
-                        agg_mod = "MIN"
-                order_by = "DESC" if agg_mod == "MAX" else "ASC" if agg_mod == "MIN" else None
-                limit = 1 if agg_mod in ("MAX", "MIN") else None
-                sql = self._generate_count_multi_table(
-                    tables, aliases, join_clauses, where_clause,
-                    order_by=order_by, limit=limit
-                )
-
-            elif intent == "SUM":
-                agg_mod = entities.get("aggregation_modifier")
-                if not agg_mod:
-                    lbl = nlp_analysis["intent"].get("label", "").lower()
-                    if "en fazla" in lbl or "en çok" in lbl:
-                        agg_mod = "MAX"
-                    elif "en az" in lbl or "en düşük" in lbl:
-                        agg_mod = "MIN"
-                order_by = "DESC" if agg_mod == "MAX" else "ASC" if agg_mod == "MIN" else None
-                limit = 1 if agg_mod in ("MAX", "MIN") else None
-                sql = self._generate_sum_multi_table(
-                    tables, aliases, join_clauses, where_clause,
-                    order_by=order_by, limit=limit
-                )
-
-            elif intent == "AVG":
-                sql = self._generate_avg_multi_table(tables, aliases, join_clauses, where_clause)
+            # 2. Aynı şekildeki (shape) sorgular derlenmiş şablonu paylaşır;
+            # şablonda yalnızca literal değerler için yer tutucu vardır
+            shape = self._query_shape(nlp_analysis)
+            template = self.plan_cache.get(shape)
+            if template is None:
+                template = self._compile_template(nlp_analysis)
+                if not isinstance(template, SQLTemplate):
+                    return template
+                self.plan_cache.put(shape, template)
 
-            elif intent == "AGGREGATE":
-                func = nlp_analysis["intent"].get("function", "").upper()
-                col = nlp_analysis["intent"].get("target_column")
-                alias = assign_alias(main_table)
-                if func in ("MIN", "MAX") and col:
-                    sql = f"SELECT {func}({alias}.{col}) FROM {main_table} {alias}"
-                    if where_clause:
-                        sql += f" WHERE {where_clause}"
-                else:
-                    return {"success": False, "error": "Aggregate function or target column missing", "sql": None}
-
-            else:
-                return {"success": False, "error": f"Unsupported intent: {intent}", "sql": None}
+            entities = nlp_analysis["entities"]
+            values = self._literal_values(entities.get("time_filters", []), entities.get("filters", []))
+            result = template.render(values, nlp_analysis["intent"].get("confidence"), paramstyle)
 
-            # 5. Validator ile son kontrol
-            valid, err = self.validator.validate(sql)
+            # 5. Validator ile son kontrol (literal değerler dahil)
+            valid, err = self.validator.validate(result["sql"])
             if not valid:
-                return {"success": False, "error": f"Generated SQL failed validation: {err}", "sql": sql}
+                return {"success": False, "error": f"Generated SQL failed validation: {err}", "sql": result["sql"]}
 
             self.successful_generations += 1
-            return {
-                "success": True,
-                "sql": sql,
-                "intent": intent,
-                "tables": [t["table"] for t in tables],
-                "has_time_filter": bool(time_filters),
-                "confidence": nlp_analysis["intent"].get("confidence"),
-                "metadata": {
-                    "query_type": intent.lower(),
-                    "complexity": "medium" if len(tables) > 1 else "simple",
-                    "table_info": [
-                        self.schema_mapper.get_table_info(t["table"])
-                        for t in tables
-                    ]
-                }
-            }
+            return result
 
         except Exception as e:
             return {"success": False, "error": f"SQL generation failed: {e}", "sql": None,
                     "exception_type": type(e).__name__}
 
+    def _compile_template(self, nlp_analysis):
+        """
+        Build the SQL template for an analysis' shape
+
+        Returns:
+            SQLTemplate, or an error result dict
+        """
+        binder = SlotBinder()
+        intent = nlp_analysis["intent"]["type"]
+        entities = nlp_analysis["entities"]
+        tables = entities["tables"]
+        time_filters = entities.get("time_filters", [])
+        filters = entities.get("filters", [])
+
+        # 3. Alias ve join path hazırlığı tablolara alias atama t0 ve t1 gibi
+        main_table = tables[0]["table"]
+        join_clauses = []
+        aliases = {}
+        alias_counter = 0
+        used_aliases = set()
+
+        def assign_alias(table_name):
+            nonlocal alias_counter
+            if table_name not in aliases:
+                alias = f"t{alias_counter}"
+                while alias in used_aliases:
+                    alias_counter += 1
+                    alias = f"t{alias_counter}"
+                aliases[table_name] = alias
+                used_aliases.add(alias)
+                alias_counter += 1
+            return aliases[table_name]
+
+        for entry in tables:
+            assign_alias(entry["table"])
+        # Tüm tabloları bağlayan en küçük join ağacı (ara tablolar bir kez join edilir)
+        try:
+            plan = self.join_planner.plan(main_table, [entry["table"] for entry in tables[1:]])
+        except ValueError as e:
+            return {"success": False, "error": str(e), "sql": None}
+        for f_table, f_col, t_table, t_col in plan:
+            fa, ta = assign_alias(f_table), assign_alias(t_table)
+            join_clauses.append(
+                f"JOIN {t_table} {ta} ON {fa}.{f_col} = {ta}.{t_col}"
+            )
+
+        where_clause = self.build_where_clause(filters, time_filters, aliases, binder)
+
+        # 4. Intent’e göre SQL oluşturma
+        if intent == "SELECT":
+            sql = self._generate_select_multi_table(tables, aliases, join_clauses, where_clause)
+
+        elif intent == "COUNT":
+            agg_mod = entities.get("aggregation_modifier")
+            if not agg_mod:
+                lbl = nlp_analysis["intent"].get("label", "").lower()
+                if "en fazla" in lbl or "en çok" in lbl:
+                    agg_mod = "MAX"
+                elif "en az" in lbl or "en düşük" in lbl:
+                    agg_mod = "MIN"
+            order_by = "DESC" if agg_mod == "MAX" else "ASC" if agg_mod == "MIN" else None
+            limit = 1 if agg_mod in ("MAX", "MIN") else None
+            sql = self._generate_count_multi_table(
+                tables, aliases, join_clauses, where_clause,
+                order_by=order_by, limit=limit
+            )
+
+        elif intent == "SUM":
+            agg_mod = entities.get("aggregation_modifier")
+            if not agg_mod:
+                lbl = nlp_analysis["intent"].get("label", "").lower()
+                if "en fazla" in lbl or "en çok" in lbl:
+                    agg_mod = "MAX"
+                elif "en az" in lbl or "en düşük" in lbl:
+                    agg_mod = "MIN"
+            order_by = "DESC" if agg_mod == "MAX" else "ASC" if agg_mod == "MIN" else None
+            limit = 1 if agg_mod in ("MAX", "MIN") else None
+            sql = self._generate_sum_multi_table(
+                tables, aliases, join_clauses, where_clause,
+                order_by=order_by, limit=limit
+            )
+
+        elif intent == "AVG":
+            sql = self._generate_avg_multi_table(tables, aliases, join_clauses, where_clause)
+
+        elif intent == "AGGREGATE":
+            func = nlp_analysis["intent"].get("function", "").upper()
+            col = nlp_analysis["intent"].get("target_column")
+            alias = assign_alias(main_table)
+            if func in ("MIN", "MAX") and col:
+                sql = f"SELECT {func}({alias}.{col}) FROM {main_table} {alias}"
+                if where_clause:
+                    sql += f" WHERE {where_clause}"
+            else:
+                return {"success": False, "error": "Aggregate function or target column missing", "sql": None}
+
+        else:
+            return {"success": False, "error": f"Unsupported intent: {intent}", "sql": None}
+
+        return SQLTemplate(sql, binder.kinds, {
+            "success": True,
+            "intent": intent,
+            "tables": [t["table"] for t in tables],
+            "has_time_filter": bool(time_filters),
+            "metadata": {
+                "query_type": intent.lower(),
+                "complexity": "medium" if len(tables) > 1 else "simple",
+                "table_info": [
+                    self.schema_mapper.get_table_info(t["table"])
+                    for t in tables
+                ]
+            }
+        })
+
+    def _query_shape(self, nlp_analysis):
+        """
+        Everything _compile_template reads from an analysis except literal values
+
+        Also fills entities["aggregation_modifier"] from the raw entity list
+        when it is missing, as SQL generation always has.
+        """
+        intent = nlp_analysis["intent"]
+        entities = nlp_analysis["entities"]
+
+        # aggregation_modifier'ın raw intent/entity listesinden çıkarımı
+        if "aggregation_modifier" not in entities:
+            raw_ents = entities.get("entities", [])#min max içermeyen entity ler
+            entities["aggregation_modifier"] = extract_aggregation_modifier(raw_ents)
+
+        time_filters = entities.get("time_filters", [])
+        time_shape = None
+        if time_filters:
+            # Only the first time filter is applied (build_where_clause)
+            time_filter = time_filters[0]
+            time_shape = (
+                time_filter.get("period"),
+                bool(time_filter.get("date")),
+                bool(time_filter.get("start_date") and time_filter.get("end_date"))
+            )
+
+        return (
+            self.schema_version,
+            intent.get("type"),
+            intent.get("label", "").lower(),
+            intent.get("function"),
+            intent.get("target_column"),
+            tuple(t["table"] for t in entities["tables"]),
+            time_shape,
+            tuple(
+                (f.get("column"), f.get("operator", "="), type(f.get("value")).__name__)
+                for f in entities.get("filters", [])
+            ),
+            entities["aggregation_modifier"]
+        )
+
+    @staticmethod
+    def _literal_values(time_filters, filters):
+        """Slot values of a template, by the names build_where_clause binds them under"""
+        values = {}
+        if time_filters:
+            for key in ("date", "start_date", "end_date"):
+                values[f"time.{key}"] = time_filters[0].get(key)
+        for index, f in enumerate(filters):
+            values[f"filter.{index}"] = f.get("value")
+        return values
+
+    def refresh_schema_version(self):
+        """Recompute the schema version; templates compiled for another schema are dropped"""
+        schema_version = self.schema_mapper.get_schema_version(self.relation_mapper.get_all_relations())
+        if schema_version != self.schema_version:
+            self.schema_version = schema_version
+            self.plan_cache.invalidate()
+        return self.schema_version
 
-            
     def _generate_avg_multi_table(self, tables, aliases, join_clauses, where_clause):
         # En uygun tabloyu bulmak için toplam miktar sütunu olan tabloyu ara
         target_table = None
@@ -411,7 +534,10 @@ class SQLGenerator:
             "successful_queries": self.successful_generations,
             "failed_queries": self.queries_generated - self.successful_generations,
             "success_rate": round(success_rate, 2),
-            "available_tables": len(self.schema_mapper.get_all_tables())
+            "available_tables": len(self.schema_mapper.get_all_tables()),
+            "schema_version": self.schema_version,
+            "result_cache": self.result_cache.get_statistics() if self.result_cache is not None else None,
+            "plan_cache": self.plan_cache.get_statistics()
         }
 
     def get_supported_features(self):
@@ -456,36 +582,57 @@ class SQLGenerator:
 
         return sql
     
-    def build_time_filter(self, date_column, time_filter_obj):
+    def build_time_filter(self, date_column, time_filter_obj, binder=INLINE_BINDER):
+        """
+        Half-open range predicate (col >= start AND col < end) for a time filter
+
+        The column is never wrapped in a function (EXTRACT, DATE), so a B-tree
+        index on it (idx_orders_date) can serve the range. Bounds are DATE
+        values; for TIMESTAMP columns `< next day` keeps the whole last day.
+        Literal dates go through binder (inline by default, slots when compiling).
+        """
         period = time_filter_obj.get("period")
         specific_date = time_filter_obj.get("date")
 
-        filters = {
-            "current_month": f"EXTRACT(MONTH FROM {date_column}) = EXTRACT(MONTH FROM CURRENT_DATE) AND EXTRACT(YEAR FROM {date_column}) = EXTRACT(YEAR FROM CURRENT_DATE)",
-            "current_year": f"EXTRACT(YEAR FROM {date_column}) = EXTRACT(YEAR FROM CURRENT_DATE)",
-            "last_month": f"{date_column} >= DATE_TRUNC('month', CURRENT_DATE - INTERVAL '1 month') AND {date_column} < DATE_TRUNC('month', CURRENT_DATE)",
-            "last_year": f"EXTRACT(YEAR FROM {date_column}) = EXTRACT(YEAR FROM CURRENT_DATE) - 1",
-            "today": f"DATE({date_column}) = CURRENT_DATE",
-            "last_week": f"{date_column} >= DATE_TRUNC('week', CURRENT_DATE - INTERVAL '1 week') AND {date_column} < DATE_TRUNC('week', CURRENT_DATE)",
-            "current_week": f"EXTRACT(WEEK FROM {date_column}) = EXTRACT(WEEK FROM CURRENT_DATE) AND EXTRACT(YEAR FROM {date_column}) = EXTRACT(YEAR FROM CURRENT_DATE)",
+        month = "CAST(DATE_TRUNC('month', CURRENT_DATE) AS DATE)"
+        year = "CAST(DATE_TRUNC('year', CURRENT_DATE) AS DATE)"
+        week = "CAST(DATE_TRUNC('week', CURRENT_DATE) AS DATE)"
+
+        ranges = {
+            "current_month": (month, "CAST(DATE_TRUNC('month', CURRENT_DATE) + INTERVAL '1 month' AS DATE)"),
+            "current_year": (year, "CAST(DATE_TRUNC('year', CURRENT_DATE) + INTERVAL '1 year' AS DATE)"),
+            "last_month": ("CAST(DATE_TRUNC('month', CURRENT_DATE) - INTERVAL '1 month' AS DATE)", month),
+            "last_year": ("CAST(DATE_TRUNC('year', CURRENT_DATE) - INTERVAL '1 year' AS DATE)", year),
+            "today": ("CURRENT_DATE", "CURRENT_DATE + 1"),
+            "last_week": ("CAST(DATE_TRUNC('week', CURRENT_DATE) - INTERVAL '1 week' AS DATE)", week),
+            "current_week": (week, "CAST(DATE_TRUNC('week', CURRENT_DATE) + INTERVAL '1 week' AS DATE)"),
         }
 
-        if period in filters:
-            return filters[period]
+        if period in ranges:
+            return self._half_open_range(date_column, *ranges[period])
 
         if period == "specific_date" and specific_date:
-            return f"DATE({date_column}) = '{specific_date}'"
-        
+            date = binder.bind("time.date", specific_date, "date")
+            return self._half_open_range(date_column, date, f"{date} + 1")
+
         if period == "year":
             start_date = time_filter_obj.get("start_date")
             end_date = time_filter_obj.get("end_date")
             if start_date and end_date:
-                return f"{date_column} BETWEEN '{start_date}' AND '{end_date}'"
+                # end_date is inclusive ("2022-12-31")
+                return self._half_open_range(
+                    date_column,
+                    binder.bind("time.start_date", start_date, "date"),
+                    f"{binder.bind('time.end_date', end_date, 'date')} + 1"
+                )
 
+        return self._half_open_range(date_column, "CAST(CURRENT_DATE - INTERVAL '1 month' AS DATE)", "CURRENT_DATE + 1")
 
-        return f"{date_column} >= CURRENT_DATE - INTERVAL '1 month'"
+    @staticmethod
+    def _half_open_range(column, start, end):
+        return f"{column} >= {start} AND {column} < {end}"
 
-    def build_where_clause(self, filters, time_filters, aliases):
+    def build_where_clause(self, filters, time_filters, aliases, binder=INLINE_BINDER):
         where_clauses = []
 
         if time_filters:
@@ -493,11 +640,11 @@ class SQLGenerator:
             date_column = self.schema_mapper.get_table_schema(main_table).get("date_column")
             if date_column:
                 alias = aliases[main_table]
-                time_filter_clause = self.build_time_filter(f"{alias}.{date_column}", time_filters[0])
+                time_filter_clause = self.build_time_filter(f"{alias}.{date_column}", time_filters[0], binder)
                 if time_filter_clause:
                     where_clauses.append(time_filter_clause)
 
-        for f in filters:
+        for index, f in enumerate(filters):
             col = f.get("column")
             op = f.get("operator", "=")
             val = f.get("value")
@@ -505,10 +652,8 @@ class SQLGenerator:
             main_table = list(aliases.keys())[0]
             alias = aliases[main_table]
 
-            if isinstance(val, str):
-                val_str = f"'{val}'"
-            else:
-                val_str = str(val)
+            # The declared column type types the bind parameter
+            val_str = binder.bind(f"filter.{index}", val, self.schema_mapper.get_column_type(main_table, col))
 
             where_clauses.append(f"{alias}.{col} {op} {val_str}")
 
@@ -0,0 +1,247 @@
+"""
+Compiled SQL templates
+The SQL for an analysis depends only on its shape (intent, tables, time period,
+aggregation modifier, filter columns); literal values are bound into named
+slots, so one compiled template serves every query of the same shape. A
+template renders either with inline literals or as parameterized SQL plus a
+typed parameter list.
+"""
+
+import copy
+import re
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+
+# \x00name\x00 never occurs in generated SQL text
+_SLOT_PATTERN = re.compile("\x00([^\x00]+)\x00")
+
+# "dollar": $1, $2 ... (asyncpg, PREPARE); "format": %s (psycopg2)
+PARAMSTYLES = ("dollar", "format")
+
+
+def render_literal(value, kind=None):
+    """
+    Inline SQL literal: DATE '...' for dates, quoted strings, numbers as-is
+
+    Dates are re-formatted from a parsed date, so nothing but YYYY-MM-DD is
+    ever inlined; a value that is not a date raises ValueError.
+    """
+    if kind == "date":
+        return f"DATE '{coerce_value(value, 'date').isoformat()}'"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return str(value)
+
+
+def coerce_value(value, kind):
+    """
+    Python value for a bind parameter of a column type
+
+    Numbers stay numbers (a text parameter would turn `total_amount > 100`
+    into a text comparison); unknown kinds pass the value through.
+    """
+    if value is None or kind is None:
+        return value
+
+    try:
+        if kind == "integer":
+            if isinstance(value, bool):
+                raise ValueError
+            number = Decimal(str(value))
+            if number != number.to_integral_value():
+                raise ValueError
+            return int(number)
+        if kind == "decimal":
+            if isinstance(value, bool):
+                raise ValueError
+            return Decimal(str(value))
+        if kind == "date":
+            if isinstance(value, datetime):
+                return value.date()
+            return value if isinstance(value, date) else date.fromisoformat(str(value))
+        if kind == "timestamp":
+            if isinstance(value, datetime):
+                return value
+            if isinstance(value, date):
+                return datetime(value.year, value.month, value.day)
+            return datetime.fromisoformat(str(value))
+        if kind == "text":
+            return str(value)
+    except (ArithmeticError, TypeError, ValueError):
+        raise ValueError(f"{value!r} is not a valid {kind} value") from None
+
+    return value
+
+
+def typed_placeholder(placeholder, kind):
+    """Date bounds take part in arithmetic (`+ 1`), so their type is spelled out"""
+    if kind == "date":
+        return f"CAST({placeholder} AS DATE)"
+    if kind == "timestamp":
+        return f"CAST({placeholder} AS TIMESTAMP)"
+    return placeholder
+
+
+class InlineBinder:
+    """Writes literals straight into the SQL text (no template)"""
+
+    def bind(self, name, value, kind=None):
+        return render_literal(value, kind)
+
+
+class SlotBinder:
+    """Leaves a named slot for every literal while a template is compiled"""
+
+    def __init__(self):
+        self.kinds = {}
+
+    def bind(self, name, value, kind=None):
+        self.kinds[name] = kind
+        return f"\x00{name}\x00"
+
+
+INLINE_BINDER = InlineBinder()
+
+
+class SQLTemplate:
+    """
+    SQL text split around its slots, plus the value-independent result fields
+
+    Rendering joins the fixed parts with the rendered literals; nothing of
+    the generator (aliases, join paths, schemas) is consulted again.
+    """
+
+    def __init__(self, sql, kinds, result):
+        pieces = _SLOT_PATTERN.split(sql)
+        self.parts = tuple(pieces[0::2])
+        self.slots = tuple(pieces[1::2])
+        self.kinds = dict(kinds)
+        # success/intent/tables/metadata...; "sql" and "confidence" are per request
+        self.result = {key: value for key, value in result.items() if key not in ("sql", "confidence")}
+
+    def render_sql(self, values):
+        """SQL with every slot replaced by its inline literal"""
+        if not self.slots:
+            return self.parts[0]
+
+        rendered = [self.parts[0]]
+        for slot, part in zip(self.slots, self.parts[1:]):
+            rendered.append(render_literal(values[slot], self.kinds[slot]))
+            rendered.append(part)
+        return "".join(rendered)
+
+    def render_parameterized(self, values, paramstyle="dollar"):
+        """
+        SQL with placeholders plus the typed parameter list
+
+        With "dollar" a slot used twice reuses its $n; with "format" every
+        %s gets its own parameter and literal % signs are doubled.
+
+        Returns:
+            (sql, params, param_types)
+        """
+        if paramstyle not in PARAMSTYLES:
+            raise ValueError(f"Unsupported paramstyle: {paramstyle} (expected one of {PARAMSTYLES})")
+
+        escape = (lambda text: text.replace("%", "%%")) if paramstyle == "format" else (lambda text: text)
+        rendered = [escape(self.parts[0])]
+        params = []
+        param_types = []
+        positions = {}
+
+        for slot, part in zip(self.slots, self.parts[1:]):
+            kind = self.kinds[slot]
+            if paramstyle == "dollar" and slot in positions:
+                placeholder = f"${positions[slot]}"
+            else:
+                params.append(coerce_value(values[slot], kind))
+                param_types.append(kind)
+                positions[slot] = len(params)
+                placeholder = f"${len(params)}" if paramstyle == "dollar" else "%s"
+
+            rendered.append(typed_placeholder(placeholder, kind))
+            rendered.append(escape(part))
+
+        return "".join(rendered), params, param_types
+
+    def render(self, values, confidence=None, paramstyle=None):
+        """A generate_sql result for the given literal values (inline unless paramstyle is set)"""
+        result = copy.deepcopy(self.result)
+        if paramstyle is None:
+            result["sql"] = self.render_sql(values)
+        else:
+            result["sql"], result["params"], result["param_types"] = self.render_parameterized(values, paramstyle)
+            result["paramstyle"] = paramstyle
+        result["confidence"] = confidence
+        return result
+
+
+class PlanCache:
+    """
+    Bounded LRU map of query shape -> SQLTemplate
+
+    Templates are immutable and shared, not copied. ``invalidate`` drops
+    every template (e.g. after the schema changed).
+    """
+
+    def __init__(self, max_size=512):
+        if max_size < 0:
+            raise ValueError("Cache size cannot be negative")
+
+        self.max_size = max_size
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, shape):
+        with self._lock:
+            template = self._templates.get(shape)
+            if template is None:
+                self.misses += 1
+                return None
+            self._templates.move_to_end(shape)
+            self.hits += 1
+            return template
+
+    def put(self, shape, template):
+        if self.max_size == 0:
+            return
+
+        with self._lock:
+            self._templates[shape] = template
+            self._templates.move_to_end(shape)
+            while len(self._templates) > self.max_size:
+                self._templates.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drop all templates (counters are kept)"""
+        with self._lock:
+            self._templates.clear()
+            self.invalidations += 1
+
+    def __len__(self):
+        return len(self._templates)
+
+    def get_statistics(self):
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        hit_rate = (self.hits / lookups * 100) if lookups > 0 else 0
+
+        return {
+            "enabled": self.max_size > 0,
+            "size": len(self._templates),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round(hit_rate, 2)
+        }
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from src.cache.backends import MemoryCacheBackend, MmapCacheBackend, SQLiteCacheBackend, make_cache_key
+from src.query_builder.sql_generator import SQLGenerator
+
+
+def make_backend(kind, tmp_path):
+    if kind == "memory":
+        return MemoryCacheBackend(max_entries=16, default_ttl=60)
+    if kind == "mmap":
+        return MmapCacheBackend(tmp_path / "cache.mmap", slot_count=64, slot_size=4096, default_ttl=60)
+    return SQLiteCacheBackend(tmp_path / "cache.sqlite", default_ttl=60)
+
+
+@pytest.mark.parametrize("kind", ["memory", "mmap", "sqlite"])
+def test_round_trip_and_ttl(kind, tmp_path):
+    cache = make_backend(kind, tmp_path)
+    value = {"sql": "SELECT COUNT(t0.id) FROM customers t0", "tables": ["customers"], "confidence": 0.97}
+
+    cache.set("k", value)
+    assert cache.get("k") == value
+    assert cache.get("missing") is None
+
+    cache.set("short", value, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("short") is None
+
+    stats = cache.get_statistics()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    cache.close()
+
+
+@pytest.mark.parametrize("kind", ["mmap", "sqlite"])
+def test_entries_are_shared_between_instances(kind, tmp_path):
+    # Two instances on the same file behave like two uvicorn workers
+    writer = make_backend(kind, tmp_path)
+    reader = make_backend(kind, tmp_path)
+
+    writer.set("k", {"intent": "COUNT"})
+    assert reader.get("k") == {"intent": "COUNT"}
+
+    writer.close()
+    reader.close()
+
+
+def test_cache_key_depends_on_exact_text_and_versions():
+    key = make_cache_key("analysis", "Bu ayın müşteri sayısı", "m1", "s1")
+
+    assert key == make_cache_key("analysis", "Bu ayın müşteri sayısı", "m1", "s1")
+    # The cased model may analyse another spelling differently
+    assert key != make_cache_key("analysis", "BU AYIN MÜŞTERİ SAYISI", "m1", "s1")
+    assert key != make_cache_key("analysis", "bu ayın  müşteri sayısı", "m1", "s1")
+    assert key != make_cache_key("analysis", "Bu ayın müşteri sayısı", "m2", "s1")
+    assert key != make_cache_key("analysis", "Bu ayın müşteri sayısı", "m1", "s2")
+    assert key != make_cache_key("sql", "Bu ayın müşteri sayısı", "m1", "s1")
+
+
+def make_analysis(text, table, intent):
+    return {
+        "text": text,
+        "intent": {"type": intent, "confidence": 0.9, "label": intent.lower()},
+        "entities": {"tables": [{"table": table}], "time_filters": [], "filters": [], "entities": []},
+        "analysis_metadata": {"sql_ready": True, "model_version": "m1"}
+    }
+
+
+def test_sql_cache_does_not_share_results_across_spellings():
+    generator = SQLGenerator(result_cache=MemoryCacheBackend(max_entries=16, default_ttl=60))
+
+    first = generator.generate_sql(make_analysis("Bu ayın müşteri sayısı", "customers", "COUNT"))
+    # Same words upper-cased, analysed differently by the model
+    second = generator.generate_sql(make_analysis("BU AYIN MÜŞTERİ SAYISI", "orders", "SELECT"))
+    repeated = generator.generate_sql(make_analysis("Bu ayın müşteri sayısı", "customers", "COUNT"))
+
+    assert first["success"] and second["success"]
+    assert "customers" in first["sql"] and "orders" in second["sql"]
+    assert second["sql"] != first["sql"]
+    assert repeated == first
+    assert generator.result_cache.get_statistics()["hits"] == 1
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from src.nlp.ner_model.data_processor import (
+    DistillationDataset, LengthGroupedSampler, NERDataset, collate_dynamic_padding
+)
+
+
+def make_samples(lengths, start_id=100):
+    return [
+        {
+            "input_ids": [start_id + index + position for position in range(length)],
+            "attention_mask": [1] * length,
+            "labels": [position % 3 for position in range(length)]
+        }
+        for index, length in enumerate(lengths)
+    ]
+
+
+def test_fingerprint_follows_the_tokenized_data():
+    dataset = NERDataset(make_samples([3, 5, 2]), max_length=16, pad_to_max_length=False)
+
+    assert dataset.get_fingerprint() == NERDataset(make_samples([3, 5, 2]), max_length=16).get_fingerprint()
+    # Same sample count, different tokens or lengths
+    assert dataset.get_fingerprint() != NERDataset(make_samples([3, 5, 2], start_id=200), max_length=16).get_fingerprint()
+    assert dataset.get_fingerprint() != NERDataset(make_samples([4, 4, 2]), max_length=16).get_fingerprint()
+
+
+def test_teacher_logits_must_cover_each_sample_exactly():
+    dataset = NERDataset(make_samples([3, 5]), max_length=16, pad_to_max_length=False)
+    offsets = np.array([0, 3, 8])
+    logits = np.arange(8 * 4, dtype=np.float16).reshape(8, 4)
+
+    item = DistillationDataset(dataset, logits, offsets)[1]
+    assert item["teacher_logits"].shape == (5, 4)
+    assert item["teacher_logits"][0, 0].item() == logits[3, 0]
+
+    # Logits cached for other data with the same sample count
+    stale = DistillationDataset(dataset, logits, np.array([0, 4, 8]))
+    with pytest.raises(ValueError, match="cover 4 tokens, the sample has 3"):
+        stale[0]
+
+
+@pytest.mark.parametrize("lengths, padded", [([3, 5, 2], 8), ([9, 1], 16), ([8], 8), ([17, 4, 12], 24)])
+def test_batches_pad_to_their_longest_item_rounded_to_eight(lengths, padded):
+    dataset = NERDataset(make_samples(lengths), max_length=64, pad_to_max_length=False)
+
+    batch = collate_dynamic_padding([dataset[index] for index in range(len(lengths))])
+
+    for key in ("input_ids", "attention_mask", "labels"):
+        assert tuple(batch[key].shape) == (len(lengths), padded)
+    for row, length in enumerate(lengths):
+        assert batch["attention_mask"][row].sum().item() == length
+        assert batch["labels"][row, length:].eq(-100).all()
+        assert batch["input_ids"][row, length:].eq(0).all()
+        assert batch["labels"][row, :length].ne(-100).all()
+
+
+def test_collate_without_rounding_pads_to_the_longest_item():
+    dataset = NERDataset(make_samples([3, 5]), max_length=64, pad_to_max_length=False)
+
+    batch = collate_dynamic_padding([dataset[0], dataset[1]], pad_to_multiple_of=None)
+
+    assert tuple(batch["input_ids"].shape) == (2, 5)
+
+
+@pytest.mark.parametrize("shuffle", [True, False])
+def test_sampler_yields_every_index_exactly_once(shuffle):
+    lengths = [(index * 7) % 23 + 1 for index in range(103)]
+    sampler = LengthGroupedSampler(lengths, batch_size=8, group_factor=4, shuffle=shuffle)
+
+    batches = list(sampler)
+
+    assert len(batches) == len(sampler) == 13
+    assert sorted(index for batch in batches for index in batch) == list(range(103))
+    assert all(1 <= len(batch) <= 8 for batch in batches)
+    # Inside a batch lengths come from one sorted mega-batch
+    for batch in batches:
+        batch_lengths = [lengths[index] for index in batch]
+        assert batch_lengths == sorted(batch_lengths)
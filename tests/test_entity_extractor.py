@@ -0,0 +1,185 @@
+import pytest
+
+pytest.importorskip("transformers")
+
+from src.nlp import entity_extractor
+from src.nlp.entity_extractor import EntityExtractor
+from src.nlp.ner_model.turkish_ner import TurkishNER
+
+
+class StubNER(TurkishNER):
+    """Word lookup instead of a forward pass; label mapping comes from TurkishNER"""
+
+    def __init__(self, vocabulary, confidence=0.95, error=None):
+        self.vocabulary = vocabulary
+        self.label_to_id = MODEL_LABEL_TO_ID
+        self.confidence = confidence
+        self.error = error
+        self.model_version = "stub"
+        self.calls = []
+
+    def load_model(self, load_path=None):
+        return True
+
+    def predict_batch(self, texts, batch_size=8, return_confidence=False):
+        self.calls.append(list(texts))
+        if self.error is not None:
+            raise self.error
+
+        results = []
+        for text in texts:
+            entities, position = [], 0
+            for word in text.split():
+                start = text.index(word, position)
+                position = start + len(word)
+                label = self.vocabulary.get(word.lower())
+                if label:
+                    entities.append({"text": word, "label": label, "start": start, "end": position,
+                                     "confidence": self.confidence})
+            results.append(entities)
+        return results
+
+
+# Entity labels as scripts/generate_ner_data.py writes them into label_mappings.json
+MODEL_LABELS = [
+    "TABLE_customers", "TABLE_orders", "TABLE_products", "TABLE_employees", "TIME_FILTER",
+    "INTENT_GÖSTER", "INTENT_LISTELE", "INTENT_GETIR", "INTENT_COUNT", "INTENT_SUM", "INTENT_AVG"
+]
+MODEL_LABEL_TO_ID = {"O": 0, **{
+    f"{prefix}-{label}": 1 + 2 * index + offset
+    for index, label in enumerate(MODEL_LABELS)
+    for offset, prefix in enumerate("BI")
+}}
+
+VOCABULARY = {"müşteri": "TABLE_customers", "sayısı": "INTENT_COUNT", "sipariş": "TABLE_orders"}
+
+
+def make_extractor(monkeypatch, teacher, cache_size=16, use_gazetteer=False):
+    monkeypatch.setattr(entity_extractor, "TurkishNER", lambda *args, **kwargs: teacher)
+    monkeypatch.setattr(entity_extractor, "register_model", lambda name, model: None)
+    return EntityExtractor(cache_size=cache_size, use_gazetteer=use_gazetteer, use_cascade=False)
+
+
+def test_cached_spans_belong_to_the_callers_text(monkeypatch):
+    teacher = StubNER(VOCABULARY)
+    extractor = make_extractor(monkeypatch, teacher)
+
+    first = extractor.extract("Bu ayın müşteri sayısı")
+    respaced = extractor.extract("bu  ayın   müşteri sayısı")
+    repeated = extractor.extract("Bu ayın müşteri sayısı")
+
+    # Another spelling is a different key: its offsets are recomputed
+    assert len(teacher.calls) == 2
+    for text, result in (("Bu ayın müşteri sayısı", first), ("bu  ayın   müşteri sayısı", respaced)):
+        assert result["text"] == text
+        table = result["tables"][0]
+        assert text[table["start"]:table["end"]] == table["matched_pattern"] == "müşteri"
+    assert repeated == first
+    assert extractor.result_cache.get_statistics()["hits"] == 1
+
+
+def test_duplicates_in_a_batch_run_once(monkeypatch):
+    teacher = StubNER(VOCABULARY)
+    extractor = make_extractor(monkeypatch, teacher)
+
+    results = extractor.extract_batch(["sipariş sayısı", "müşteri sayısı", "sipariş sayısı"])
+
+    assert teacher.calls == [["sipariş sayısı", "müşteri sayısı"]]
+    assert results[0] == results[2] and results[0] is not results[2]
+    assert [result["tables"][0]["table"] for result in results] == ["orders", "customers", "orders"]
+
+
+def test_cache_version_changes_with_routing_settings(monkeypatch):
+    plain = make_extractor(monkeypatch, StubNER(VOCABULARY))
+    with_gazetteer = make_extractor(monkeypatch, StubNER(VOCABULARY), use_gazetteer=True)
+
+    assert plain.get_cache_version() != with_gazetteer.get_cache_version()
+
+    version = with_gazetteer.get_cache_version()
+    monkeypatch.setattr(entity_extractor, "GAZETTEER_MIN_COVERAGE", 0.5)
+    assert with_gazetteer.get_cache_version() != version
+
+    cascade = plain.get_cache_version()
+    plain.student_model = StubNER(VOCABULARY)
+    assert plain.get_cache_version() != cascade
+    monkeypatch.setattr(entity_extractor, "CASCADE_CONFIDENCE_THRESHOLD", 0.5)
+    assert plain.get_cache_version().endswith("cascade=0.5")
+
+
+def make_cascade(monkeypatch, student_confidence=0.95, student_error=None, use_gazetteer=False):
+    teacher = StubNER(VOCABULARY)
+    student = StubNER(VOCABULARY, confidence=student_confidence, error=student_error)
+    extractor = make_extractor(monkeypatch, teacher, use_gazetteer=use_gazetteer)
+    extractor.student_model = student
+    return extractor, student, teacher
+
+
+def test_confident_student_answers_without_the_teacher(monkeypatch):
+    extractor, student, teacher = make_cascade(monkeypatch, student_confidence=0.95)
+
+    result = extractor.extract("müşteri sayısı")
+
+    assert result["metadata"]["extraction_method"] == "student_ner_model"
+    assert student.calls == [["müşteri sayısı"]] and teacher.calls == []
+    assert extractor.cascade_escalations == 0
+    assert extractor.tier_stats["student"]["hits"] == 1 and extractor.tier_stats["student"]["queries"] == 1
+    assert extractor.tier_stats["teacher"]["queries"] == 0
+
+
+def test_unsure_student_escalates_to_the_teacher(monkeypatch):
+    extractor, student, teacher = make_cascade(monkeypatch, student_confidence=0.5)
+
+    results = extractor.extract_batch(["müşteri sayısı", "sipariş sayısı", "merhaba"])
+
+    assert [result["metadata"]["extraction_method"] for result in results] == ["trained_ner_model"] * 3
+    assert teacher.calls == [["müşteri sayısı", "sipariş sayısı", "merhaba"]]
+    assert extractor.cascade_escalations == 3
+    assert extractor.tier_stats["student"]["hits"] == 0 and extractor.tier_stats["student"]["queries"] == 3
+    assert extractor.tier_stats["teacher"]["hits"] == 3 and extractor.tier_stats["teacher"]["queries"] == 3
+
+    cascade = extractor.get_cascade_statistics()
+    assert cascade["student_loaded"] and cascade["escalations"] == 3
+
+
+def test_failing_student_falls_back_to_the_teacher(monkeypatch):
+    extractor, student, teacher = make_cascade(monkeypatch, student_error=RuntimeError("boom"))
+
+    result = extractor.extract("müşteri sayısı")
+
+    assert result["metadata"]["processing_status"] == "success"
+    assert result["metadata"]["extraction_method"] == "trained_ner_model"
+    assert teacher.calls == [["müşteri sayısı"]]
+    # Nothing was rejected, the student just could not answer
+    assert extractor.cascade_escalations == 0
+
+
+def test_gazetteer_is_tried_before_both_models(monkeypatch):
+    extractor, student, teacher = make_cascade(monkeypatch, student_confidence=0.5, use_gazetteer=True)
+
+    results = extractor.extract_batch(["Geçen yıl siparişlerin toplamı", "acil müşteri sayısı"])
+
+    assert results[0]["metadata"]["extraction_method"] == "gazetteer"
+    assert results[1]["metadata"]["extraction_method"] == "trained_ner_model"
+    # Only the text the gazetteer could not cover reaches the models
+    assert student.calls == [["acil müşteri sayısı"]] and teacher.calls == [["acil müşteri sayısı"]]
+    assert extractor.tier_stats["gazetteer"]["hits"] == 1 and extractor.tier_stats["gazetteer"]["queries"] == 2
+
+
+@pytest.mark.parametrize("text", ["Geçen yıl siparişlerin toplamı", "müşterileri listele", "bu ay ürün sayısı"])
+def test_gazetteer_and_model_label_entities_alike(monkeypatch, text):
+    # A model that tags the same words the gazetteer matches
+    vocabulary = {
+        "geçen": "TIME_FILTER", "yıl": "TIME_FILTER", "bu": "TIME_FILTER", "ay": "TIME_FILTER",
+        "siparişlerin": "TABLE_orders", "müşterileri": "TABLE_customers", "ürün": "TABLE_products",
+        "toplamı": "INTENT_SUM", "listele": "INTENT_LISTELE", "sayısı": "INTENT_COUNT"
+    }
+    by_gazetteer = make_extractor(monkeypatch, StubNER(vocabulary), use_gazetteer=True).extract(text)
+    by_model = make_extractor(monkeypatch, StubNER(vocabulary)).extract(text)
+
+    assert by_gazetteer["metadata"]["extraction_method"] == "gazetteer"
+    assert by_model["metadata"]["extraction_method"] == "trained_ner_model"
+    gazetteer_labels = {entity["label"] for entity in by_gazetteer["all_entities"]}
+    assert gazetteer_labels == {entity["label"] for entity in by_model["all_entities"]}
+    assert gazetteer_labels <= set(MODEL_LABELS)
+    assert by_gazetteer["primary_intent"]["type"] == by_model["primary_intent"]["type"]
+    assert [table["table"] for table in by_gazetteer["tables"]] == [table["table"] for table in by_model["tables"]]
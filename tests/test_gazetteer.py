@@ -0,0 +1,50 @@
+from src.nlp.gazetteer import Gazetteer, is_suffix_chain
+
+
+def labels(entities):
+    return [(e["text"], e["label"]) for e in entities]
+
+
+def test_suffixed_words_and_multiword_phrases_match():
+    gazetteer = Gazetteer()
+    text = "Geçen yıl siparişlerin toplamı"
+
+    entities = gazetteer.match(text)
+
+    assert labels(entities) == [
+        ("Geçen yıl", "TIME_FILTER"),
+        ("siparişlerin", "TABLE_orders"),
+        ("toplamı", "INTENT_SUM")
+    ]
+    # Same format as TurkishNER.predict, offsets into the original text
+    assert all(text[e["start"]:e["end"]] == e["text"] for e in entities)
+    assert entities[0]["confidence"] == 1.0 and entities[1]["confidence"] < 1.0
+    assert gazetteer.coverage(text, entities) == 1.0
+
+
+def test_longest_match_wins_and_turkish_capitals_fold():
+    entities = Gazetteer().match("SİPARİŞ DETAYLARINI göster")
+
+    assert labels(entities) == [("SİPARİŞ DETAYLARINI", "TABLE_order_details"), ("göster", "INTENT_GÖSTER")]
+
+
+def test_stems_inside_unrelated_words_do_not_match():
+    assert is_suffix_chain("lerin")
+    assert not is_suffix_chain("iyet")
+    assert Gazetteer().match("ürünsüzlük maliyeti") == []
+
+
+def test_unknown_words_reduce_coverage():
+    gazetteer = Gazetteer()
+    text = "Son 30 gün ürün listesi"
+
+    assert gazetteer.coverage(text, gazetteer.match(text)) < 1.0
+
+
+def test_labels_come_from_the_model_label_mapping():
+    label_to_id = {"O": 0, "B-TABLE_CUSTOMERS": 1, "I-TABLE_CUSTOMERS": 2, "B-INTENT_COUNT": 3, "I-INTENT_COUNT": 4}
+    gazetteer = Gazetteer(label_to_id=label_to_id)
+
+    # Spelling of the model's mapping wins; labels it does not know are never emitted
+    assert labels(gazetteer.match("müşteri sayısı")) == [("müşteri", "TABLE_CUSTOMERS"), ("sayısı", "INTENT_COUNT")]
+    assert gazetteer.match("geçen ay siparişler") == []
@@ -0,0 +1,88 @@
+from src.nlp.ner_model.inference_session import InferenceSession
+
+
+class FakeTokenizer:
+    """Whitespace tokenizer with the HF call signature used by the session"""
+
+    pad_token_id = 0
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts, max_length, return_overflowing_tokens, stride, **kwargs):
+        self.calls.append(list(texts))
+        encoded = {"input_ids": [], "offset_mapping": [], "overflow_to_sample_mapping": []}
+        for text_index, text in enumerate(texts):
+            words, position = [], 0
+            for word in text.split():
+                start = text.index(word, position)
+                position = start + len(word)
+                words.append((len(word) + 100, (start, position)))
+
+            body = max_length - 2
+            step = body - stride if return_overflowing_tokens else len(words) or 1
+            for window_start in range(0, max(len(words), 1), step):
+                window = words[window_start:window_start + body]
+                encoded["input_ids"].append([1] + [token for token, _ in window] + [2])
+                encoded["offset_mapping"].append([(0, 0)] + [span for _, span in window] + [(0, 0)])
+                encoded["overflow_to_sample_mapping"].append(text_index)
+                if window_start + body >= len(words) or not return_overflowing_tokens:
+                    break
+        return encoded
+
+
+def test_repeated_texts_are_tokenized_once():
+    tokenizer = FakeTokenizer()
+    session = InferenceSession(tokenizer, cache_size=8, pad_to_multiple_of=8)
+
+    input_ids, attention_mask, offsets, window_texts = session.encode(["bu ay", "müşteri sayısı", "bu ay"])
+
+    assert tokenizer.calls == [["bu ay", "müşteri sayısı"]]
+    assert window_texts == [0, 1, 2]
+    assert input_ids.shape == (3, 8)
+    assert input_ids[0].tolist() == input_ids[2].tolist() == [1, 102, 102, 2, 0, 0, 0, 0]
+    assert attention_mask[0].tolist() == [1, 1, 1, 1, 0, 0, 0, 0]
+    assert offsets[1, 1].tolist() == [0, 7] and offsets[1, 4:].tolist() == [[0, 0]] * 4
+
+    session.encode(["müşteri sayısı"])
+    assert len(tokenizer.calls) == 1
+    assert session.get_statistics()["token_cache"]["hits"] == 1
+
+
+def test_cache_hits_return_the_stored_arrays():
+    session = InferenceSession(FakeTokenizer(), cache_size=8)
+    session.encode(["bu ay"])
+
+    first = session._tokenize(["bu ay"])[0]
+    second = session._tokenize(["bu ay"])[0]
+
+    assert first is second
+    assert first[0][0] is second[0][0] and not first[0][0].flags.writeable
+
+
+def test_buffers_are_reused_per_length_bucket():
+    session = InferenceSession(FakeTokenizer(), pad_to_multiple_of=8)
+
+    first = session.encode(["a b c d e", "a"])[0]
+    # A shorter batch in the same bucket must not see the previous rows
+    second, attention_mask, _, _ = session.encode(["a"])
+
+    assert second.base is first.base
+    assert second.tolist() == [[1, 101, 2, 0, 0, 0, 0, 0]]
+    assert attention_mask.sum() == 3
+    assert session.get_statistics()["buffer_allocations"] == 1
+
+    session.encode(["x"] * 5)
+    session.encode(["a b c d e f g h i"])
+    assert session.get_statistics()["buffer_buckets"] == [8, 16]
+    assert session.buffer_allocations == 3
+
+
+def test_long_texts_become_windows_in_the_same_batch():
+    session = InferenceSession(FakeTokenizer(), max_length=6, stride=2, pad_to_multiple_of=8)
+
+    input_ids, _, _, window_texts = session.encode(["kısa", "a b c d e f g"])
+
+    # Windows of 4 words sharing 2: [a b c d] [c d e f] [e f g]
+    assert window_texts == [0, 1, 1, 1]
+    assert input_ids.shape == (4, 6)
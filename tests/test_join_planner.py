@@ -0,0 +1,128 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from src.query_builder.join_planner import JoinPlanner
+from src.query_builder.relation_mapper import RelationMapper
+from src.query_builder.sql_generator import SQLGenerator
+
+
+def random_relations(num_tables, num_edges, seed):
+    rng = random.Random(seed)
+    relations = {}
+    for index in range(1, num_tables):
+        relations[(f"t{index}", "parent_id")] = (f"t{rng.randrange(index)}", "id")
+    for extra in range(num_edges):
+        source, target = rng.sample(range(num_tables), 2)
+        relations[(f"t{source}", f"ref{extra}_id")] = (f"t{target}", "id")
+    return relations
+
+
+def minimum_tree_size(relations, terminals):
+    """Brute force: smallest connected table set containing the terminals, minus one"""
+    neighbours = {}
+    for (src, _), (tgt, _) in relations.items():
+        neighbours.setdefault(src, set()).add(tgt)
+        neighbours.setdefault(tgt, set()).add(src)
+    others = [table for table in neighbours if table not in terminals]
+
+    for extra in range(len(others) + 1):
+        for chosen in combinations(others, extra):
+            tables = set(terminals) | set(chosen)
+            seen = {terminals[0]}
+            stack = [terminals[0]]
+            while stack:
+                for nxt in neighbours[stack.pop()] & tables:
+                    if nxt not in seen:
+                        seen.add(nxt)
+                        stack.append(nxt)
+            if seen == tables:
+                return len(tables) - 1
+
+
+def assert_join_tree(plan, main_table, tables):
+    joined = [main_table]
+    for from_table, _, to_table, _ in plan:
+        # Parent already joined, every table joined once
+        assert from_table in joined
+        assert to_table not in joined
+        joined.append(to_table)
+    assert set(tables) <= set(joined)
+
+
+def test_shared_intermediate_table_is_joined_once():
+    # Pairwise shortest paths go r → p → a and r → q → b (4 joins); via hub it is 3
+    relations = {
+        ("p", "r_id"): ("r", "id"),
+        ("q", "r_id"): ("r", "id"),
+        ("a", "p_id"): ("p", "id"),
+        ("b", "q_id"): ("q", "id"),
+        ("hub", "r_id"): ("r", "id"),
+        ("a", "hub_id"): ("hub", "id"),
+        ("b", "hub_id"): ("hub", "id"),
+    }
+    planner = JoinPlanner(RelationMapper(relations))
+
+    plan = planner.plan("r", ["a", "b"])
+
+    assert plan[0] == ("r", "id", "hub", "r_id")
+    assert set(plan[1:]) == {("hub", "id", "a", "hub_id"), ("hub", "id", "b", "hub_id")}
+
+
+def test_two_tables_use_the_shortest_path():
+    mapper = RelationMapper()
+    planner = JoinPlanner(mapper)
+
+    assert planner.plan("order_details", ["customers"]) == mapper.get_join_paths("order_details", "customers")
+    assert planner.plan("orders", ["orders"]) == []
+    assert planner.plan("orders", []) == []
+
+
+def test_unreachable_table_raises():
+    planner = JoinPlanner(RelationMapper({("a", "b_id"): ("b", "id"), ("c", "d_id"): ("d", "id")}))
+
+    with pytest.raises(ValueError, match="No join path found between a and c"):
+        planner.plan("a", ["b", "c"])
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_exact_plan_is_minimal_and_heuristic_within_twice(seed):
+    relations = random_relations(num_tables=9, num_edges=5, seed=seed)
+    mapper = RelationMapper(relations)
+    rng = random.Random(seed)
+    main_table, *tables = rng.sample(sorted(mapper.adjacency), 4)
+    optimum = minimum_tree_size(relations, [main_table] + tables)
+
+    exact = JoinPlanner(mapper, exact_limit=6).plan(main_table, tables)
+    approximate = JoinPlanner(mapper, exact_limit=0).plan(main_table, tables)
+
+    assert_join_tree(exact, main_table, tables)
+    assert_join_tree(approximate, main_table, tables)
+    assert len(exact) == optimum
+    assert optimum <= len(approximate) <= 2 * optimum
+
+
+def test_generator_joins_every_table_once():
+    analysis = {
+        "text": "x",
+        "intent": {"type": "SELECT", "confidence": 0.8, "label": "select"},
+        "entities": {
+            "tables": [{"table": "customers"}, {"table": "products"}, {"table": "suppliers"}],
+            "time_filters": [],
+            "filters": [],
+            "entities": []
+        },
+        "analysis_metadata": {"sql_ready": True}
+    }
+
+    result = SQLGenerator().generate_sql(analysis, use_cache=False)
+
+    assert result["success"]
+    sql = result["sql"]
+    # Pairwise paths from customers needed orders, order_details, products, suppliers
+    assert sql.count("JOIN ") == 3
+    assert "JOIN order_details " not in sql
+    for table in ("orders", "products", "suppliers"):
+        assert sql.count(f"JOIN {table} ") == 1
+    assert sql.index("JOIN orders ") < sql.index("JOIN suppliers ") < sql.index("JOIN products ")
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from src.cache import ArrayLRUCache, LRUCache, normalize_query_text
+
+
+def test_normalization_is_turkish_aware():
+    assert normalize_query_text("  BU AYIN   Müşteri SAYISI ") == "bu ayın müşteri sayısı"
+    assert normalize_query_text("İSTANBUL\tsiparişleri") == "istanbul siparişleri"
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    stats = cache.get_statistics()
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+    assert stats["size"] == 2
+
+
+def test_returned_values_are_copies():
+    cache = LRUCache(max_size=4)
+    value = {"tables": [{"table": "customers"}]}
+    cache.put("k", value)
+    value["tables"].clear()
+
+    first = cache.get("k")
+    first["tables"].append({"table": "orders"})
+
+    assert cache.get("k") == {"tables": [{"table": "customers"}]}
+
+
+def test_zero_size_disables_cache():
+    cache = LRUCache(max_size=0)
+    cache.put("k", 1)
+
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_array_cache_shares_read_only_arrays():
+    cache = ArrayLRUCache(max_size=2)
+    ids, offsets = np.arange(4), np.zeros((4, 2), dtype=np.int64)
+    cache.put("k", [(ids, offsets)])
+
+    first, second = cache.get("k"), cache.get("k")
+
+    # Same objects on every hit, nothing allocated
+    assert first is second and first[0][0] is ids
+    assert isinstance(first, tuple)
+    with pytest.raises(ValueError):
+        first[0][0][0] = 7
+    assert not offsets.flags.writeable
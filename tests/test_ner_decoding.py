@@ -0,0 +1,103 @@
+import random
+
+import numpy as np
+import pytest
+
+pytest.importorskip("transformers")
+
+from src.nlp.ner_model.turkish_ner import TurkishNER
+
+ID_TO_LABEL = {0: "O", 1: "B-TABLE", 2: "I-TABLE", 3: "B-TIME", 4: "I-TIME", 5: "B-INTENT", 6: "I-INTENT", 7: "X"}
+
+
+def reference_decode(id_to_label, text, predicted_ids, offset_mapping, confidence_scores=None):
+    """The per-token loop _extract_entities_from_predictions replaced"""
+    entities = []
+    current_entity = None
+
+    for i, (pred_id, (start, end)) in enumerate(zip(predicted_ids, offset_mapping)):
+        if start == 0 and end == 0:
+            continue
+
+        predicted_label = id_to_label.get(pred_id, "O")
+        confidence = float(np.max(confidence_scores[i])) if confidence_scores is not None else None
+
+        if predicted_label == "O":
+            if current_entity:
+                entities.append(current_entity)
+                current_entity = None
+
+        elif predicted_label.startswith("B-"):
+            if current_entity:
+                entities.append(current_entity)
+            current_entity = {"text": text[start:end], "label": predicted_label[2:],
+                              "start": start, "end": end, "confidence": confidence}
+
+        elif predicted_label.startswith("I-") and current_entity:
+            entity_type = predicted_label[2:]
+            if current_entity["label"] == entity_type:
+                current_entity["end"] = end
+                current_entity["text"] = text[current_entity["start"]:end]
+                if confidence and current_entity["confidence"]:
+                    current_entity["confidence"] = (current_entity["confidence"] + confidence) / 2
+            else:
+                entities.append(current_entity)
+                current_entity = {"text": text[start:end], "label": entity_type,
+                                  "start": start, "end": end, "confidence": confidence}
+
+    if current_entity:
+        entities.append(current_entity)
+    return entities
+
+
+def make_decoder():
+    # Only id_to_label and the label-array cache are used by the decoder
+    ner = TurkishNER.__new__(TurkishNER)
+    ner.id_to_label = dict(ID_TO_LABEL)
+    ner._label_arrays = None
+    return ner
+
+
+def random_sequence(rng):
+    length = rng.randint(0, 24)
+    text = " ".join(f"w{index}" for index in range(length))
+    offsets, position = [(0, 0)], 0
+    for index in range(length):
+        word = f"w{index}"
+        offsets.append((position, position + len(word)))
+        position += len(word) + 1
+    offsets.extend([(0, 0)] * rng.randint(1, 4))  # [SEP] + padding
+
+    # Unknown ids (-1, 8, 99) must decode as "O"
+    predicted_ids = [rng.choice([0, 1, 2, 2, 3, 4, 4, 5, 6, 7, -1, 8, 99]) for _ in offsets]
+    return text, predicted_ids, offsets
+
+
+def test_vectorized_decoding_matches_the_per_token_loop():
+    rng = random.Random(5)
+    np_rng = np.random.default_rng(5)
+    ner = make_decoder()
+
+    for _ in range(3000):
+        text, predicted_ids, offsets = random_sequence(rng)
+        probabilities = np_rng.random((len(offsets), len(ID_TO_LABEL)))
+        # Zero confidences take the `if confidence and ...` branch of the loop
+        probabilities[np_rng.random(len(offsets)) < 0.05] = 0.0
+
+        for scores in (None, probabilities, probabilities.max(axis=-1)):
+            expected = reference_decode(ID_TO_LABEL, text, predicted_ids, offsets, scores)
+            actual = ner._extract_entities_from_predictions(
+                text, np.array(predicted_ids), np.array(offsets), scores)
+            assert actual == expected
+
+
+def test_label_arrays_follow_id_to_label_changes():
+    ner = make_decoder()
+    text, offsets = "a b", [(0, 0), (0, 1), (2, 3), (0, 0)]
+
+    assert ner._extract_entities_from_predictions(text, [0, 1, 2, 0], offsets)[0]["label"] == "TABLE"
+
+    ner.id_to_label = {0: "O", 1: "B-TIME", 2: "I-TIME"}
+    assert ner._extract_entities_from_predictions(text, [0, 1, 2, 0], offsets) == [
+        {"text": "a b", "label": "TIME", "start": 0, "end": 3, "confidence": None}
+    ]
@@ -0,0 +1,97 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from src.query_builder.sql_generator import SQLGenerator
+from src.query_builder.sql_template import coerce_value, render_literal
+
+
+def analysis(filters, time_filters=(), tables=("orders",)):
+    return {
+        "text": "x",
+        "intent": {"type": "SELECT", "confidence": 0.8, "label": "select"},
+        "entities": {
+            "tables": [{"table": table} for table in tables],
+            "time_filters": list(time_filters),
+            "filters": list(filters),
+            "entities": []
+        },
+        "analysis_metadata": {"sql_ready": True}
+    }
+
+
+def test_dollar_placeholders_with_values_typed_by_column():
+    generator = SQLGenerator()
+    result = generator.generate_parameterized_sql(analysis(
+        filters=[{"column": "total_amount", "operator": ">", "value": "100.5"}, {"column": "status", "value": "shipped"}],
+        time_filters=[{"period": "specific_date", "date": "2024-06-15"}]
+    ), paramstyle="dollar")
+
+    assert result["success"]
+    # The date slot is used twice (>= date, < date + 1) but bound once
+    assert "t0.order_date >= CAST($1 AS DATE) AND t0.order_date < CAST($1 AS DATE) + 1" in result["sql"]
+    assert "t0.total_amount > $2 AND t0.status = $3" in result["sql"]
+    assert result["params"] == [date(2024, 6, 15), Decimal("100.5"), "shipped"]
+    assert result["param_types"] == ["date", "decimal", "text"]
+    assert "'" not in result["sql"]
+
+
+def test_format_placeholders_repeat_parameters():
+    result = SQLGenerator().generate_sql(analysis(
+        filters=[{"column": "customer_id", "value": "42"}],
+        time_filters=[{"period": "specific_date", "date": "2024-06-15"}]
+    ), paramstyle="format")
+
+    assert result["sql"].count("%s") == 3
+    assert result["params"] == [date(2024, 6, 15), date(2024, 6, 15), 42]
+    assert result["paramstyle"] == "format"
+
+
+def test_same_shape_gives_the_same_parameterized_text():
+    generator = SQLGenerator()
+    first = generator.generate_parameterized_sql(analysis([{"column": "status", "value": "pending"}]))
+    second = generator.generate_parameterized_sql(analysis([{"column": "status", "value": "shipped"}]))
+    inline = generator.generate_sql(analysis([{"column": "status", "value": "shipped"}]), use_cache=False)
+
+    assert first["sql"] == second["sql"]
+    assert first["params"] != second["params"]
+    assert "t0.status = 'shipped'" in inline["sql"] and "params" not in inline
+    assert len(generator.plan_cache) == 1
+
+
+def test_values_that_do_not_fit_the_column_type_fail():
+    result = SQLGenerator().generate_parameterized_sql(analysis([{"column": "customer_id", "value": "abc"}]))
+
+    assert result["success"] is False
+    assert "not a valid integer value" in result["error"]
+
+
+def test_coerce_value():
+    assert coerce_value("7", "integer") == 7
+    assert coerce_value(7.0, "integer") == 7
+    assert coerce_value(12, "decimal") == Decimal("12")
+    assert coerce_value(3, "text") == "3"
+    assert coerce_value("2024-01-02", "timestamp").isoformat() == "2024-01-02T00:00:00"
+    assert coerce_value({"x": 1}, None) == {"x": 1}
+    with pytest.raises(ValueError):
+        coerce_value(7.5, "integer")
+    with pytest.raises(ValueError):
+        coerce_value(True, "decimal")
+
+
+def test_inline_dates_are_parsed_before_rendering():
+    generator = SQLGenerator()
+    injected = generator.generate_sql(analysis(
+        filters=[{"column": "order_date", "operator": ">=", "value": "2024-01-01' OR '1'='1"}]
+    ), use_cache=False)
+    valid = generator.generate_sql(analysis(
+        filters=[{"column": "order_date", "operator": ">=", "value": date(2024, 1, 1)}]
+    ), use_cache=False)
+
+    assert injected["success"] is False
+    assert "not a valid date value" in injected["error"]
+    assert "t0.order_date >= DATE '2024-01-01'" in valid["sql"]
+    assert render_literal("2024-06-15", "date") == "DATE '2024-06-15'"
+    with pytest.raises(ValueError):
+        render_literal("15.06.2024", "date")
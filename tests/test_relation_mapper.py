@@ -0,0 +1,61 @@
+from collections import deque
+
+from src.query_builder.relation_mapper import RelationMapper
+
+
+def test_shortest_path_is_preferred_over_the_first_one_found():
+    mapper = RelationMapper()
+
+    # The DFS used to walk customers → orders → employees → purchase_orders → suppliers
+    assert mapper.get_join_paths("customers", "suppliers") == [
+        ("customers", "id", "orders", "customer_id"),
+        ("orders", "supplier_id", "suppliers", "id")
+    ]
+
+
+def test_steps_are_oriented_in_walking_direction():
+    mapper = RelationMapper()
+
+    assert mapper.get_join_paths("order_details", "customers") == [
+        ("order_details", "order_id", "orders", "id"),
+        ("orders", "customer_id", "customers", "id")
+    ]
+    assert mapper.get_join_paths("categories", "products") == [("categories", "id", "products", "category_id")]
+
+
+def test_unreachable_unknown_and_same_table():
+    mapper = RelationMapper({("a", "b_id"): ("b", "id"), ("c", "d_id"): ("d", "id")})
+
+    assert mapper.get_join_paths("a", "c") is None
+    assert mapper.get_join_paths("a", "unknown") is None
+    assert mapper.get_join_paths("a", "a") == []
+
+
+def test_every_pair_matches_a_reference_bfs_distance():
+    # A binary tree plus a few cross references
+    relations = {(f"t{i}", "p_id"): (f"t{i // 2}", "id") for i in range(1, 60)}
+    relations.update({(f"t{i}", "x_id"): (f"t{(i * 13 + 7) % 60}", "id") for i in range(0, 60, 5)})
+    mapper = RelationMapper(relations)
+
+    neighbours = {}
+    for (src, _), (tgt, _) in relations.items():
+        neighbours.setdefault(src, set()).add(tgt)
+        neighbours.setdefault(tgt, set()).add(src)
+
+    for start in neighbours:
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            table = queue.popleft()
+            for nxt in neighbours[table]:
+                if nxt not in distances:
+                    distances[nxt] = distances[table] + 1
+                    queue.append(nxt)
+
+        for end, distance in distances.items():
+            path = mapper.get_join_paths(start, end)
+            assert len(path) == distance
+            # Consecutive steps chain from start to end
+            tables = [start] + [step[2] for step in path]
+            assert [step[0] for step in path] == tables[:-1]
+            assert tables[-1] == end
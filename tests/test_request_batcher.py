@@ -0,0 +1,96 @@
+import asyncio
+import threading
+
+from src.nlp.request_batcher import RequestBatcher
+
+
+def test_concurrent_requests_are_coalesced():
+    seen_batches = []
+
+    def batch_fn(texts):
+        seen_batches.append(list(texts))
+        return [text.upper() for text in texts]
+
+    async def run():
+        batcher = RequestBatcher(batch_fn, max_batch_size=8, max_wait_ms=20)
+        await batcher.start()
+        try:
+            texts = [f"sorgu {i}" for i in range(5)]
+            results = await asyncio.gather(*(batcher.submit(t) for t in texts))
+        finally:
+            await batcher.stop()
+        return texts, results, batcher.get_statistics()
+
+    texts, results, stats = asyncio.run(run())
+
+    # Her istek kendi sonucunu alır
+    assert results == [t.upper() for t in texts]
+    assert seen_batches == [texts]
+    assert stats["batches_processed"] == 1
+    assert stats["requests_processed"] == 5
+
+
+def test_batches_respect_max_batch_size():
+    seen_sizes = []
+
+    def batch_fn(texts):
+        seen_sizes.append(len(texts))
+        return texts
+
+    async def run():
+        batcher = RequestBatcher(batch_fn, max_batch_size=3, max_wait_ms=20)
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(str(i)) for i in range(7)))
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+
+    assert results == [str(i) for i in range(7)]
+    assert max(seen_sizes) <= 3
+    assert sum(seen_sizes) == 7
+
+
+def test_batch_errors_reach_every_waiting_request():
+    def batch_fn(texts):
+        raise RuntimeError("model failure")
+
+    async def run():
+        batcher = RequestBatcher(batch_fn, max_batch_size=4, max_wait_ms=10)
+        await batcher.start()
+        try:
+            return await asyncio.gather(
+                batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_run_in_worker_uses_the_batch_thread():
+    thread_names = []
+
+    def batch_fn(texts):
+        thread_names.append(threading.current_thread().name)
+        return texts
+
+    def warmup():
+        thread_names.append(threading.current_thread().name)
+        return "warm"
+
+    async def run():
+        batcher = RequestBatcher(batch_fn, max_batch_size=2, max_wait_ms=5)
+        await batcher.start()
+        try:
+            result = await batcher.run_in_worker(warmup)
+            await batcher.submit("x")
+        finally:
+            await batcher.stop()
+        return result
+
+    assert asyncio.run(run()) == "warm"
+    assert len(set(thread_names)) == 1
@@ -0,0 +1,80 @@
+from src.query_builder.sql_generator import SQLGenerator
+from src.query_builder.sql_template import PlanCache
+
+
+def analysis(date="2024-06-15", city="İstanbul", tables=("orders", "customers")):
+    return {
+        "text": "x",
+        "intent": {"type": "COUNT", "confidence": 0.8, "label": "count"},
+        "entities": {
+            "tables": [{"table": table} for table in tables],
+            "time_filters": [{"period": "specific_date", "date": date}],
+            "filters": [{"column": "city", "value": city}],
+            "entities": []
+        },
+        "analysis_metadata": {"sql_ready": True}
+    }
+
+
+def test_same_shape_reuses_the_template_with_new_literals():
+    generator = SQLGenerator()
+
+    first = generator.generate_sql(analysis(), use_cache=False)
+    second = generator.generate_sql(analysis(date="2023-01-02", city="Ankara"), use_cache=False)
+
+    assert "DATE '2024-06-15'" in first["sql"] and "'İstanbul'" in first["sql"]
+    assert second["sql"] == first["sql"].replace("2024-06-15", "2023-01-02").replace("İstanbul", "Ankara")
+    assert "JOIN customers" in second["sql"]
+    statistics = generator.plan_cache.get_statistics()
+    assert statistics["size"] == 1 and statistics["hits"] == 1
+
+
+def test_different_shapes_get_their_own_templates():
+    generator = SQLGenerator()
+
+    generator.generate_sql(analysis(), use_cache=False)
+    generator.generate_sql(analysis(tables=("orders",)), use_cache=False)
+    numeric = analysis()
+    numeric["entities"]["filters"] = [{"column": "total_amount", "operator": ">", "value": 100}]
+    result = generator.generate_sql(numeric, use_cache=False)
+
+    assert "t0.total_amount > 100" in result["sql"]
+    assert len(generator.plan_cache) == 3
+
+
+def test_literals_are_escaped_and_validated_per_request():
+    generator = SQLGenerator()
+    generator.generate_sql(analysis(), use_cache=False)
+
+    quoted = generator.generate_sql(analysis(city="Kuşadası'nın"), use_cache=False)
+    unsafe = generator.generate_sql(analysis(city="x -- y"), use_cache=False)
+
+    assert "'Kuşadası''nın'" in quoted["sql"]
+    assert unsafe["success"] is False
+
+
+def test_schema_change_invalidates_templates():
+    generator = SQLGenerator()
+    generator.generate_sql(analysis(), use_cache=False)
+    version = generator.schema_version
+
+    assert generator.refresh_schema_version() == version
+    assert len(generator.plan_cache) == 1
+
+    generator.schema_mapper.schema["orders"]["display_columns"] = ["status"]
+    assert generator.refresh_schema_version() != version
+    assert len(generator.plan_cache) == 0
+
+    result = generator.generate_sql(analysis(), use_cache=False)
+    assert "t0.status AS group_field" in result["sql"]
+
+
+def test_plan_cache_evicts_least_recently_used():
+    cache = PlanCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None and cache.get("a") == 1
+    assert cache.get_statistics()["evictions"] == 1
@@ -0,0 +1,24 @@
+from src.nlp import thread_topology
+from src.nlp.thread_topology import resolve_topology
+
+
+def test_auto_topology_never_oversubscribes(monkeypatch):
+    monkeypatch.setattr(thread_topology, "available_cpus", lambda: 8)
+
+    topology = resolve_topology(num_threads=0, workers=4)
+
+    assert topology["threads_per_worker"] == 2
+    assert topology["source"] == "auto"
+    assert not topology["oversubscribed"]
+
+
+def test_explicit_settings_win_over_tuned(monkeypatch):
+    monkeypatch.setattr(thread_topology, "available_cpus", lambda: 8)
+    tuned = {"cpus": 8, "workers": 2, "threads_per_worker": 4}
+
+    assert resolve_topology(num_threads=0, workers=0, tuned=tuned)["source"] == "tuned"
+    assert resolve_topology(num_threads=0, workers=0, tuned=tuned)["workers"] == 2
+
+    explicit = resolve_topology(num_threads=8, workers=2, tuned=tuned)
+    assert explicit["source"] == "config"
+    assert explicit["oversubscribed"]
@@ -0,0 +1,56 @@
+from src.nlp.warmup import ModelWarmup
+
+
+class FakeProcessor:
+    def __init__(self):
+        self.calls = []
+
+    def analyze(self, text, use_cache=True):
+        self.calls.append((1, use_cache))
+        return {"text": text}
+
+    def analyze_batch(self, texts, use_cache=True):
+        # Warmup batches must reach the model as distinct texts
+        assert len(set(texts)) == len(texts)
+        self.calls.append((len(texts), use_cache))
+        return [{"text": text} for text in texts]
+
+
+class FakeGenerator:
+    def __init__(self):
+        self.generated = 0
+
+    def generate_sql(self, nlp_analysis, use_cache=True):
+        assert use_cache is False
+        self.generated += 1
+        return {"success": True}
+
+
+def test_warmup_covers_every_batch_size_without_caches():
+    processor, generator = FakeProcessor(), FakeGenerator()
+    warmup = ModelWarmup(processor, generator, batch_sizes=[1, 4, 8], queries=["a", "b", "c"])
+
+    assert not warmup.is_ready()
+    assert warmup.run()
+
+    batch_sizes = {size for size, _ in processor.calls}
+    assert batch_sizes == {1, 4, 8}
+    assert all(use_cache is False for _, use_cache in processor.calls)
+    # 3 single queries + one batch of 4 + one batch of 8
+    assert generator.generated == 3 + 4 + 8
+
+    status = warmup.get_status()
+    assert status["ready"] and status["status"] == "ready"
+    assert [r["batch_size"] for r in status["rounds"]] == [1, 4, 8]
+
+
+def test_failed_warmup_is_never_ready():
+    class BrokenProcessor(FakeProcessor):
+        def analyze(self, text, use_cache=True):
+            raise RuntimeError("model failure")
+
+    warmup = ModelWarmup(BrokenProcessor(), FakeGenerator(), batch_sizes=[1])
+
+    assert not warmup.run()
+    assert not warmup.is_ready()
+    assert warmup.get_status()["error"] == "model failure"
@@ -15,9 +15,12 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent / "src" / "nlp"))
 sys.path.append(str(Path(__file__).parent / "src" / "query_builder"))
 
+from src.nlp.startup_timer import timed_startup, print_startup_report
+
 # Import components
-from nlp_processor import NLPProcessor
-from sql_generator import SQLGenerator
+with timed_startup("imports"):
+    from nlp_processor import NLPProcessor
+    from sql_generator import SQLGenerator
 
 
 class TurkishNLPSQLCLI:
@@ -44,13 +47,16 @@ class TurkishNLPSQLCLI:
 
         try:
             print("📦 NLP İşlemci yükleniyor...")
-            self.nlp_processor = NLPProcessor()
+            with timed_startup("nlp_processor"):
+                self.nlp_processor = NLPProcessor()
 
             print("🔧 SQL Üretici yükleniyor...")
-            self.sql_generator = SQLGenerator()
+            with timed_startup("sql_generator"):
+                self.sql_generator = SQLGenerator()
 
             self.is_initialized = True
             print("✅ Sistem başarıyla yüklendi!")
+            print_startup_report()
 
             # Show system info
             self.show_system_info()